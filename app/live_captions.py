@@ -0,0 +1,307 @@
+# app/live_captions.py
+
+"""Moduł napisów na żywo
+
+Skrypt transkrybuje na bieżąco krótkie, nakładające się okna audio (domyślnie 4 s co 1.5 s), aby w oknie aplikacji
+pojawiał się tekst wypowiadany przed chwilą, zanim zostanie ukończony i przetranskrybowany pełny fragment nagrania.
+Zwykła transkrypcja fragmentów działa bez zmian w tle i to ona trafia do plików txt oraz raportu.
+
+Tekst kolejnych okien jest łączony przez `CaptionStitcher`: słowa potwierdzone w dwóch kolejnych oknach (lub takie,
+które wypadły już z okna) tworzą stabilny prefiks, a końcówka ostatniego okna jest wyświetlana jako tekst tymczasowy.
+
+Mierzone są opóźnienia: od nagrania ostatniej próbki okna do wyświetlenia tekstu (tekst tymczasowy) oraz, powiększone
+o krok okna, opóźnienie pojawienia się tekstu w stabilnym prefiksie.
+
+Wymagane zależności
+
+Aby uruchomić skrypt, należy zainstalować następujące pakiety w środowisku Python:
+
+    - numpy: Bufor próbek audio
+    - loguru: Rozbudowany system logowania
+
+Do prawidłowego działania aplikacji należy zaimportować:
+
+    - get_whisper_model z modułu app.transcriptor
+    - get_engine z modułu app.transcription_engines
+
+Skrypt może być używany jako moduł i zawiera następujące klasy:
+
+    * CaptionStitcher - łączenie tekstu nakładających się okien w stabilny prefiks i tekst tymczasowy.
+    * LiveCaptioner - wątek transkrybujący bieżące okno audio i przekazujący napisy do GUI.
+"""
+
+import os
+import string
+import threading
+import time
+import numpy as np
+from typing import Callable
+from loguru import logger as log
+from app.transcriptor import get_whisper_model
+from app.transcription_engines import get_engine
+from app.utilities.audio_formats import WHISPER_SAMPLE_RATE
+
+# Napisy na żywo (wymagają trybu przechwytywania pipe)
+live_captions_enabled = os.environ.get("KNZS_LIVE_CAPTIONS", "0") == "1"
+LIVE_MODEL_NAME = os.environ.get("KNZS_LIVE_MODEL", "tiny")
+LIVE_WINDOW_SECONDS = float(os.environ.get("KNZS_LIVE_WINDOW_SECONDS", "4"))
+LIVE_HOP_SECONDS = float(os.environ.get("KNZS_LIVE_HOP_SECONDS", "1.5"))
+
+# Okna o niższym poziomie RMS nie są transkrybowane
+SILENCE_RMS = 0.003
+
+_PUNCTUATION = str.maketrans("", "", string.punctuation + "„”…–")
+
+
+def _normalize(word: str) -> str:
+    """Sprowadza słowo do postaci porównywanej między oknami (małe litery, bez interpunkcji)."""
+    return word.lower().translate(_PUNCTUATION)
+
+
+class CaptionStitcher:
+    """
+    Łączy tekst nakładających się okien transkrypcji w stabilny prefiks i tekst tymczasowy.
+
+    Args:
+        aged_fraction:
+            Część okna, która wypada z niego przy każdym kroku (krok / długość okna).
+        max_skip:
+            Liczba początkowych słów nowego okna, które mogą zostać pominięte przy dopasowaniu
+            (słowa ucięte na początku okna).
+        search_words:
+            Maksymalna długość dopasowywanego fragmentu w słowach.
+    """
+
+    def __init__(self, aged_fraction: float = 0.4, max_skip: int = 2, search_words: int = 12):
+        self.aged_fraction = aged_fraction
+        self.max_skip = max_skip
+        self.search_words = search_words
+        self.stable: list[str] = []
+        self.tentative: list[str] = []
+
+    def update(self, hypothesis: str) -> int:
+        """
+        Dołącza tekst nowego okna.
+
+        Słowa poprzedniego okna, których końcówka została odnaleziona w nowym oknie, stają się stabilne,
+        a słowa nowego okna po dopasowanym fragmencie tworzą nowy tekst tymczasowy. Bez dopasowania
+        zatwierdzana jest tylko część poprzedniego tekstu odpowiadająca fragmentowi, który wypadł z okna,
+        a całe nowe okno staje się tekstem tymczasowym.
+
+        Args:
+            hypothesis:
+                Tekst transkrypcji bieżącego okna.
+
+        Returns:
+            Liczba słów dodanych do stabilnego prefiksu.
+        """
+
+        words = hypothesis.split()
+        previous = self.tentative
+        previous_norm = [_normalize(w) for w in previous]
+        words_norm = [_normalize(w) for w in words]
+
+        match_end = None
+        for k in range(min(len(previous), len(words), self.search_words), 0, -1):
+            suffix = previous_norm[-k:]
+            for skip in range(min(self.max_skip, len(words) - k) + 1):
+                if words_norm[skip:skip + k] == suffix:
+                    match_end = skip + k
+                    break
+            if match_end is not None:
+                break
+
+        if match_end is not None:
+            committed = len(previous)
+            self.tentative = words[match_end:]
+        else:
+            committed = round(len(previous) * self.aged_fraction)
+            self.tentative = words
+
+        self.stable.extend(previous[:committed])
+        return committed
+
+    def text(self, max_chars: int | None = None) -> str:
+        """
+        Zwraca tekst napisów: stabilny prefiks i tekst tymczasowy.
+
+        Args:
+            max_chars:
+                Maksymalna liczba znaków od końca tekstu.
+        """
+
+        text = " ".join(self.stable + self.tentative)
+        if max_chars is not None and len(text) > max_chars:
+            text = "…" + text[-max_chars:].split(" ", 1)[-1]
+        return text
+
+
+class LiveCaptioner:
+    """
+    Transkrybuje na bieżąco ostatnie `window_seconds` nagrania co `hop_seconds` i przekazuje napisy do GUI.
+
+    Moduł nagrywania przekazuje odczytane dane PCM do `feed`, które jedynie dopisuje próbki do bufora
+    pierścieniowego, więc wątek nagrywania nie czeka na transkrypcję.
+
+    Args:
+        update_caption:
+            Funkcja GUI wyświetlająca tekst napisów.
+        window_seconds:
+            Długość transkrybowanego okna w sekundach.
+        hop_seconds:
+            Odstęp między kolejnymi oknami w sekundach.
+        model_name:
+            Nazwa modelu Whisper używanego do napisów.
+    """
+
+    def __init__(self, update_caption: Callable[[str], None], window_seconds: float = LIVE_WINDOW_SECONDS, hop_seconds: float = LIVE_HOP_SECONDS, model_name: str = LIVE_MODEL_NAME):
+        self.update_caption = update_caption
+        self.window_seconds = window_seconds
+        self.hop_seconds = hop_seconds
+        self.model_name = model_name
+        self.stitcher = CaptionStitcher(aged_fraction=min(1.0, hop_seconds / window_seconds))
+
+        self._ring = np.zeros(int(window_seconds * WHISPER_SAMPLE_RATE), dtype=np.float32)
+        self._write = 0
+        self._filled = 0
+        self._last_feed = None
+        self._carry = b""
+        # Stan zmiany częstotliwości próbkowania przenoszony między wywołaniami `feed`
+        self._resample_rate = None
+        self._resample_phase = 0.0
+        self._previous_sample = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = {"windows": 0, "silent_windows": 0, "latency_seconds": 0.0, "max_latency_seconds": 0.0, "last_latency_seconds": 0.0}
+
+    def feed(self, pcm: memoryview | bytes, sample_rate: int, channels: int = 1) -> None:
+        """
+        Dopisuje dane PCM (s16le) do bufora okna, w razie potrzeby zmieniając częstotliwość próbkowania na 16 kHz.
+
+        Args:
+            pcm:
+                Surowe dane PCM w dowolnych porcjach; niepełna ramka jest przechowywana do kolejnego wywołania.
+            sample_rate:
+                Częstotliwość próbkowania danych.
+            channels:
+                Liczba przeplatanych kanałów.
+        """
+
+        frame_bytes = 2 * channels
+        if self._carry:
+            pcm = self._carry + bytes(pcm)
+        usable = len(pcm) - len(pcm) % frame_bytes
+        self._carry = bytes(pcm[usable:])
+
+        samples = np.frombuffer(pcm[:usable], dtype=np.int16).astype(np.float32) / 32768.0
+        if channels > 1:
+            samples = samples.reshape(-1, channels).mean(axis=1)
+        if sample_rate != WHISPER_SAMPLE_RATE and samples.size:
+            samples = self._resample(samples, sample_rate)
+
+        size = self._ring.size
+        samples = samples[-size:]
+        with self._lock:
+            first = min(samples.size, size - self._write)
+            self._ring[self._write:self._write + first] = samples[:first]
+            self._ring[:samples.size - first] = samples[first:]
+            self._write = (self._write + samples.size) % size
+            self._filled = min(size, self._filled + samples.size)
+            self._last_feed = time.perf_counter()
+
+    def _resample(self, samples: np.ndarray, sample_rate: int) -> np.ndarray:
+        """
+        Zmienia częstotliwość próbkowania na 16 kHz interpolacją liniową ciągłą między kolejnymi porcjami danych.
+
+        Położenie następnej próbki wyjściowej względem początku porcji (faza) i ostatnia próbka wejściowa są
+        przenoszone do kolejnego wywołania, więc porcje o długości niebędącej wielokrotnością kroku nie gubią
+        ani nie powtarzają próbek, a próbki między porcjami są interpolowane jak w ciągłym sygnale.
+        """
+
+        if sample_rate != self._resample_rate:
+            self._resample_rate = sample_rate
+            self._resample_phase = 0.0
+            self._previous_sample = None
+        step = sample_rate / WHISPER_SAMPLE_RATE
+        phase = self._resample_phase
+        if self._previous_sample is None:
+            positions, values = np.arange(samples.size), samples
+        else:
+            # Faza z przedziału [-1, 0) wskazuje próbkę między ostatnią próbką poprzedniej porcji a pierwszą bieżącej
+            positions, values = np.arange(-1, samples.size), np.concatenate(([self._previous_sample], samples))
+        count = int((samples.size - 1 - phase) // step) + 1 if phase <= samples.size - 1 else 0
+        output = np.interp(phase + step * np.arange(count), positions, values).astype(np.float32)
+        self._resample_phase = phase + step * count - samples.size
+        self._previous_sample = samples[-1]
+        return output
+
+    def _snapshot(self) -> tuple[np.ndarray, float | None]:
+        """Zwraca kopię bieżącego okna w kolejności chronologicznej oraz czas dopisania ostatnich próbek."""
+
+        with self._lock:
+            window = np.concatenate((self._ring[self._write:], self._ring[:self._write]))
+            return window[window.size - self._filled:], self._last_feed
+
+    def start(self) -> None:
+        """Uruchamia wątek napisów. Model ładowany jest przed pierwszym oknem."""
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        log.debug(f"Napisy na żywo: model {self.model_name}, okno {self.window_seconds} s, krok {self.hop_seconds} s")
+
+    def stop(self) -> None:
+        """Zatrzymuje wątek napisów i loguje zmierzone opóźnienia."""
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        log.info(f"Statystyki napisów na żywo: {self.get_stats()}")
+
+    def _run(self) -> None:
+        """Co `hop_seconds` transkrybuje bieżące okno i aktualizuje napisy."""
+
+        engine = get_engine()
+        model = get_whisper_model(self.model_name, engine=engine.name)
+        options = engine.decoding_options("fast")
+        last_feed = None
+
+        while not self._stop.wait(self.hop_seconds):
+            window, feed_time = self._snapshot()
+            if feed_time is None or feed_time == last_feed or window.size < WHISPER_SAMPLE_RATE:
+                continue
+            last_feed = feed_time
+
+            if np.sqrt(np.mean(window * window)) < SILENCE_RMS:
+                self._stats["silent_windows"] += 1
+                continue
+
+            try:
+                result = engine.transcribe(model, window, language="pl", options=options)
+            except Exception as err:
+                log.error(f"Błąd transkrypcji napisów na żywo: {err}")
+                continue
+
+            self.stitcher.update(result["text"])
+            self.update_caption(self.stitcher.text(max_chars=90))
+
+            latency = time.perf_counter() - feed_time
+            self._stats["windows"] += 1
+            self._stats["latency_seconds"] += latency
+            self._stats["last_latency_seconds"] = latency
+            self._stats["max_latency_seconds"] = max(self._stats["max_latency_seconds"], latency)
+
+    def get_stats(self) -> dict:
+        """
+        Zwraca metryki napisów.
+
+        Returns:
+            Słownik z liczbą przetranskrybowanych i pominiętych (cichych) okien, średnim, maksymalnym i ostatnim
+            opóźnieniem tekstu tymczasowego oraz średnim opóźnieniem tekstu stabilnego (o krok okna większym).
+        """
+
+        stats = dict(self._stats)
+        stats["mean_latency_seconds"] = stats["latency_seconds"] / stats["windows"] if stats["windows"] else 0.0
+        stats["mean_stable_latency_seconds"] = stats["mean_latency_seconds"] + self.hop_seconds if stats["windows"] else 0.0
+        return stats
@@ -0,0 +1,209 @@
+# app/meeting_search.py
+
+"""Moduł wyszukiwania w transkrypcjach spotkań
+
+Skrypt przeszukuje transkrypcje wszystkich nagranych spotkań przy pomocy indeksu pełnotekstowego bazy spotkań
+(moduł app.utilities.meeting_store). Każdy wynik wskazuje spotkanie, timestamp fragmentu transkrypcji oraz zrzut
+ekranu widoczny w chwili rozpoczęcia fragmentu. Z wyszukiwania korzysta okno wyszukiwania aplikacji, a także
+wiersz poleceń:
+
+    python -m app.meeting_search "budżet wdrożenia" --limit 10
+
+Wyszukiwanie tematyczne (opcja --tematycznie) zwraca spotkania najbliższe zapytaniu według podobieństwa wektorów
+transkrypcji (moduł app.utilities.vector_index), także gdy nie zawierają dokładnie podanych słów. Spotkania trafiają
+do indeksu po zakończeniu transkrypcji; spotkania nagrane przed utworzeniem indeksu są do niego dopisywane
+jednorazowo - w tle po otwarciu okna wyszukiwania lub poleceniem:
+
+    python -m app.meeting_search --indeksuj
+
+Wymagane zależności
+
+Aby uruchomić skrypt, należy zainstalować następujące pakiety w środowisku Python:
+
+    - numpy: Wyszukiwanie tematyczne
+    - loguru: Rozbudowany system logowania
+
+Skrypt może być używany jako moduł i zawiera następujące funkcje:
+
+    * search_meetings - wyszukuje fragmenty transkrypcji spotkań zawierające podane słowa.
+    * search_topics - wyszukuje spotkania najbliższe tematycznie zapytaniu.
+    * index_meetings - dopisuje do indeksu wyszukiwania tematycznego zakończone spotkania spoza indeksu.
+    * format_hit - zwraca opis wyniku wyszukiwania w jednej linii.
+    * no_results_message - zwraca komunikat dla wyszukiwania bez wyników.
+    * main - obsługa wyszukiwania z wiersza poleceń.
+"""
+
+import sys
+import time
+import argparse
+from loguru import logger as log
+from app.utilities.meeting_store import get_meeting_store, search_words
+from app.utilities.vector_index import get_vector_index
+
+MEETINGS_FOLDER = "./spotkania"
+# Długość fragmentu transkrypcji pokazywanego w wynikach wyszukiwania tematycznego
+SNIPPET_LENGTH = 160
+# Komunikat dla zapytania złożonego wyłącznie ze słów funkcyjnych, pomijanych w wyszukiwaniu pełnotekstowym
+STOP_WORDS_ONLY = "Zapytanie zawiera wyłącznie pomijane słowa funkcyjne (np. „jest”, „to”, „że”). Dodaj słowa treści."
+
+
+def search_meetings(query: str, limit: int = 20, meetings_folder: str | None = MEETINGS_FOLDER) -> list[dict]:
+    """
+    Wyszukuje fragmenty transkrypcji spotkań zawierające podane słowa.
+
+    Args:
+        query:
+            Słowa do wyszukania.
+        limit:
+            Maksymalna liczba wyników.
+        meetings_folder:
+            Folder ze spotkaniami, z którego przed wyszukiwaniem importowane są spotkania spoza bazy
+            (None - bez importu).
+
+    Returns:
+        Wyniki posortowane według trafności (opis pól w `MeetingStore.search`).
+    """
+
+    store = get_meeting_store()
+    if meetings_folder is not None:
+        store.sync_meetings(meetings_folder)
+    return store.search(query, limit)
+
+
+def index_meetings(meetings_folder: str | None = MEETINGS_FOLDER) -> int:
+    """
+    Dopisuje do indeksu wyszukiwania tematycznego zakończone spotkania, których jeszcze w nim nie ma.
+
+    Spotkanie trafia do indeksu po zakończeniu transkrypcji, dlatego uzupełnienie jest potrzebne jednorazowo - dla
+    spotkań nagranych przed utworzeniem indeksu lub skopiowanych do folderu spotkań. Spotkanie w trakcie nagrywania
+    lub transkrypcji jest pomijane.
+
+    Args:
+        meetings_folder:
+            Folder ze spotkaniami, z którego najpierw importowane są spotkania spoza bazy (None - bez importu).
+
+    Returns:
+        Liczba dopisanych fragmentów.
+    """
+
+    store = get_meeting_store()
+    if meetings_folder is not None:
+        store.sync_meetings(meetings_folder)
+    return get_vector_index().sync_meetings([directory for _, directory in store.list_meetings(finished_only=True)])
+
+
+def search_topics(query: str, limit: int = 10) -> list[dict]:
+    """
+    Wyszukuje spotkania najbliższe tematycznie zapytaniu.
+
+    Przeszukiwany jest wyłącznie indeks wektorów - spotkania spoza indeksu dopisuje `index_meetings`.
+
+    Args:
+        query:
+            Opis tematu.
+        limit:
+            Maksymalna liczba spotkań.
+
+    Returns:
+        Wyniki posortowane według podobieństwa, z polami jak w `search_meetings` oraz podobieństwem ("score").
+        Fragment tekstu ("snippet") to początek najbliższego zapytaniu fragmentu transkrypcji spotkania.
+    """
+
+    store = get_meeting_store()
+    hits = get_vector_index().search([query], limit)[0]
+    for hit in hits:
+        try:
+            with open(hit["path"], encoding="utf-8") as file:
+                hit["snippet"] = file.read(SNIPPET_LENGTH)
+        except OSError:
+            # Transkrypcja fragmentu scalona po indeksowaniu (txt_files_aggregation)
+            hit["snippet"] = ""
+        screenshots = store.get_screenshots(hit["directory"])
+        earlier = [path for timestamp, path in screenshots if timestamp <= hit["timestamp"]]
+        hit["screenshot"] = earlier[-1] if earlier else (screenshots[0][1] if screenshots else None)
+    return hits
+
+
+def format_hit(hit: dict) -> str:
+    """
+    Zwraca opis wyniku wyszukiwania w jednej linii.
+
+    Args:
+        hit:
+            Wynik zwrócony przez `search_meetings`.
+
+    Returns:
+        Nazwa spotkania, timestamp fragmentu i fragment tekstu.
+    """
+
+    snippet = " ".join(hit["snippet"].split())
+    return f"{hit['meeting']} {hit['timestamp']}: {snippet}"
+
+
+def no_results_message(query: str, topics: bool = False) -> str:
+    """
+    Zwraca komunikat dla wyszukiwania bez wyników.
+
+    Args:
+        query:
+            Zapytanie wyszukiwania.
+        topics:
+            Czy było to wyszukiwanie tematyczne.
+
+    Returns:
+        Informacja, że zapytanie zawiera wyłącznie pomijane słowa funkcyjne, lub "Brak wyników.".
+    """
+
+    if not topics and not search_words(query):
+        return STOP_WORDS_ONLY
+    return "Brak wyników."
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Obsługa wyszukiwania z wiersza poleceń.
+
+    Args:
+        argv:
+            Argumenty wiersza poleceń (domyślnie sys.argv).
+
+    Returns:
+        Kod wyjścia: 0 - znaleziono wyniki (lub uzupełniono indeks bez wyszukiwania), 1 - brak wyników.
+    """
+
+    parser = argparse.ArgumentParser(prog="python -m app.meeting_search", description="Wyszukiwanie w transkrypcjach spotkań.")
+    parser.add_argument("query", nargs="*", help="słowa do wyszukania")
+    parser.add_argument("--limit", type=int, default=20, help="maksymalna liczba wyników (domyślnie 20)")
+    parser.add_argument("--folder", default=MEETINGS_FOLDER, help="folder ze spotkaniami (domyślnie ./spotkania)")
+    parser.add_argument("--tematycznie", action="store_true", help="wyszukiwanie spotkań podobnych tematycznie")
+    parser.add_argument("--indeksuj", action="store_true", help="dopisanie do indeksu wyszukiwania tematycznego spotkań spoza indeksu")
+    args = parser.parse_args(argv)
+    if not args.query and not args.indeksuj:
+        parser.error("podaj słowa do wyszukania lub opcję --indeksuj")
+
+    if args.indeksuj:
+        start = time.perf_counter()
+        fragments = index_meetings(args.folder)
+        print(f"Dopisano do indeksu wyszukiwania tematycznego {fragments} fragmentów ({time.perf_counter() - start:.1f} s).")
+        if not args.query:
+            return 0
+
+    start = time.perf_counter()
+    if args.tematycznie:
+        hits = search_topics(" ".join(args.query), args.limit)
+    else:
+        hits = search_meetings(" ".join(args.query), args.limit, args.folder)
+    log.debug(f"Wyszukiwanie: {len(hits)} wyników w {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    for hit in hits:
+        print(format_hit(hit))
+        print(f"    transkrypcja: {hit['path']}")
+        if hit["screenshot"] is not None:
+            print(f"    zrzut ekranu: {hit['screenshot']}")
+    if not hits:
+        print(no_results_message(" ".join(args.query), args.tematycznie))
+    return 0 if hits else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
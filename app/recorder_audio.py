@@ -2,7 +2,21 @@
 
 """Moduł nagrywania dźwięku
 
-Skrypt umożliwia nagrywanie dźwięku z wybranego urządzenia audio, podział nagrania na fragmenty oraz zapis plików audio w formacie MP3.
+Skrypt umożliwia nagrywanie dźwięku z wybranego urządzenia audio, podział nagrania na fragmenty oraz zapis plików audio w formacie MP3
+lub w jednym z formatów opisanych w module app.utilities.audio_formats (zmienna środowiskowa KNZS_AUDIO_FORMAT).
+
+Dostępne są dwa tryby przechwytywania (zmienna środowiskowa KNZS_CAPTURE_MODE):
+
+    - pipe (domyślny): FFmpeg przesyła surowe PCM do Pythona, który dzieli je na fragmenty i eksportuje do wybranego formatu.
+    - segment: jeden długo działający proces FFmpeg sam zapisuje fragmenty (muxer segment),
+      a Python jedynie obserwuje listę ukończonych segmentów.
+
+Jeśli do `start_recording` zostanie przekazana kolejka `FragmentQueue`, fragmenty (float32, 16 kHz, mono) trafiają
+bezpośrednio do transkrypcji, a zapis na dysk odbywa się asynchronicznie, wyłącznie w celach archiwalnych.
+
+Jeśli do `start_recording` zostanie przekazany manifest sesji (`SessionManifest`), zapis każdego fragmentu
+oraz koniec nagrywania są w nim odnotowywane. Każdy zapisany fragment jest także dodawany do bazy spotkań
+(moduł app.utilities.meeting_store).
 
 Wymagane zależności
 
@@ -14,12 +28,17 @@ Aby uruchomić skrypt, należy zainstalować następujące pakiety w środowisku
 Do prawidłowego działania aplikacji należy zaimportować:
 
     - log_status z modułu app.utilities.logger, służącą do logowania komunikatów statusowych.
+    - get_audio_format, encode_fragment z modułu app.utilities.audio_formats, opisujące format zapisu fragmentów.
 
 Skrypt może być używany jako moduł i zawiera następujące funkcje:
 
     * start_recording — rozpoczyna proces nagrywania dźwięku z wybranego urządzenia.
     * stop_recording — zatrzymuje nagrywanie audio
     * _save_audio_fragments — zapisuje fragmenty audio o określonej długości podczas aktywnego nagrywania.
+    * _archive_fragments — zapisuje na dysk fragmenty przekazane do transkrypcji w pamięci.
+    * _watch_segments — udostępnia segmenty ukończone przez FFmpeg w trybie segment.
+    * _read_pcm_fragments — dzieli strumień PCM na fragmenty w prealokowanym buforze, bez dekodowania danych.
+    * _read_vad_fragments — dzieli strumień PCM na fragmenty w przerwach wypowiedzi (VAD), pomijając ciszę.
 
 Każda funkcja posiada odpowiednie mechanizmy obsługi błędów, logowania oraz komunikatów dla użytkownika.
 """
@@ -27,21 +46,56 @@ Każda funkcja posiada odpowiednie mechanizmy obsługi błędów, logowania oraz
 import platform
 import subprocess
 import os
+import queue
 import threading
 from typing import Callable
 from datetime import datetime
-from pydub import AudioSegment
-from io import BytesIO
 from tkinter import messagebox
 from loguru import logger as log
 from app.utilities.logger import log_status
+from app.utilities.audio_formats import get_audio_format, encode_fragment, pcm_to_float32, SAMPLE_WIDTH, WHISPER_SAMPLE_RATE, FRAGMENT_SECONDS
+from app.utilities.fragment_queue import FragmentQueue
+from app.utilities.vad import VadSegmenter
+from app.utilities.log_mel import StreamingLogMel
+from app.utilities.session_manifest import SessionManifest, FRAGMENT_RECORDED, RECORDING_FINISHED
+from app.utilities.meeting_store import get_meeting_store
 
 recording_process = None
 recording_active = True
 recording_directory = None
-
-
-def start_recording(update_status: Callable[[str], None], selected_audio_device: str, recording_folder: str) -> None:
+fragment_thread = None
+active_capture_mode = None
+active_audio_format = get_audio_format()
+fragment_queue = None
+archive_queue = None
+archive_thread = None
+# Manifest sesji, w którym odnotowywane są zapisane fragmenty
+session_manifest = None
+# Zdarzenie ustawiane po zapisaniu ostatniego fragmentu i pliku `koniec.txt`
+recording_finished = threading.Event()
+
+# Tryb przechwytywania: "pipe" lub "segment"
+capture_mode = os.environ.get("KNZS_CAPTURE_MODE", "pipe")
+# Rozszerzenie segmentu zapisywanego przez FFmpeg, usuwane po jego ukończeniu
+SEGMENT_PART_SUFFIX = ".part"
+
+# Parametry podziału surowego strumienia PCM (s16le) odbieranego z FFmpeg
+READ_CHUNK_SIZE = 4096
+# Czas oczekiwania na zapis ostatniego fragmentu po zatrzymaniu nagrywania (s)
+FRAGMENT_JOIN_TIMEOUT = 30
+
+# Podział nagrania w przerwach wypowiedzi (VAD): fragmenty od VAD_MIN_SECONDS do FRAGMENT_SECONDS, cisza pomijana
+vad_enabled = os.environ.get("KNZS_VAD", "0") == "1"
+VAD_MIN_SECONDS = float(os.environ.get("KNZS_VAD_MIN_SECONDS", "5"))
+vad_segmenter = None
+# Odbiorca bieżących danych PCM (napisy na żywo)
+live_captioner = None
+
+# Przyrostowe obliczanie spektrogramu log-mel w wątku nagrywania (tylko przy przekazywaniu fragmentów w pamięci)
+streaming_mel_enabled = os.environ.get("KNZS_STREAMING_MEL", "0") == "1"
+
+
+def start_recording(update_status: Callable[[str], None], selected_audio_device: str, recording_folder: str, mode: str | None = None, storage_format: str | None = None, audio_queue: FragmentQueue | None = None, captioner=None, manifest: SessionManifest | None = None) -> None:
     """
     Funkcja rozpoczynająca nagrywanie dźwięku z wybranego urządzenia.
 
@@ -52,10 +106,22 @@ def start_recording(update_status: Callable[[str], None], selected_audio_device:
             Zmienna zawierająca nazwę urządzenia audio nagrywającego dźwięk
         recording_folder:
             Zmienna zawierająca ścieżkę do folderu w którym będzie zapisywane audio
+        mode:
+            Tryb przechwytywania ("pipe" lub "segment"). Domyślnie wartość `capture_mode`.
+        storage_format:
+            Format zapisu fragmentów (mp3, wav, flac, opus). Domyślnie format z konfiguracji.
+        audio_queue:
+            Kolejka, przez którą fragmenty są przekazywane do transkrypcji w pamięci. Wymaga trybu pipe.
+        captioner:
+            Obiekt `LiveCaptioner` otrzymujący bieżące dane PCM dla napisów na żywo. Wymaga trybu pipe.
+        manifest:
+            Manifest sesji, w którym odnotowywany jest zapis fragmentów i koniec nagrywania.
     """
-    global recording_process, recording_active, recording_directory
+    global recording_process, recording_active, recording_directory, fragment_thread, active_capture_mode, active_audio_format
+    global fragment_queue, archive_queue, archive_thread, vad_segmenter, live_captioner, session_manifest
 
     recording_directory = recording_folder
+    session_manifest = manifest
 
     if not selected_audio_device:
         messagebox.showerror("Błąd", "Nie wybrano urządzenia audio. Skonfiguruj ustawienia.")
@@ -65,18 +131,43 @@ def start_recording(update_status: Callable[[str], None], selected_audio_device:
     if update_status:
         log_status("Nagrywanie dźwięku w toku...", "info", update_status)
 
+    recording_finished.clear()
+
+
+    mode = mode or capture_mode
+    audio_format = get_audio_format(storage_format)
+
+    if audio_queue is not None:
+        if mode == "segment":
+            log.warning("Przekazywanie fragmentów w pamięci wymaga trybu pipe. Używam trybu pipe.")
+            mode = "pipe"
+        # Transkrypcja otrzymuje próbki w formacie Whisper, niezależnie od formatu archiwum
+        audio_format = {**audio_format, "sample_rate": WHISPER_SAMPLE_RATE, "channels": 1}
+
+    if vad_enabled and mode == "segment":
+        log.warning("Podział nagrania w przerwach wypowiedzi (VAD) wymaga trybu pipe. Używam trybu pipe.")
+        mode = "pipe"
+
+    if captioner is not None and mode == "segment":
+        log.warning("Napisy na żywo wymagają trybu pipe. Używam trybu pipe.")
+        mode = "pipe"
 
     # Konfiguracja polecenia FFmpeg
-    ffmpeg_command = [
-        "ffmpeg",
-        "-y",
-        "-f", "dshow",
-        "-i", f"audio={selected_audio_device}",
-        "-f", "s16le",  # Surowy format PCM (16-bitowy)
-        "-ar", "44100",  # Częstotliwość próbkowania
-        "-ac", "2",  # Liczba kanałów audio
-        "pipe:1"
-    ]
+    if mode == "segment":
+        ffmpeg_command = _segment_ffmpeg_command(selected_audio_device, recording_directory, audio_format)
+        fragment_worker = _watch_segments
+    else:
+        ffmpeg_command = [
+            "ffmpeg",
+            "-y",
+            "-f", "dshow",
+            "-i", f"audio={selected_audio_device}",
+            "-f", "s16le",  # Surowy format PCM (16-bitowy)
+            "-ar", str(audio_format["sample_rate"]),  # Częstotliwość próbkowania
+            "-ac", str(audio_format["channels"]),  # Liczba kanałów audio
+            "pipe:1"
+        ]
+        fragment_worker = _save_audio_fragments
 
     try:
         # Uruchomienie FFmpeg z wyjściem na stdout
@@ -89,61 +180,308 @@ def start_recording(update_status: Callable[[str], None], selected_audio_device:
             shell=(platform.system() == "Windows")
         )
         recording_active = True
+        active_capture_mode = mode
+        active_audio_format = audio_format
+        fragment_queue = audio_queue
+        live_captioner = captioner
+        vad_segmenter = None
+        if vad_enabled:
+            vad_segmenter = VadSegmenter(audio_format["sample_rate"], audio_format["channels"], VAD_MIN_SECONDS, FRAGMENT_SECONDS, read_chunk_size=READ_CHUNK_SIZE)
+
+        if fragment_queue is not None:
+            archive_queue = queue.Queue()
+            archive_thread = threading.Thread(target=_archive_fragments, args=(archive_queue, audio_format), daemon=True)
+            archive_thread.start()
 
         # Uruchomienie wątku do zapisywania fragmentów
-        threading.Thread(target=_save_audio_fragments, daemon=True).start()
-        log.debug(f"Nagrywanie dźwięku rozpoczęte w katalogu: {recording_directory}")
+        fragment_thread = threading.Thread(target=fragment_worker, daemon=True)
+        fragment_thread.start()
+        log.debug(f"Nagrywanie dźwięku rozpoczęte w katalogu: {recording_directory} (tryb: {mode})")
     except Exception as e:
         if update_status:
             log_status(f"Błąd podczas rozpoczynania nagrywania dźwięku: {e}", "error", update_status)
 
 
-def _save_audio_fragments() -> None:
+def _segment_ffmpeg_command(selected_audio_device: str, output_directory: str, audio_format: dict) -> list[str]:
+    """
+    Buduje polecenie FFmpeg, które samodzielnie dzieli nagranie na fragmenty w wybranym formacie.
+
+    Segmenty są zapisywane z rozszerzeniem `.part`, a nazwa każdego ukończonego segmentu trafia
+    na standardowe wyjście (lista segmentów w formacie flat).
+
+    Args:
+        selected_audio_device:
+            Nazwa urządzenia audio nagrywającego dźwięk.
+        output_directory:
+            Katalog, w którym zapisywane są segmenty.
+        audio_format:
+            Opis formatu zapisu fragmentów z modułu app.utilities.audio_formats.
+
+    Returns:
+        Lista argumentów polecenia FFmpeg.
     """
-    Zapisuje fragmenty audio co 20 sekund bez zatrzymywania nagrywania.
+
+    return [
+        "ffmpeg",
+        "-y",
+        "-nostats",
+        "-loglevel", "warning",
+        "-f", "dshow",
+        "-i", f"audio={selected_audio_device}",
+        "-ar", str(audio_format["sample_rate"]),  # Częstotliwość próbkowania
+        "-ac", str(audio_format["channels"]),  # Liczba kanałów audio
+        *audio_format["ffmpeg_codec"],
+        "-f", "segment",
+        "-segment_time", str(FRAGMENT_SECONDS),
+        "-segment_format", audio_format["export"]["format"],
+        "-reset_timestamps", "1",
+        "-strftime", "1",  # Nazwa segmentu to czas jego rozpoczęcia
+        "-segment_list", "pipe:1",
+        "-segment_list_type", "flat",
+        os.path.join(output_directory, f"%H-%M-%S.{audio_format['extension']}{SEGMENT_PART_SUFFIX}")
+    ]
+
+
+def _finalize_segment(part_path: str) -> None:
+    """
+    Nadaje ukończonemu segmentowi docelową nazwę, dzięki czemu staje się widoczny dla transkrypcji.
+
+    Args:
+        part_path:
+            Ścieżka do segmentu z rozszerzeniem `.part`.
+    """
+
+    output_file = part_path[:-len(SEGMENT_PART_SUFFIX)]
+    try:
+        os.replace(part_path, output_file)
+        log.debug(f"Zapisano fragment audio: {os.path.basename(output_file)}")
+        get_meeting_store().add_fragment(output_file)
+        if session_manifest is not None:
+            session_manifest.record(FRAGMENT_RECORDED, os.path.basename(output_file))
+    except OSError as e:
+        log.error(f"Błąd podczas udostępniania segmentu audio {os.path.basename(part_path)}: {e}")
+
+
+def _watch_segments() -> None:
+    """
+    Obserwuje listę segmentów ukończonych przez FFmpeg w trybie segment.
 
     Działanie:
-        - Odczytuje dane audio z procesu FFmpeg w czasie rzeczywistym.
-        - Buforuje surowe dane audio.
-        - Po osiągnięciu 20-sekundowego fragmentu zapisuje go jako plik MP3.
-        - Przechowuje nieprzetworzone dane w buforze, aby zachować ciągłość nagrywania.
+        - Odczytuje ze standardowego wyjścia FFmpeg nazwy kolejnych ukończonych segmentów.
+        - Zmienia nazwę każdego ukończonego segmentu z `HH-MM-SS.<ext>.part` na `HH-MM-SS.<ext>`.
+        - Po zakończeniu procesu FFmpeg udostępnia segmenty, które nie zostały zgłoszone na liście.
 
     Notes:
-        - Fragmenty audio są zapisywane w katalogu `recording_directory` jako pliki MP3.
-        - Nazwa każdego pliku to jego timestamp w formacie "HH-MM-SS.mp3".
-        - Nagrywanie odbywa się w formacie MP3 o bitrate 192 kbps.
-        - Jeśli `recording_active` zostanie ustawiona na `False`, nagrywanie zostanie zakończone.
+        - Python nie kopiuje ani nie koduje danych audio, robi to wyłącznie FFmpeg.
+        - Nazwa fragmentu to czas rozpoczęcia segmentu, a nie czas jego zapisu.
     """
 
-    global recording_process, recording_active, recording_directory
-
-    buffer = BytesIO()
-    fragment_duration = 20 * 1000  # 20 sekund w milisekundach
+    global recording_process, recording_directory
 
     try:
-        while recording_active and recording_process.poll() is None:
-            # Odczyt surowych danych audio z FFmpeg
-            data = recording_process.stdout.read(4096)
-            if not data:
+        for line in recording_process.stdout:
+            segment_name = line.decode("utf-8", errors="replace").strip()
+            if not segment_name.endswith(SEGMENT_PART_SUFFIX):
                 continue
+            part_path = os.path.join(recording_directory, os.path.basename(segment_name))
+            if os.path.exists(part_path):
+                _finalize_segment(part_path)
+    except Exception as e:
+        log.error(f"Błąd podczas obserwowania segmentów audio: {e}")
 
-            buffer.write(data)
+    # Segmenty niezgłoszone na liście, np. po przerwaniu procesu FFmpeg
+    for name in sorted(os.listdir(recording_directory)):
+        if name.endswith(SEGMENT_PART_SUFFIX):
+            _finalize_segment(os.path.join(recording_directory, name))
 
-            # Jeśli bufor zawiera dane o długości >= 10 sekund, zapisz fragment
-            audio_segment = AudioSegment.from_raw(
-                BytesIO(buffer.getvalue()), sample_width=2, frame_rate=44100, channels=2
-            )
 
-            if len(audio_segment) >= fragment_duration:
-                timestamp = datetime.now().strftime("%H-%M-%S")
-                output_file = os.path.join(recording_directory, f"{timestamp}.mp3")
+def _archive_fragments(pending: queue.Queue, audio_format: dict) -> None:
+    """
+    Zapisuje na dysk fragmenty przekazane do transkrypcji w pamięci.
 
-                # Zapisz fragment
-                audio_segment[:fragment_duration].export(output_file, format="mp3", bitrate="192k")
-                log.debug(f"Zapisano fragment audio: {output_file.replace("\\", "/").rsplit("/",1)[1]}")
+    Działanie:
+        - Pobiera z kolejki pary (surowe PCM, ścieżka docelowa) aż do otrzymania wartości None.
+        - Zapisuje fragment pod tymczasową nazwą `.part` i po zakończeniu zapisu nadaje mu docelową nazwę,
+          dzięki czemu transkrypcja nigdy nie odczyta niepełnego pliku.
 
-                # Usuń zapisane dane z bufora
-                buffer = BytesIO(audio_segment[fragment_duration:].raw_data)
+    Args:
+        pending:
+            Kolejka fragmentów oczekujących na zapis.
+        audio_format:
+            Opis formatu zapisu z częstotliwością i liczbą kanałów danych PCM.
+    """
+
+    while True:
+        item = pending.get()
+        if item is None:
+            break
+
+        pcm, output_file = item
+        part_path = output_file + SEGMENT_PART_SUFFIX
+        try:
+            encode_fragment(pcm, part_path, audio_format["extension"], audio_format["sample_rate"], audio_format["channels"])
+            _finalize_segment(part_path)
+        except Exception as e:
+            log.error(f"Błąd podczas archiwizacji fragmentu audio {os.path.basename(output_file)}: {e}")
+
+
+def _read_pcm_fragments(stream, fragment_bytes: int, on_fragment: Callable[[memoryview], None], is_active: Callable[[], bool], on_data: Callable[[memoryview], None] | None = None) -> int:
+    """
+    Dzieli strumień surowego PCM na fragmenty o stałej długości w bajtach.
+
+    Dane trafiają bezpośrednio do prealokowanego bufora o rozmiarze dokładnie jednego fragmentu,
+    więc każdy bajt jest kopiowany tylko raz, a koszt odczytu nie rośnie wraz z długością fragmentu.
+    Fragment jest przekazywany do `on_fragment` jako widok bufora, gdy bufor zostanie zapełniony.
+
+    Args:
+        stream:
+            Strumień binarny z metodą `readinto1` lub `readinto` (np. stdout procesu FFmpeg).
+        fragment_bytes:
+            Długość fragmentu w bajtach, wielokrotność rozmiaru ramki audio.
+        on_fragment:
+            Funkcja otrzymująca pełny fragment. Widok jest ważny tylko do końca jej wywołania.
+        is_active:
+            Funkcja zwracająca False, gdy odczyt ma zostać przerwany.
+        on_data:
+            Opcjonalna funkcja otrzymująca każdą odczytaną porcję danych (np. napisy na żywo).
+
+    Returns:
+        Liczba przekazanych fragmentów.
+
+    Notes:
+        - Odczyt blokuje się do czasu pojawienia się danych, a koniec strumienia kończy pętlę,
+          dzięki czemu wątek nie kręci się w pustej pętli.
+        - Niepełny fragment pozostały po zakończeniu nagrywania jest pomijany.
+    """
+
+    buffer = bytearray(fragment_bytes)
+    view = memoryview(buffer)
+    readinto = getattr(stream, "readinto1", None) or stream.readinto
+    filled = 0
+    count = 0
+
+    while is_active():
+        read = readinto(view[filled:filled + READ_CHUNK_SIZE])
+        if not read:
+            # Koniec strumienia - proces FFmpeg został zakończony
+            break
+
+        if on_data is not None:
+            on_data(view[filled:filled + read])
+        filled += read
+        if filled == fragment_bytes:
+            on_fragment(view)
+            count += 1
+            filled = 0
+
+    return count
+
+
+def _read_vad_fragments(stream, segmenter: VadSegmenter, on_fragment: Callable[[memoryview, bool], None], is_active: Callable[[], bool], on_data: Callable[[memoryview], None] | None = None) -> None:
+    """
+    Dzieli strumień surowego PCM na fragmenty w przerwach wypowiedzi.
+
+    Dane są odczytywane bezpośrednio do bufora `VadSegmenter`, który po każdym odczycie klasyfikuje nowe ramki
+    i przekazuje zamknięte fragmenty (wraz z informacją, czy zawierają wyłącznie ciszę) do `on_fragment`.
+
+    Args:
+        stream:
+            Strumień binarny z metodą `readinto1` lub `readinto` (np. stdout procesu FFmpeg).
+        segmenter:
+            Obiekt dzielący strumień na fragmenty.
+        on_fragment:
+            Funkcja otrzymująca fragment i informację, czy jest cichy. Widok jest ważny tylko do końca jej wywołania.
+        is_active:
+            Funkcja zwracająca False, gdy odczyt ma zostać przerwany.
+        on_data:
+            Opcjonalna funkcja otrzymująca każdą odczytaną porcję danych (np. napisy na żywo).
+    """
+
+    readinto = getattr(stream, "readinto1", None) or stream.readinto
+
+    while is_active():
+        target = segmenter.writable()
+        read = readinto(target)
+        if not read:
+            # Koniec strumienia - proces FFmpeg został zakończony
+            break
+        if on_data is not None:
+            on_data(target[:read])
+        segmenter.commit(read, on_fragment)
+
+
+def _save_audio_fragments() -> None:
+    """
+    Zapisuje fragmenty audio co FRAGMENT_SECONDS sekund (domyślnie 20) bez zatrzymywania nagrywania.
+
+    Działanie:
+        - Odczytuje dane audio z procesu FFmpeg w czasie rzeczywistym.
+        - Buforuje surowe dane audio w prealokowanym buforze o długości jednego fragmentu.
+        - Po osiągnięciu pełnej długości fragmentu zapisuje go w wybranym formacie (domyślnie MP3).
+        - Dane są dekodowane do `AudioSegment` dopiero w momencie eksportu fragmentu.
+        - Jeśli ustawiono `fragment_queue`, fragment trafia do transkrypcji w pamięci,
+          a zapis na dysk wykonuje osobny wątek archiwizujący.
+        - Jeśli włączono VAD (`KNZS_VAD=1`), nagranie jest dzielone w przerwach wypowiedzi, a fragmenty
+          zawierające wyłącznie ciszę nie są zapisywane ani przekazywane do transkrypcji.
+        - Jeśli włączono `KNZS_STREAMING_MEL=1` (przy przekazywaniu w pamięci), spektrogram log-mel fragmentu
+          jest obliczany przyrostowo w trakcie odczytu i przekazywany do transkrypcji razem z próbkami.
+
+    Notes:
+        - Fragmenty audio są zapisywane w katalogu `recording_directory` w formacie `active_audio_format`.
+        - Nazwa każdego pliku to jego timestamp w formacie "HH-MM-SS.<ext>".
+        - Format MP3 to 44.1 kHz stereo o bitrate 192 kbps, formaty wav i flac to 16 kHz mono gotowe dla Whisper.
+        - Jeśli `recording_active` zostanie ustawiona na `False`, nagrywanie zostanie zakończone.
+    """
+
+    global recording_process, recording_active, recording_directory, active_audio_format, fragment_queue, archive_queue, live_captioner
+
+    audio_format = active_audio_format
+    fragment_bytes = FRAGMENT_SECONDS * audio_format["sample_rate"] * audio_format["channels"] * SAMPLE_WIDTH
+
+    # Spektrogram liczony w trakcie fragmentu wymaga stałych granic fragmentów (bez VAD) i próbek 16 kHz mono
+    mel_stream = None
+    if streaming_mel_enabled and fragment_queue is not None:
+        if vad_segmenter is None:
+            mel_stream = StreamingLogMel(FRAGMENT_SECONDS)
+        else:
+            log.warning("Przyrostowy spektrogram log-mel nie działa z podziałem VAD. Spektrogram obliczy transkrypcja.")
+
+    def export_fragment(pcm: memoryview, silent: bool = False) -> None:
+        timestamp = datetime.now().strftime("%H-%M-%S")
+        if silent:
+            log.debug(f"Pominięto cichy fragment audio: {timestamp} ({len(pcm) / fragment_bytes * FRAGMENT_SECONDS:.1f} s)")
+            return
+
+        output_file = os.path.join(recording_directory, f"{timestamp}.{audio_format['extension']}")
+
+        if fragment_queue is not None:
+            pcm_bytes = bytes(pcm)
+            mel = mel_stream.finish() if mel_stream is not None else None
+            fragment_queue.put(timestamp, pcm_to_float32(pcm_bytes, audio_format["channels"]), output_file, mel)
+            archive_queue.put((pcm_bytes, output_file))
+            return
+
+        # Zapisz fragment pod tymczasową nazwą, aby transkrypcja nie odczytała niepełnego pliku
+        part_path = output_file + SEGMENT_PART_SUFFIX
+        encode_fragment(pcm, part_path, audio_format["extension"], audio_format["sample_rate"], audio_format["channels"])
+        _finalize_segment(part_path)
+
+    consumers = []
+    if live_captioner is not None:
+        consumers.append(lambda data: live_captioner.feed(data, audio_format["sample_rate"], audio_format["channels"]))
+    if mel_stream is not None:
+        consumers.append(mel_stream.feed_pcm)
+
+    def on_data(data: memoryview) -> None:
+        for consumer in consumers:
+            consumer(data)
+
+    try:
+        is_active = lambda: recording_active and recording_process.poll() is None
+        if vad_segmenter is not None:
+            _read_vad_fragments(recording_process.stdout, vad_segmenter, export_fragment, is_active, on_data if consumers else None)
+        else:
+            _read_pcm_fragments(recording_process.stdout, fragment_bytes, export_fragment, is_active, on_data if consumers else None)
     except Exception as e:
         log.error(f"Błąd podczas zapisywania fragmentów audio: {e}")
 
@@ -154,8 +492,11 @@ def stop_recording(update_status: Callable[[str], None]) -> None:
 
     Działanie:
         - Ustawia flagę `recording_active` na `False`, co zatrzymuje nagrywanie fragmentów.
-        - Terminatuje proces FFmpeg odpowiedzialny za nagrywanie.
+        - Terminatuje proces FFmpeg odpowiedzialny za nagrywanie (w trybie segment prosi FFmpeg
+          o zamknięcie ostatniego segmentu i czeka na jego udostępnienie).
+        - Czeka na zapis ostatniego fragmentu przez wątek fragmentów (w każdym trybie przechwytywania).
         - Tworzy plik `koniec.txt` w katalogu nagrania, informując o zakończeniu nagrywania.
+        - Ustawia zdarzenie `recording_finished`, na które czeka transkrypcja.
         - Aktualizuje status w GUI.
 
     Args:
@@ -168,7 +509,7 @@ def stop_recording(update_status: Callable[[str], None]) -> None:
         - W przypadku błędów, logi zawierają informacje diagnostyczne.
     """
 
-    global recording_active, recording_process, recording_directory
+    global recording_active, recording_process, recording_directory, fragment_thread, fragment_queue, archive_queue, archive_thread, session_manifest
 
     if update_status:
         log_status("Kończenie nagrywania dźwięku...", "info", update_status)
@@ -177,12 +518,42 @@ def stop_recording(update_status: Callable[[str], None]) -> None:
 
     if recording_process:
         try:
-            recording_process.terminate()
+            if active_capture_mode == "segment" and recording_process.poll() is None:
+                # Polecenie "q" pozwala FFmpeg poprawnie zamknąć ostatni segment
+                recording_process.stdin.write(b"q")
+                recording_process.stdin.flush()
+                try:
+                    recording_process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    recording_process.terminate()
+            else:
+                recording_process.terminate()
             recording_process.wait()
             log.debug("Nagrywanie zakończone.")
         except Exception as e:
             log.error(f"Błąd podczas zatrzymywania nagrywania: {e}")
 
+    # Plik `koniec.txt` i zdarzenie `recording_finished` mogą powstać dopiero po udostępnieniu ostatniego fragmentu
+    # (ostatni segment FFmpeg lub eksport ostatniego fragmentu odczytanego z potoku) - w przeciwnym razie
+    # obserwator folderu zakończyłby pracę przed jego pojawieniem się
+    if fragment_thread is not None:
+        fragment_thread.join(timeout=FRAGMENT_JOIN_TIMEOUT)
+        if fragment_thread.is_alive():
+            log.warning(f"Zapis ostatniego fragmentu audio nie zakończył się w ciągu {FRAGMENT_JOIN_TIMEOUT} s.")
+
+    # Przy przekazywaniu w pamięci: koniec kolejki dla transkrypcji i dokończenie archiwizacji
+    if fragment_queue is not None:
+        fragment_queue.close()
+        log.debug(f"Statystyki kolejki fragmentów: {fragment_queue.get_stats()}")
+        fragment_queue = None
+
+        archive_queue.put(None)
+        archive_thread.join()
+        archive_queue = archive_thread = None
+
+    if vad_segmenter is not None:
+        log.info(f"Statystyki podziału nagrania (VAD): {vad_segmenter.get_stats()}")
+
     # Tworzenie pliku `koniec.txt`
     if recording_directory:
         try:
@@ -192,5 +563,11 @@ def stop_recording(update_status: Callable[[str], None]) -> None:
         except Exception as e:
             log.error(f"Błąd podczas tworzenia pliku `koniec.txt`: {e}")
 
+    if session_manifest is not None:
+        session_manifest.record(RECORDING_FINISHED)
+        session_manifest = None
+
+    recording_finished.set()
+
     if update_status:
         log_status("Nagrywanie zakończone. Pliki zostały zapisane.", "info", update_status)
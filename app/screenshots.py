@@ -9,11 +9,18 @@ Wymagane zależności
 Aby uruchomić skrypt, należy zainstalować następujące pakiety w środowisku Python:
 
     - Pillow: Biblioteka do obsługi grafiki, w tym zrzutów ekranu
+    - numpy: Porównywanie kolejnych zrzutów ekranu
     - loguru: Rozbudowany system logowania
 
 Do prawidłowego działania aplikacji należy zaimportować:
 
     - create_output_folder z modułu app.utilities.recording_utils, służącą do tworzenia folderów wyjściowych.
+    - create_change_detector z modułu app.utilities.change_detection, tworzącą detektor zmian obrazu
+      (tryb pixel lub hash, KNZS_SCREENSHOT_DETECTOR).
+    - create_frame_source z modułu app.utilities.frame_sources, tworzącą źródło zrzutów ekranu
+      (mss lub PIL.ImageGrab, KNZS_FRAME_SOURCE).
+
+Zapisane zrzuty ekranu są dodawane do bazy spotkań (moduł app.utilities.meeting_store).
 
 Skrypt może być używany jako moduł i zawiera następujące funkcje:
 
@@ -27,10 +34,15 @@ Każda funkcja posiada odpowiednie mechanizmy obsługi błędów, logowania oraz
 import os
 import time
 from tkinter import Tk, Canvas, Button
-from PIL import ImageGrab, ImageChops
+import numpy as np
+from PIL import Image
 from loguru import logger as log
 from datetime import datetime
 from app.utilities.recording_utils import create_output_folder
+from app.utilities.change_detection import create_change_detector
+from app.utilities.frame_sources import FrameSource, create_frame_source
+from app.utilities.session_manifest import SessionManifest, SCREENSHOT_SAVED
+from app.utilities.meeting_store import get_meeting_store
 
 recording_active = False
 
@@ -104,7 +116,18 @@ def select_area() -> list[int]:
     root.mainloop()
     return area
 
-def monitor_and_capture(area: list[int], folder: str, threshold:float = 2.0):
+def _save_screenshot(frame: np.ndarray, frame_time: datetime, folder: str, manifest: SessionManifest | None) -> None:
+    """Zapisuje klatkę jako zrzut ekranu JPG i odnotowuje go w bazie spotkań oraz manifeście sesji."""
+
+    output_file = os.path.join(folder, f"{frame_time.strftime("%H-%M-%S")}.jpg")
+    Image.fromarray(frame).save(output_file, "JPEG", quality=85)
+    log.success(f"Zapisano zrzut ekranu: {output_file.replace("\\", "/").rsplit("/", 1)[1]}")
+    get_meeting_store().add_screenshot(output_file)
+    if manifest is not None:
+        manifest.record(SCREENSHOT_SAVED, os.path.basename(output_file))
+
+
+def monitor_and_capture(area: list[int] | None, folder: str, threshold:float = 2.0, manifest: SessionManifest | None = None, detector_mode: str | None = None, source: FrameSource | None = None, interval: float = 3.0) -> int:
     """
     Monitoruje zmiany w wybranym obszarze ekranu i zapisuje zrzut ekranu, jeśli różnice przekraczają określony próg.
 
@@ -113,7 +136,8 @@ def monitor_and_capture(area: list[int], folder: str, threshold:float = 2.0):
 
     Args:
         area:
-            Lista czterech wartości [x, y, width, height], określająca zaznaczony obszar ekranu.
+            Lista czterech wartości [x, y, width, height], określająca zaznaczony obszar ekranu
+            (pomijana, jeśli podano `source`).
 
             - x (int): Współrzędna X górnego lewego rogu zaznaczonego obszaru.
             - y (int): Współrzędna Y górnego lewego rogu zaznaczonego obszaru.
@@ -124,6 +148,19 @@ def monitor_and_capture(area: list[int], folder: str, threshold:float = 2.0):
         threshold:
             Procentowa wartość określająca, jak duża zmiana w obrazie powoduje zapis nowego zrzutu ekranu.
             Wartość domyślna to 2.0%.
+        manifest:
+            Manifest sesji, w którym odnotowywany jest zapis każdego zrzutu ekranu.
+        detector_mode:
+            Tryb wykrywania zmian: "pixel" (procent zmiany w pełnej rozdzielczości) lub "hash" (skrót percepcyjny
+            miniatury, pełne porównanie tylko do potwierdzenia zmiany). Domyślnie tryb z konfiguracji.
+        source:
+            Źródło klatek (np. ImageSequenceSource do testów bez ekranu). Domyślnie zrzuty obszaru `area`
+            źródłem z konfiguracji.
+        interval:
+            Odstęp między zrzutami ekranu w sekundach (klatki źródeł odtwarzania są przetwarzane bez oczekiwania).
+
+    Returns:
+        Liczba zrzutów zapisanych po wykryciu zmiany (bez pierwszego zrzutu).
 
     Raises:
         KeyboardInterrupt: Zatrzymuje pętlę monitorowania w przypadku przerwania programu.
@@ -132,53 +169,52 @@ def monitor_and_capture(area: list[int], folder: str, threshold:float = 2.0):
         >>> monitor_and_capture([100, 150, 800, 600], "./screenshots", threshold=3.5)
 
     Notes:
-        - Funkcja działa w pętli nieskończonej, dopóki `recording_active` nie zostanie ustawiona na `False`.
+        - Funkcja działa w pętli nieskończonej, dopóki `recording_active` nie zostanie ustawiona na `False`
+          lub źródło klatek się nie skończy.
         - Domyślnie zapisuje obrazy jako pliki JPG o jakości 85.
         - Próg detekcji zmian (`threshold`) można dostosować dla lepszej czułości.
     """
 
     global recording_active
-    recording_active = True
-    x, y, width, height = area
-    bbox = (x, y, x + width, y + height)
-
-    previous_screenshot = None
-    count = 0
     recording_active = True  # Flaga kontrolna
 
-    # Zrób aktualny zrzut ekranu
-    screenshot = ImageGrab.grab(bbox).convert("RGB")
-    first_output_file = os.path.join(folder, f"{datetime.now().strftime("%H-%M-%S")}.jpg")
-    screenshot.save(first_output_file, "JPEG", quality=85)
-    log.success(f"Zapisano zrzut ekranu: {first_output_file.replace("\\", "/").rsplit("/", 1)[1]}")
+    if source is None:
+        x, y, width, height = area
+        source = create_frame_source((x, y, x + width, y + height))
+
+    detector = create_change_detector(threshold, detector_mode)
+    count = 0
 
     try:
-        while recording_active:
+        # Zrób aktualny zrzut ekranu
+        grabbed = source.grab()
+        if grabbed is not None:
+            frame, frame_time = grabbed
+            _save_screenshot(frame, frame_time, folder, manifest)
+            # Pierwszy zrzut jest punktem odniesienia dla wykrywania zmian
+            detector.is_changed(frame)
+
+        while recording_active and grabbed is not None:
             # Zrób aktualny zrzut ekranu
-            current_screenshot = ImageGrab.grab(bbox).convert("RGB")
+            grabbed = source.grab()
+            if grabbed is None:
+                break
+            frame, frame_time = grabbed
 
-            if previous_screenshot is not None:
-                # Oblicz różnicę między poprzednim a bieżącym obrazem
-                diff = ImageChops.difference(previous_screenshot, current_screenshot)
-                diff_bbox = diff.getbbox()
+            # Porównanie z poprzednim zrzutem (procent zmiany kanałów RGB, w trybie hash poprzedzony skrótem miniatury)
+            if detector.is_changed(frame):
+                _save_screenshot(frame, frame_time, folder, manifest)
+                count += 1
 
-                if diff_bbox:
-                    diff_data = diff.crop(diff_bbox).getdata()
-                    diff_pixels = sum(sum(pixel) for pixel in diff_data)
-                    total_pixels = width * height * 255 * 3
-                    diff_percent = (diff_pixels / total_pixels) * 100
-
-                    if diff_percent > threshold:
-                        output_file = os.path.join(folder, f"{datetime.now().strftime("%H-%M-%S")}.jpg")
-                        current_screenshot.save(output_file, "JPEG", quality=85)
-                        log.success(f"Zapisano zrzut ekranu: {output_file.replace("\\", "/").rsplit("/", 1)[1]}")
-                        count += 1
-
-            previous_screenshot = current_screenshot
-            time.sleep(3)
+            if source.live:
+                time.sleep(interval)
 
     except KeyboardInterrupt:
         print("Monitoring zakończony.")
+    finally:
+        source.close()
+
+    return count
 
 def stop_monitor_and_capture() -> None:
     """
@@ -17,23 +17,39 @@ Skrypt współpracuje z następującymi modułami:
     - app.screenshots: Wybór obszaru ekranu oraz wykonywanie zrzutów
     - app.transcriptor: Transkrypcja nagrań audio
     - app.utilities.recording_utils: Zarządzanie katalogami dla danych sesji
+    - app.utilities.fragment_queue: Przekazywanie fragmentów audio do transkrypcji w pamięci
+    - app.live_captions: Napisy na żywo wyświetlane w oknie aplikacji
+
+Sposób przekazywania fragmentów audio do transkrypcji wybiera zmienna środowiskowa KNZS_AUDIO_HANDOFF:
+"disk" (domyślnie, przez pliki w folderze nagrania) lub "memory" (przez kolejkę w pamięci, pliki są tylko archiwum).
+Rozmiar kolejki w pamięci określa KNZS_AUDIO_QUEUE_SIZE.
+Przy KNZS_LIVE_CAPTIONS=1 sesja dodatkowo wyświetla napisy na żywo (moduł app.live_captions).
+
+Każda sesja prowadzi w folderze spotkania manifest (moduł app.utilities.session_manifest), w którym odnotowywane są
+zapisane fragmenty audio, zrzuty ekranu i transkrypcje. Spotkania przerwane awarią aplikacji można wznowić funkcją
+resume_unfinished_meetings, która transkrybuje tylko brakujące fragmenty.
 
 Skrypt może być używany jako moduł i zawiera następujące funkcje:
 
     * start_recording_and_screenshots — uruchamia równoczesne nagrywanie dźwięku, wykonywanie zrzutów ekranu oraz transkrypcję audio w osobnych wątkach.
     * stop_recording_and_screenshots — zatrzymuje nagrywanie dźwięku, wykonywanie zrzutów ekranu
+    * resume_unfinished_meetings — wznawia w tle transkrypcję spotkań przerwanych awarią aplikacji.
 
 Każda funkcja posiada odpowiednie mechanizmy obsługi błędów, aktualizację statusu użytkownika oraz integrację z systemami logowania.
 
 Dzięki modułowi użytkownik ma możliwość kompleksowego zarządzania sesjami, obejmującymi rejestrację dźwięku, wizualne zrzuty ekranu i przetwarzanie materiału audio na tekst.
 """
 
+import os
 import threading
 import tkinter
-from app.recorder_audio import start_recording, stop_recording
+from app.recorder_audio import start_recording, stop_recording, recording_finished
 from app.screenshots import select_area, monitor_and_capture, create_output_folder, stop_monitor_and_capture
-from app.transcriptor import transcribe_audio_from_folder
+from app.transcriptor import transcribe_audio_from_folder, transcribe_audio_from_queue, resume_meeting_transcription
 from app.utilities.recording_utils import create_output_folder
+from app.utilities.fragment_queue import FragmentQueue
+from app.utilities.session_manifest import SessionManifest, SESSION_STARTED
+from app.live_captions import LiveCaptioner, live_captions_enabled
 from loguru import logger as log
 from typing import Callable
 
@@ -41,8 +57,13 @@ from typing import Callable
 recording_active = False
 screenshot_thread = None
 transcriptor_thread = None
+live_captioner = None
+
+# Sposób przekazywania fragmentów audio do transkrypcji: "disk" lub "memory"
+audio_handoff = os.environ.get("KNZS_AUDIO_HANDOFF", "disk")
+AUDIO_QUEUE_SIZE = int(os.environ.get("KNZS_AUDIO_QUEUE_SIZE", "8"))
 
-def start_recording_and_screenshots(update_status: Callable[[str], None], selected_audio_device: str, app: tkinter.Tk, transription_false_update: Callable[[None], None]) -> None:
+def start_recording_and_screenshots(update_status: Callable[[str], None], selected_audio_device: str, app: tkinter.Tk, transription_false_update: Callable[[None], None], update_caption: Callable[[str], None] | None = None, decoding_profile: str | None = None) -> None:
     """
     Funkcja uruchamiająca jednocześnie nagrywanie dźwięku i zrzuty ekranu.
 
@@ -55,16 +76,37 @@ def start_recording_and_screenshots(update_status: Callable[[str], None], select
             Główna instancja Tkinter.
         transription_false_update:
             Funkcja GUI odblokowująca przycisk "play" po zakończeniu transkrypcji.
+        update_caption:
+            Funkcja GUI wyświetlająca napisy na żywo. Napisy działają tylko przy KNZS_LIVE_CAPTIONS=1.
+        decoding_profile:
+            Profil dekodowania transkrypcji sesji (fast, balanced, accurate). Domyślnie profil z konfiguracji
+            (KNZS_DECODING_PROFILE).
     """
-    global recording_active, screenshot_thread, transcriptor_thread
+    global recording_active, screenshot_thread, transcriptor_thread, live_captioner
     capture_area=None
 
     # Tworzenie folderu na zrzuty ekranu
     output_folders = create_output_folder()
 
+    # Manifest sesji, na podstawie którego można wznowić spotkanie po awarii
+    manifest = SessionManifest(output_folders[0])
+    manifest.record(SESSION_STARTED)
+
     # Flaga aktywności
     recording_active = True
 
+    # Zdarzenie końca nagrywania z poprzedniej sesji nie może zakończyć nowej transkrypcji
+    recording_finished.clear()
+
+    # Kolejka fragmentów przekazywanych do transkrypcji w pamięci
+    audio_queue = FragmentQueue(AUDIO_QUEUE_SIZE) if audio_handoff == "memory" else None
+
+    # Napisy na żywo z krótkich, nakładających się okien audio
+    live_captioner = None
+    if live_captions_enabled and update_caption is not None:
+        live_captioner = LiveCaptioner(update_caption)
+        live_captioner.start()
+
     # Funkcja uruchamiająca zrzuty ekranu
     def run_screenshots():
         # Wybór obszaru ekranu
@@ -73,15 +115,22 @@ def start_recording_and_screenshots(update_status: Callable[[str], None], select
         if not capture_area:
             app.after(0, lambda: update_status("Nie wybrano obszaru do zrzutów ekranu."))
             return
-        monitor_and_capture(capture_area, output_folders[2])
+        monitor_and_capture(capture_area, output_folders[2], manifest=manifest)
 
     def run_transcription():
         global recording_active
-        transcribe_audio_from_folder(output_folders[1], update_status, app, transription_false_update)
+        if audio_queue is not None:
+            transcribe_audio_from_queue(audio_queue, output_folders[3], update_status, app, transription_false_update, decoding_profile=decoding_profile, manifest=manifest)
+        else:
+            transcribe_audio_from_folder(output_folders[1], update_status, app, transription_false_update, recording_finished, decoding_profile=decoding_profile, manifest=manifest)
+        # Manifest zapisują również wątki nagrywania i zrzutów ekranu - zamykany jest dopiero po ich zakończeniu
+        audio_thread.join()
+        session_screenshot_thread.join()
+        manifest.close()
 
     # Uruchomienie nagrywania dźwięku w osobnym wątku
-    audio_thread = threading.Thread(target=start_recording, args=(update_status, selected_audio_device, output_folders[1]))
-    screenshot_thread = threading.Thread(target=run_screenshots)
+    audio_thread = threading.Thread(target=start_recording, args=(update_status, selected_audio_device, output_folders[1]), kwargs={"audio_queue": audio_queue, "captioner": live_captioner, "manifest": manifest})
+    screenshot_thread = session_screenshot_thread = threading.Thread(target=run_screenshots)
     transcriptor_thread = threading.Thread(target=run_transcription)
 
     audio_thread.start()
@@ -110,11 +159,16 @@ def stop_recording_and_screenshots(update_status: Callable[[str], None]) -> None
         - Aktualizacja statusu w GUI informuje użytkownika o zakończeniu nagrywania.
     """
 
-    global recording_active, screenshot_thread
+    global recording_active, screenshot_thread, live_captioner
 
     # Zatrzymaj nagrywanie dźwięku
     stop_recording(update_status)
 
+    # Zatrzymaj napisy na żywo
+    if live_captioner is not None:
+        live_captioner.stop()
+        live_captioner = None
+
     # Zatrzymaj zrzuty ekranu
     recording_active = False
     if screenshot_thread and screenshot_thread.is_alive():
@@ -122,3 +176,35 @@ def stop_recording_and_screenshots(update_status: Callable[[str], None]) -> None
         screenshot_thread.join()
 
     update_status("Nagrywanie audio i zrzuty ekranu zakończone.")
+
+
+def resume_unfinished_meetings(update_status: Callable[[str], None], meetings: list[str], on_finished: Callable[[], None] | None = None, decoding_profile: str | None = None) -> threading.Thread:
+    """
+    Wznawia w osobnym wątku transkrypcję spotkań przerwanych awarią aplikacji.
+
+    Args:
+        update_status:
+            Funkcja aktualizująca status w interfejsie użytkownika.
+        meetings:
+            Ścieżki do folderów spotkań z niedokończoną transkrypcją (`find_unfinished_meetings`).
+        on_finished:
+            Funkcja wywoływana po wznowieniu wszystkich spotkań.
+        decoding_profile:
+            Profil dekodowania (fast, balanced, accurate). Domyślnie profil z konfiguracji.
+
+    Returns:
+        Uruchomiony wątek wznawiania transkrypcji.
+    """
+
+    def run_resume():
+        for meeting_directory in meetings:
+            try:
+                resume_meeting_transcription(meeting_directory, update_status, decoding_profile=decoding_profile)
+            except Exception as err:
+                log.error(f"Błąd podczas wznawiania transkrypcji spotkania {meeting_directory}: {err}")
+        if on_finished is not None:
+            on_finished()
+
+    resume_thread = threading.Thread(target=run_resume, daemon=True)
+    resume_thread.start()
+    return resume_thread
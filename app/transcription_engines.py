@@ -0,0 +1,382 @@
+# app/transcription_engines.py
+
+"""Moduł silników transkrypcji
+
+Skrypt definiuje wspólny interfejs silników transkrypcji oraz jego implementacje, dzięki czemu moduł transkrypcji
+nie jest związany z jedną biblioteką. Silnik wybierany jest zmienną środowiskową KNZS_TRANSCRIPTION_ENGINE:
+
+    - whisper (domyślny): openai-whisper uruchamiany na PyTorch.
+    - faster-whisper: modele Whisper uruchamiane przez CTranslate2, na CPU domyślnie z kwantyzacją int8.
+
+Precyzję obliczeń można wymusić zmienną KNZS_TRANSCRIPTION_DTYPE (whisper: fp32, fp16, int8;
+faster-whisper: int8, int8_float16, float16, float32).
+
+Tryb int8 silnika whisper (tylko CPU) stosuje dynamiczną kwantyzację warstw liniowych (torch.ao.quantization.quantize_dynamic):
+wagi warstw liniowych są przechowywane jako int8, a aktywacje kwantyzowane w locie. Kwantyzacja wykonywana jest raz,
+a wagi skwantyzowanego modelu (state_dict i wymiary modelu) zapisywane są w katalogu KNZS_QUANTIZED_MODEL_DIR
+(domyślnie katalog modeli Whisper), dzięki czemu kolejne uruchomienia wczytują je bez ponownej kwantyzacji.
+Plik jest wczytywany z `weights_only=True` - zawiera wyłącznie tensory i liczby, a nie obiekty Pythona, więc
+podmieniony plik w katalogu modeli nie może wykonać kodu.
+
+Parametry dekodowania wybierane są profilem (KNZS_DECODING_PROFILE lub parametr sesji transkrypcji):
+
+    - fast: dekodowanie zachłanne bez ponawiania w wyższej temperaturze i bez kontekstu poprzedniego tekstu.
+    - balanced: dekodowanie zachłanne, co najwyżej dwa ponowienia (temperatura 0.4 i 0.8, best_of 3).
+    - accurate: przeszukiwanie wiązkowe (beam_size 5) z pełną kaskadą temperatur i kontekstem poprzedniego tekstu.
+
+Bez profilu używane są domyślne ustawienia biblioteki. Każda transkrypcja zwraca liczbę okien 30 s oraz liczbę
+wykonanych dekodowań, która uwzględnia ponowienia przy nieudanym dekodowaniu (kaskada temperatur).
+
+Wymagane zależności
+
+Aby uruchomić skrypt, należy zainstalować następujące pakiety w środowisku Python:
+
+    - openai-whisper, torch: Silnik whisper
+    - faster-whisper (opcjonalnie): Silnik faster-whisper
+    - loguru: Rozbudowany system logowania
+
+Skrypt może być używany jako moduł i zawiera następujące elementy:
+
+    * TranscriptionEngine - interfejs silnika: ładowanie modelu i transkrypcja próbek audio.
+    * WhisperEngine - silnik openai-whisper.
+    * quantize_whisper_model - dynamiczna kwantyzacja int8 warstw liniowych modelu Whisper.
+    * FasterWhisperEngine - silnik faster-whisper (CTranslate2).
+    * get_engine - zwraca silnik wybrany w konfiguracji.
+    * count_decodes - liczba okien i dekodowań transkrypcji na podstawie temperatur segmentów.
+"""
+
+import os
+import importlib
+from abc import ABC, abstractmethod
+import threading
+import time
+import torch
+import whisper
+import numpy as np
+from typing import Any
+from loguru import logger as log
+
+try:
+    import faster_whisper
+except ImportError:
+    faster_whisper = None
+
+# Silnik i precyzja wybrane w konfiguracji
+transcription_engine = os.environ.get("KNZS_TRANSCRIPTION_ENGINE", "whisper")
+transcription_dtype = os.environ.get("KNZS_TRANSCRIPTION_DTYPE") or None
+# Profil dekodowania (fast, balanced, accurate); pusty - domyślne ustawienia biblioteki
+decoding_profile = os.environ.get("KNZS_DECODING_PROFILE") or None
+# Katalog skwantyzowanych modeli whisper (tryb int8)
+QUANTIZED_MODEL_DIR = os.environ.get("KNZS_QUANTIZED_MODEL_DIR") or os.path.join(os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "whisper")
+
+# Domyślna kaskada temperatur whisper i faster-whisper
+DEFAULT_TEMPERATURES = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+
+# Profile dekodowania; beam_size None oznacza dekodowanie zachłanne
+DECODING_PROFILES = {
+    "fast": {"beam_size": None, "best_of": 1, "temperature": (0.0,), "condition_on_previous_text": False, "no_speech_threshold": 0.6},
+    "balanced": {"beam_size": None, "best_of": 3, "temperature": (0.0, 0.4, 0.8), "condition_on_previous_text": False, "no_speech_threshold": 0.6},
+    "accurate": {"beam_size": 5, "best_of": 5, "temperature": DEFAULT_TEMPERATURES, "condition_on_previous_text": True, "no_speech_threshold": 0.6},
+}
+
+
+def count_decodes(segments: list[dict], temperatures: float | tuple[float, ...] = DEFAULT_TEMPERATURES) -> tuple[int, int]:
+    """
+    Oblicza liczbę okien 30 s i liczbę dekodowań na podstawie segmentów transkrypcji.
+
+    Wszystkie segmenty jednego okna (ta sama wartość "seek") mają temperaturę ostatniego dekodowania okna,
+    więc jej pozycja w kaskadzie temperatur wyznacza liczbę dekodowań tego okna.
+
+    Args:
+        segments:
+            Segmenty transkrypcji z kluczami "seek" i "temperature".
+        temperatures:
+            Kaskada temperatur (lub pojedyncza temperatura) użyta w transkrypcji.
+
+    Returns:
+        Krotka (liczba okien z tekstem, liczba dekodowań).
+    """
+
+    if isinstance(temperatures, (int, float)):
+        temperatures = (temperatures,)
+    windows = {}
+    for segment in segments:
+        temperature = segment.get("temperature") or 0.0
+        attempt = min(range(len(temperatures)), key=lambda i: abs(temperatures[i] - temperature)) + 1
+        windows[segment.get("seek", segment["start"])] = attempt
+    return len(windows), sum(windows.values())
+
+
+class TranscriptionEngine(ABC):
+    """
+    Interfejs silnika transkrypcji.
+
+    Silnik ładuje model oraz transkrybuje próbki audio (float32, 16 kHz, mono). Wynik transkrypcji to słownik
+    z kluczami "text" (pełny tekst) oraz "segments" (lista słowników z kluczami "start", "end", "text", "temperature", "seek").
+    """
+
+    name = ""
+
+    @abstractmethod
+    def default_dtype(self, device: str) -> str:
+        """Zwraca domyślną precyzję obliczeń dla urządzenia."""
+
+    def resolve_dtype(self, device: str, dtype: str | None) -> str:
+        """Zwraca precyzję, z którą model zostanie faktycznie załadowany na urządzenie."""
+        return dtype or self.default_dtype(device)
+
+    @abstractmethod
+    def load_model(self, model_name: str, device: str, dtype: str) -> Any:
+        """Ładuje model o podanej nazwie na wskazane urządzenie."""
+
+    def decoding_options(self, profile: str | None = None) -> dict:
+        """
+        Zwraca opcje transkrypcji dla profilu dekodowania.
+
+        Args:
+            profile:
+                Nazwa profilu (fast, balanced, accurate). Domyślnie profil z konfiguracji;
+                bez profilu zwracany jest pusty słownik (domyślne ustawienia biblioteki).
+        """
+
+        profile = profile or decoding_profile
+        if profile is None:
+            return {}
+        if profile not in DECODING_PROFILES:
+            log.warning(f"Nieznany profil dekodowania: {profile}. Używam domyślnych ustawień.")
+            return {}
+        return dict(DECODING_PROFILES[profile])
+
+    @abstractmethod
+    def transcribe(self, model: Any, audio: np.ndarray, language: str = "pl", options: dict | None = None, mel: np.ndarray | None = None) -> dict:
+        """
+        Transkrybuje próbki audio i zwraca słownik z tekstem oraz segmentami.
+
+        Jeśli podano `mel` (spektrogram log-mel obliczony w trakcie nagrywania), silnik może go użyć
+        zamiast obliczać cechy z próbek. Wynik zawiera również liczbę okien ("windows") i dekodowań ("decodes").
+        """
+
+    def model_memory_mb(self, model: Any) -> float | None:
+        """Zwraca rozmiar modelu w pamięci w megabajtach lub None, jeśli nie da się go ustalić."""
+        return None
+
+
+# Spektrogram przekazany do bieżącego wywołania transkrypcji w danym wątku
+_precomputed = threading.local()
+_whisper_log_mel = None
+_install_lock = threading.Lock()
+
+
+def _log_mel_or_precomputed(audio, n_mels: int = 80, padding: int = 0, device=None):
+    """Zwraca spektrogram przekazany do transkrypcji w bieżącym wątku lub oblicza go funkcją Whisper."""
+
+    mel = getattr(_precomputed, "mel", None)
+    if mel is not None:
+        mel = torch.from_numpy(mel)
+        return mel.to(device) if device is not None else mel
+    return _whisper_log_mel(audio, n_mels, padding, device)
+
+
+def _install_precomputed_mel() -> None:
+    """
+    Pozwala `model.transcribe` korzystać z gotowego spektrogramu.
+
+    `whisper.transcribe` oblicza spektrogram funkcją `log_mel_spectrogram` importowaną do swojego modułu;
+    funkcja ta jest zastępowana wersją, która zwraca spektrogram ustawiony w bieżącym wątku,
+    a w pozostałych przypadkach wywołuje oryginał.
+    """
+
+    global _whisper_log_mel
+    with _install_lock:
+        if _whisper_log_mel is not None:
+            return
+        module = importlib.import_module("whisper.transcribe")
+        _whisper_log_mel = module.log_mel_spectrogram
+        module.log_mel_spectrogram = _log_mel_or_precomputed
+
+
+def _quantized_model_path(model_name: str) -> str:
+    """Zwraca ścieżkę pliku wag skwantyzowanego modelu; format zapisu zależy od wersji PyTorch."""
+    return os.path.join(QUANTIZED_MODEL_DIR, f"{model_name}-int8-torch{torch.__version__.split('+')[0]}.state.pt")
+
+
+def _replace_linear(module: torch.nn.Module) -> None:
+    """
+    Zastępuje warstwy `whisper.model.Linear` zwykłymi `torch.nn.Linear` z tymi samymi wagami.
+
+    Whisper używa własnej podklasy warstwy liniowej (rzutowanie wag na typ wejścia), której
+    `quantize_dynamic` nie rozpoznaje. Na CPU w fp32 obie warstwy liczą to samo.
+    """
+
+    for name, child in module.named_children():
+        if isinstance(child, torch.nn.Linear) and type(child) is not torch.nn.Linear:
+            linear = torch.nn.Linear(child.in_features, child.out_features, bias=child.bias is not None)
+            linear.weight = child.weight
+            linear.bias = child.bias
+            setattr(module, name, linear)
+        else:
+            _replace_linear(child)
+
+
+def quantize_whisper_model(model: Any) -> Any:
+    """
+    Stosuje dynamiczną kwantyzację int8 do warstw liniowych modelu Whisper.
+
+    Args:
+        model:
+            Model Whisper w fp32 na CPU.
+
+    Returns:
+        Model z warstwami liniowymi int8 (wagi int8, aktywacje kwantyzowane w locie).
+    """
+
+    _replace_linear(model)
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class WhisperEngine(TranscriptionEngine):
+    """Silnik openai-whisper uruchamiany na PyTorch."""
+
+    name = "whisper"
+
+    def default_dtype(self, device: str) -> str:
+        return "fp32"
+
+    def resolve_dtype(self, device: str, dtype: str | None) -> str:
+        dtype = dtype or self.default_dtype(device)
+        # fp16 tylko na GPU, dynamiczna kwantyzacja int8 tylko na CPU
+        if (dtype == "fp16" and device != "cuda") or (dtype == "int8" and device != "cpu"):
+            return "fp32"
+        return dtype
+
+    def load_model(self, model_name: str, device: str, dtype: str) -> Any:
+        if dtype == "int8" and device == "cpu":
+            return self._load_quantized(model_name)
+        model = whisper.load_model(model_name, device=device)
+        if dtype == "fp16" and device == "cuda":
+            model = model.half()
+        return model
+
+    def _load_quantized(self, model_name: str) -> Any:
+        """
+        Wczytuje skwantyzowany model z dysku lub kwantyzuje model fp32 i zapisuje wynik.
+
+        Z dysku wczytywane są tylko wymiary modelu i wagi (`weights_only=True`). Model jest odtwarzany jako pusta
+        architektura Whisper o zapisanych wymiarach, kwantyzowany (`quantize_whisper_model`) i wypełniany wagami,
+        bez wczytywania modelu fp32.
+        """
+
+        path = _quantized_model_path(model_name)
+        if os.path.exists(path):
+            try:
+                checkpoint = torch.load(path, map_location="cpu", weights_only=True)
+                model = quantize_whisper_model(whisper.model.Whisper(whisper.model.ModelDimensions(**checkpoint["dims"])))
+                model.load_state_dict(checkpoint["state_dict"])
+                if model_name in whisper._ALIGNMENT_HEADS:
+                    model.set_alignment_heads(whisper._ALIGNMENT_HEADS[model_name])
+                model.eval()
+                return model
+            except Exception as err:
+                log.warning(f"Nie udało się wczytać skwantyzowanego modelu {path}: {err}. Model zostanie skwantyzowany ponownie.")
+
+        start = time.perf_counter()
+        model = quantize_whisper_model(whisper.load_model(model_name, device="cpu"))
+        model.eval()
+        log.info(f"Skwantyzowano model Whisper {model_name} do int8 w {time.perf_counter() - start:.2f} s")
+
+        try:
+            os.makedirs(QUANTIZED_MODEL_DIR, exist_ok=True)
+            temporary_path = f"{path}.tmp"
+            torch.save({"dims": dict(vars(model.dims)), "state_dict": model.state_dict()}, temporary_path)
+            os.replace(temporary_path, path)
+            log.debug(f"Zapisano skwantyzowany model: {path}")
+        except OSError as err:
+            log.warning(f"Nie udało się zapisać skwantyzowanego modelu {path}: {err}")
+        return model
+
+    def transcribe(self, model: Any, audio: np.ndarray, language: str = "pl", options: dict | None = None, mel: np.ndarray | None = None) -> dict:
+        options = options or {}
+        # Na GPU obliczenia w fp16, na CPU wyłącznie fp32
+        fp16 = model.device.type == "cuda"
+
+        use_mel = mel is not None and mel.shape[0] == model.dims.n_mels
+        if use_mel:
+            _install_precomputed_mel()
+            _precomputed.mel = mel
+        try:
+            if fp16:
+                with torch.cuda.device(model.device):
+                    result = model.transcribe(audio=audio, language=language, fp16=fp16, **options)
+            else:
+                result = model.transcribe(audio=audio, language=language, fp16=fp16, **options)
+        finally:
+            if use_mel:
+                _precomputed.mel = None
+
+        result["windows"], result["decodes"] = count_decodes(result["segments"], options.get("temperature", DEFAULT_TEMPERATURES))
+        return result
+
+    def model_memory_mb(self, model: Any) -> float | None:
+        # Wagi skwantyzowanych warstw nie są parametrami modelu, dlatego liczony jest cały state_dict
+        size = 0
+        for value in model.state_dict().values():
+            tensors = value if isinstance(value, tuple) else (value,)
+            size += sum(t.numel() * t.element_size() for t in tensors if isinstance(t, torch.Tensor))
+        return size / (1024 * 1024)
+
+
+class FasterWhisperEngine(TranscriptionEngine):
+    """Silnik faster-whisper (CTranslate2), na CPU domyślnie z kwantyzacją int8."""
+
+    name = "faster-whisper"
+
+    def default_dtype(self, device: str) -> str:
+        return "float16" if device == "cuda" else "int8"
+
+    def load_model(self, model_name: str, device: str, dtype: str) -> Any:
+        return faster_whisper.WhisperModel(model_name, device=device, compute_type=dtype, cpu_threads=torch.get_num_threads())
+
+    def decoding_options(self, profile: str | None = None) -> dict:
+        options = super().decoding_options(profile)
+        # faster-whisper nie przyjmuje beam_size None - dekodowanie zachłanne to wiązka o szerokości 1
+        if "beam_size" in options and options["beam_size"] is None:
+            options["beam_size"] = 1
+        return options
+
+    def transcribe(self, model: Any, audio: np.ndarray, language: str = "pl", options: dict | None = None, mel: np.ndarray | None = None) -> dict:
+        options = options or {}
+        segments, info = model.transcribe(audio, language=language, **options)
+        segments = [
+            {"start": s.start, "end": s.end, "text": s.text, "temperature": s.temperature, "seek": s.seek}
+            for s in segments
+        ]
+        windows, decodes = count_decodes(segments, options.get("temperature", DEFAULT_TEMPERATURES))
+        return {"text": "".join(s["text"] for s in segments), "segments": segments, "language": info.language, "windows": windows, "decodes": decodes}
+
+
+ENGINES = {
+    WhisperEngine.name: WhisperEngine(),
+    FasterWhisperEngine.name: FasterWhisperEngine(),
+}
+
+
+def get_engine(name: str | None = None) -> TranscriptionEngine:
+    """
+    Zwraca silnik transkrypcji.
+
+    Args:
+        name:
+            Nazwa silnika (whisper, faster-whisper). Domyślnie silnik z konfiguracji.
+
+    Returns:
+        Silnik transkrypcji. Jeśli wybrany silnik jest niedostępny, zwracany jest silnik whisper.
+    """
+
+    name = name or transcription_engine
+    if name not in ENGINES:
+        log.warning(f"Nieznany silnik transkrypcji: {name}. Używam silnika whisper.")
+        name = WhisperEngine.name
+    if name == FasterWhisperEngine.name and faster_whisper is None:
+        log.warning("Pakiet faster-whisper nie jest zainstalowany. Używam silnika whisper.")
+        name = WhisperEngine.name
+    return ENGINES[name]
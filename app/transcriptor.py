@@ -9,6 +9,7 @@ Wymagane zależności
 Aby uruchomić skrypt, należy zainstalować następujące pakiety w środowisku Python:
 
     - openai-whisper: Model do transkrypcji mowy
+    - faster-whisper (opcjonalnie): Silnik CTranslate2 z kwantyzacją int8
     - torch, torchvision, torchaudio: Narzędzia do przetwarzania danych audio
     - loguru: Rozbudowany system logowania
     - setuptools-rust: Wsparcie dla rozszerzeń w Rust
@@ -16,32 +17,307 @@ Aby uruchomić skrypt, należy zainstalować następujące pakiety w środowisku
 Do prawidłowego działania aplikacji należy zaimportować:
 
     - log_status z modułu app.utilities.loger, służącą do logowania komunikatów statusowych.
-    - save_text_to_txt z modułu app.utilities.saving
+    - TranscriptWriter z modułu app.utilities.saving
+    - load_audio z modułu app.utilities.audio_formats
+    - FragmentWatcher z modułu app.utilities.fragment_watcher
+    - AdaptiveModelSelector z modułu app.utilities.model_selector
+    - get_engine z modułu app.transcription_engines
+    - TranscriptionCache z modułu app.utilities.transcription_cache
+    - SessionManifest, read_manifest z modułu app.utilities.session_manifest
 
 Skrypt może być używany jako moduł i zawiera następujące funkcje:
 
+    * get_whisper_model - zwraca model Whisper z pamięci podręcznej, ładując go tylko przy pierwszym użyciu.
+    * unload_whisper_model - usuwa wskazany model z pamięci podręcznej i zwalnia zajmowaną pamięć.
+    * clear_model_cache - usuwa wszystkie modele z pamięci podręcznej.
+    * get_model_cache_stats - zwraca czasy ładowania i zużycie pamięci załadowanych modeli.
+    * transcribe_audio_array - transkrypcja próbek audio przekazanych w pamięci przy użyciu modelu Whisper.
     * transcribe_with_whisper_offline -  transkrypcja plików audio lokalnie przy użyciu modelu Whisper.
     * transcribe_audio_from_folder - automatyczna transkrypcja wszystkich plików audio z wybranego folderu.
+    * transcribe_audio_from_queue - transkrypcja fragmentów przekazywanych przez nagrywanie w pamięci (FragmentQueue).
+    * resume_meeting_transcription - wznowienie transkrypcji przerwanego spotkania na podstawie manifestu sesji.
+
+Silnik transkrypcji (openai-whisper lub faster-whisper) wybierany jest zmienną środowiskową KNZS_TRANSCRIPTION_ENGINE,
+a precyzja obliczeń zmienną KNZS_TRANSCRIPTION_DTYPE (moduł app.transcription_engines).
+
+Przy zmiennej środowiskowej KNZS_TRANSCRIPTION_WORKERS większej od 1 transkrypcja sesji odbywa się w puli procesów.
+Każdy proces ładuje własny model i korzysta z części rdzeni procesora (torch.set_num_threads), a wyniki są zapisywane
+w kolejności fragmentów. Po awarii procesu (np. zakończenia go przez system przy braku pamięci) pula jest tworzona
+od nowa, a nieukończone fragmenty są zlecane ponownie; po POOL_RESTARTS awariach transkrypcja odbywa się w wątku sesji.
+
+Przy zmiennej środowiskowej KNZS_ADAPTIVE_MODEL=1 model jest dobierany na bieżąco: gdy liczba zaległych fragmentów
+przekroczy KNZS_ADAPTIVE_MODEL_BACKLOG, transkrypcja przechodzi na mniejszy model, a po nadrobieniu zaległości wraca
+do większego. Model użyty dla każdego fragmentu oraz jego RTF są zapisywane w pliku modele.csv w folderze transkrypcji.
+
+Parametry dekodowania wybierane są profilem (fast, balanced, accurate) ze zmiennej KNZS_DECODING_PROFILE lub parametru
+`decoding_profile` sesji transkrypcji. Dla każdego fragmentu logowana jest liczba okien 30 s i wykonanych dekodowań
+(z ponowieniami w wyższej temperaturze), zapisywana również w modele.csv, a po sesji - łączny czas fragmentów,
+które wymagały ponowień.
+
+Przy zmiennej środowiskowej KNZS_TRANSCRIPTION_CACHE=1 wyniki transkrypcji fragmentów są zapisywane w pamięci podręcznej
+na dysku (KNZS_TRANSCRIPTION_CACHE_DIR), w kluczu ze skrótu próbek audio, silnika, modelu, precyzji i opcji dekodowania.
+Niezmienione fragmenty transkrybowane ponownie (np. folder z archiwum lub wznowienie po awarii) są zwracane od razu.
+Rozmiar pamięci podręcznej ogranicza KNZS_TRANSCRIPTION_CACHE_MB, a po sesji logowany jest współczynnik trafień.
+
+Jeśli sesja otrzyma manifest (`SessionManifest`), zapis transkrypcji każdego fragmentu oraz koniec transkrypcji są
+w nim odnotowywane. Po awarii aplikacji `resume_meeting_transcription` transkrybuje tylko brakujące fragmenty.
+Zakończenie transkrypcji spotkania jest zapisywane w bazie spotkań (moduł app.utilities.meeting_store), a jego
+fragmenty są dopisywane do indeksu wyszukiwania tematycznego (moduł app.utilities.vector_index).
 
 Każda funkcja posiada odpowiednie mechanizmy obsługi błędów, logowania oraz komunikatów dla użytkownika.
 """
 
 import os
-import glob
+import gc
 import tkinter
-import whisper
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import torch
+import numpy as np
 import time
 import warnings
-from typing import Callable, Optional
+from typing import Any, Callable, Optional
 from loguru import logger as log
 from app.utilities.logger import log_status
-from app.utilities.saving import save_text_to_txt
+from app.utilities.saving import TranscriptWriter
+from app.utilities.audio_formats import load_audio, WHISPER_SAMPLE_RATE, AUDIO_EXTENSIONS
+from app.utilities.fragment_queue import FragmentQueue
+from app.utilities.fragment_watcher import FragmentWatcher
+from app.utilities.model_selector import AdaptiveModelSelector
+from app.utilities.transcription_cache import TranscriptionCache
+from app.utilities.session_manifest import SessionManifest, read_manifest, FRAGMENT_TRANSCRIBED, RECORDING_FINISHED, TRANSCRIPTION_FINISHED
+from app.utilities.meeting_store import get_meeting_store
+from app.utilities.vector_index import get_vector_index
+from app.transcription_engines import get_engine, transcription_dtype, decoding_profile as default_decoding_profile
 
 extracting_process = -1
 warnings.filterwarnings("ignore", module="whisper")
 
-def transcribe_with_whisper_offline(audio_file_path: str, update_status: Callable[[str], None]) -> tuple[str, str | None]:
+# tiny, base, small, medium, large, turbo
+DEFAULT_MODEL_NAME = "medium"
+
+# Liczba procesów transkrypcji (1 - transkrypcja w wątku sesji, bez puli procesów)
+TRANSCRIPTION_WORKERS = int(os.environ.get("KNZS_TRANSCRIPTION_WORKERS", "1"))
+# Liczba odtworzeń puli procesów po awarii procesu, po której transkrypcja odbywa się w wątku sesji
+POOL_RESTARTS = 2
+
+# Adaptacyjny dobór modelu (tiny/base/small/medium) przy zaległościach transkrypcji
+ADAPTIVE_MODEL = os.environ.get("KNZS_ADAPTIVE_MODEL", "0") == "1"
+ADAPTIVE_MODEL_BACKLOG = int(os.environ.get("KNZS_ADAPTIVE_MODEL_BACKLOG", "3"))
+
+# Pamięć podręczna wyników transkrypcji na dysku
+TRANSCRIPTION_CACHE = os.environ.get("KNZS_TRANSCRIPTION_CACHE", "0") == "1"
+TRANSCRIPTION_CACHE_DIR = os.environ.get("KNZS_TRANSCRIPTION_CACHE_DIR") or os.path.join(os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "knzs", "transkrypcje")
+TRANSCRIPTION_CACHE_MB = float(os.environ.get("KNZS_TRANSCRIPTION_CACHE_MB", "200"))
+_transcription_cache: TranscriptionCache | None = None
+
+# Plik w folderze transkrypcji z modelem użytym dla każdego fragmentu
+MODELS_FILENAME = "modele.csv"
+
+# Pamięć podręczna modeli: (silnik, nazwa modelu, urządzenie, dtype) -> model
+_model_cache: dict[tuple[str, str, str, str], Any] = {}
+# Statystyki ładowania modeli: (silnik, nazwa modelu, urządzenie, dtype) -> słownik ze statystykami
+_model_stats: dict[tuple[str, str, str, str], dict] = {}
+_model_cache_lock = threading.Lock()
+
+
+def _default_device() -> str:
+    """Zwraca nazwę urządzenia, na którym domyślnie uruchamiany jest model."""
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def get_whisper_model(model_name: str = DEFAULT_MODEL_NAME, device: str | None = None, dtype: str | None = None, engine: str | None = None) -> Any:
+    """
+    Zwraca model Whisper z pamięci podręcznej procesu, ładując go tylko przy pierwszym użyciu.
+
+    Args:
+        model_name:
+            Nazwa modelu Whisper (tiny, base, small, medium, large, turbo).
+        device:
+            Urządzenie, na którym działa model ("cuda" lub "cpu"). Domyślnie cuda, jeśli jest dostępna.
+        dtype:
+            Precyzja obliczeń modelu, np. "fp32", "fp16", "int8" (whisper) lub "int8" (faster-whisper).
+            Domyślnie precyzja z konfiguracji lub domyślna dla silnika i urządzenia.
+        engine:
+            Nazwa silnika transkrypcji (whisper, faster-whisper). Domyślnie silnik z konfiguracji.
+
+    Returns:
+        Załadowany model Whisper.
+    """
+
+    transcription_engine = get_engine(engine)
+    device = device or _default_device()
+    dtype = transcription_engine.resolve_dtype(device, dtype or transcription_dtype)
+    key = (transcription_engine.name, model_name, device, dtype)
+
+    with _model_cache_lock:
+        model = _model_cache.get(key)
+        if model is not None:
+            _model_stats[key]["uses"] += 1
+            return model
+
+        if device == "cuda":
+            torch.cuda.init()
+            memory_before = torch.cuda.memory_allocated()
+
+        log.debug(f"Ładowanie modelu Whisper: {model_name} ({transcription_engine.name}, {device}, {dtype})")
+        start = time.perf_counter()
+        model = transcription_engine.load_model(model_name, device, dtype)
+        load_seconds = time.perf_counter() - start
+
+        if device == "cuda" and transcription_engine.name == "whisper":
+            memory_mb = (torch.cuda.memory_allocated() - memory_before) / (1024 * 1024)
+        else:
+            memory_mb = transcription_engine.model_memory_mb(model)
+
+        _model_cache[key] = model
+        _model_stats[key] = {"load_seconds": load_seconds, "memory_mb": memory_mb, "uses": 1}
+        memory = f"{memory_mb:.0f} MB" if memory_mb is not None else "nieznana"
+        log.info(f"Załadowano model Whisper {model_name} ({transcription_engine.name}, {device}, {dtype}) w {load_seconds:.2f} s, pamięć: {memory}")
+
+    return model
+
+
+def unload_whisper_model(model_name: str = DEFAULT_MODEL_NAME, device: str | None = None, dtype: str | None = None, engine: str | None = None) -> bool:
+    """
+    Usuwa wskazany model z pamięci podręcznej i zwalnia zajmowaną przez niego pamięć.
+
+    Args:
+        model_name:
+            Nazwa modelu Whisper.
+        device:
+            Urządzenie, na które model został załadowany.
+        dtype:
+            Precyzja obliczeń modelu.
+        engine:
+            Nazwa silnika transkrypcji.
+
+    Returns:
+        True, jeśli model był załadowany i został usunięty, w przeciwnym razie False.
+    """
+
+    transcription_engine = get_engine(engine)
+    device = device or _default_device()
+    dtype = transcription_engine.resolve_dtype(device, dtype or transcription_dtype)
+    key = (transcription_engine.name, model_name, device, dtype)
+
+    with _model_cache_lock:
+        model = _model_cache.pop(key, None)
+        _model_stats.pop(key, None)
+
+    if model is None:
+        return False
+
+    del model
+    gc.collect()
+    if device == "cuda":
+        torch.cuda.empty_cache()
+    log.debug(f"Usunięto model Whisper z pamięci: {model_name} ({transcription_engine.name}, {device}, {dtype})")
+    return True
+
+
+def clear_model_cache() -> None:
+    """Usuwa wszystkie modele z pamięci podręcznej."""
+
+    with _model_cache_lock:
+        keys = list(_model_cache.keys())
+
+    for engine, model_name, device, dtype in keys:
+        unload_whisper_model(model_name, device, dtype, engine)
+
+
+def get_model_cache_stats() -> dict[tuple[str, str, str, str], dict]:
+    """
+    Zwraca statystyki modeli znajdujących się w pamięci podręcznej.
+
+    Returns:
+        Słownik (silnik, nazwa modelu, urządzenie, dtype) -> {"load_seconds", "memory_mb", "uses"}.
+    """
+
+    with _model_cache_lock:
+        return {key: dict(stats) for key, stats in _model_stats.items()}
+
+
+def _get_transcription_cache() -> TranscriptionCache | None:
+    """Zwraca pamięć podręczną transkrypcji, jeśli jest włączona w konfiguracji."""
+
+    global _transcription_cache
+    if not TRANSCRIPTION_CACHE:
+        return None
+    with _model_cache_lock:
+        if _transcription_cache is None:
+            _transcription_cache = TranscriptionCache(TRANSCRIPTION_CACHE_DIR, TRANSCRIPTION_CACHE_MB)
+    return _transcription_cache
+
+
+def _run_transcription(audio: np.ndarray, filename: str, update_status: Callable[[str], None], model_name: str, mel: np.ndarray | None, decoding_profile: str | None) -> dict | None:
+    """
+    Transkrybuje próbki audio i zwraca wynik silnika transkrypcji lub None w razie błędu.
+
+    Wynik zawiera klucz "cached" - True, jeśli pochodzi z pamięci podręcznej transkrypcji.
+    """
+
+    transcription_engine = get_engine()
+    options = transcription_engine.decoding_options(decoding_profile)
+
+    cache = _get_transcription_cache()
+    if cache is not None:
+        dtype = transcription_engine.resolve_dtype(_default_device(), transcription_dtype)
+        cache_key = cache.make_key(audio, transcription_engine.name, model_name, dtype, options)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            log.debug(f"Fragment {filename}: transkrypcja z pamięci podręcznej")
+            # Wynik z pamięci podręcznej nie wymagał dekodowania
+            return {**cached, "decodes": 0, "cached": True}
+
+    model = get_whisper_model(model_name, engine=transcription_engine.name)
+
+    log.debug(f"Transkrypcja fragmentu audio: {filename}")
+    log_status("Transkrypcja audio w toku...", "info", update_status)
+    try:
+        result = transcription_engine.transcribe(model, audio, language="pl", options=options, mel=mel)
+        log.success(f"Skutecznie dokonano transkrypcji audio: {filename}")
+    except Exception as err:
+        log_status(f"Wystąpił problem w czasie transkrypcji!", "error", update_status)
+        log.error(f"Błąd: {err}")
+        return None
+
+    log.debug(f"Fragment {filename}: okna {result['windows']}, dekodowania {result['decodes']} (profil: {decoding_profile or default_decoding_profile or 'domyślny'})")
+    if cache is not None:
+        cache.put(cache_key, {"text": result["text"], "windows": result["windows"], "decodes": result["decodes"]})
+    result["cached"] = False
+    return result
+
+
+def transcribe_audio_array(audio: np.ndarray, filename: str, update_status: Callable[[str], None], model_name: str = DEFAULT_MODEL_NAME, mel: np.ndarray | None = None, decoding_profile: str | None = None) -> tuple[str, str | None]:
+    """
+    Transkrybuje próbki audio offline z wykorzystaniem modelu Whisper i silnika wybranego w konfiguracji.
+
+    Args:
+        audio:
+            Próbki audio float32, 16 kHz, mono.
+        filename:
+            Nazwa fragmentu, którego dotyczy transkrypcja.
+        update_status:
+            Funkcja aktualizująca wiadomości statusu w aplikacji GUI.
+        model_name:
+            Nazwa modelu Whisper użytego do transkrypcji.
+        mel:
+            Spektrogram log-mel fragmentu obliczony w trakcie nagrywania. Jeśli nie zostanie podany,
+            oblicza go silnik transkrypcji.
+        decoding_profile:
+            Profil dekodowania (fast, balanced, accurate). Domyślnie profil z konfiguracji.
+
+    Returns:
+        nazwa fragmentu i przetranskrybowany tekst | nazwa fragmentu i None w razie błędu
+    """
+
+    result = _run_transcription(audio, filename, update_status, model_name, mel, decoding_profile)
+    return filename, result["text"] if result is not None else None
+
+def transcribe_with_whisper_offline(audio_file_path: str, update_status: Callable[[str], None], model_name: str = DEFAULT_MODEL_NAME) -> tuple[str, str | None]:
     """
     Transkrybuje plik audio offline z wykorzystaniem modelu Whisper od OpenAI.
 
@@ -50,6 +326,8 @@ def transcribe_with_whisper_offline(audio_file_path: str, update_status: Callabl
             Ścieżka do pliku z audio.
         update_status:
             Funkcja aktualizująca wiadomości statusu w aplikacji GUI.
+        model_name:
+            Nazwa modelu Whisper użytego do transkrypcji.
 
     Returns:
         nazwa pliku audio, którego dotyczy transkrypcja i przetranskrybowany tekst | nazwa transkrybowanego pliku i None w razie błędu
@@ -60,45 +338,358 @@ def transcribe_with_whisper_offline(audio_file_path: str, update_status: Callabl
     filename = (filename_and_path.replace("\\", "/")).split("/")[-1]
     audio_file_path = audio_file_path.replace("\\", "/")
 
-    device = "cuda" if torch.cuda.is_available() else "cpu"
-    if device == "cuda":
-        torch.cuda.init()
-
-    # tiny, base, small, medium, large, turbo
-    model = whisper.load_model("medium").to(device)
     try:
-        audio = whisper.load_audio(audio_file_path)
+        audio = load_audio(audio_file_path)
     except Exception as err:
-        log_status(f"Błąd w czasie wczytywania pliku audio. Sprawdź poprawność ścieżki do pliku.")
+        log_status(f"Błąd w czasie wczytywania pliku audio. Sprawdź poprawność ścieżki do pliku.", "error", update_status)
         log.error(f"Błąd: \n {err}")
         return filename, None
 
-    log.debug(f"Transkrypcja pliku audio: {filename}.mp3")
-    log_status("Transkrypcja audio w toku...", "info", update_status)
+    return transcribe_audio_array(audio, filename, update_status, model_name)
+
+
+def _transcribe_fragment(audio: np.ndarray | None, audio_file_path: str, update_status: Callable[[str], None], model_name: str = DEFAULT_MODEL_NAME, mel: np.ndarray | None = None, decoding_profile: str | None = None) -> dict:
+    """
+    Transkrybuje fragment sesji nagrania i mierzy współczynnik czasu rzeczywistego (RTF).
+
+    Args:
+        audio:
+            Próbki audio float32, 16 kHz, mono | None, jeśli fragment należy wczytać z pliku.
+        audio_file_path:
+            Ścieżka do pliku fragmentu (nazwa pliku jest nazwą fragmentu).
+        update_status:
+            Funkcja aktualizująca wiadomości statusu w aplikacji GUI.
+        model_name:
+            Nazwa modelu Whisper użytego do transkrypcji.
+        mel:
+            Spektrogram log-mel fragmentu obliczony w trakcie nagrywania (opcjonalnie).
+        decoding_profile:
+            Profil dekodowania (fast, balanced, accurate). Domyślnie profil z konfiguracji.
+
+    Returns:
+        Słownik z nazwą fragmentu ("filename"), tekstem ("text", None w razie błędu), modelem ("model"),
+        długością fragmentu ("audio_seconds"), czasem transkrypcji ("transcribe_seconds") oraz liczbą
+        okien 30 s ("windows") i dekodowań ("decodes") oraz informacją, czy wynik pochodzi z pamięci
+        podręcznej transkrypcji ("cached").
+    """
+
+    filename = os.path.splitext(audio_file_path.replace("\\", "/"))[0].split("/")[-1]
+    start = time.perf_counter()
+
+    if audio is None:
+        try:
+            audio = load_audio(audio_file_path)
+        except Exception as err:
+            log_status(f"Błąd w czasie wczytywania pliku audio. Sprawdź poprawność ścieżki do pliku.", "error", update_status)
+            log.error(f"Błąd: \n {err}")
+            return {"filename": filename, "text": None, "model": model_name, "audio_seconds": 0.0, "transcribe_seconds": 0.0, "windows": 0, "decodes": 0, "cached": False}
+
+    result = _run_transcription(audio, filename, update_status, model_name, mel, decoding_profile)
+    return {
+        "filename": filename,
+        "text": result["text"] if result is not None else None,
+        "model": model_name,
+        "audio_seconds": len(audio) / WHISPER_SAMPLE_RATE,
+        "transcribe_seconds": time.perf_counter() - start,
+        "windows": result["windows"] if result is not None else 0,
+        "decodes": result["decodes"] if result is not None else 0,
+        "cached": result["cached"] if result is not None else False,
+    }
+
+
+def _record_transcript_model(transcription_folder: str, result: dict, rtf: float | None) -> None:
+    """Dopisuje do pliku modele.csv w folderze transkrypcji model, którym przetranskrybowano fragment, jego RTF (puste, gdy nieznany) oraz liczbę okien i dekodowań."""
+
+    models_path = os.path.join(transcription_folder, MODELS_FILENAME)
+    new_file = not os.path.exists(models_path)
+    with open(models_path, "a", encoding="utf-8") as f:
+        if new_file:
+            f.write("fragment;model;rtf;windows;decodes\n")
+        f.write(f"{result['filename']};{result['model']};{'' if rtf is None else f'{rtf:.3f}'};{result['windows']};{result['decodes']}\n")
+
+
+def _create_model_selector() -> AdaptiveModelSelector | None:
+    """Tworzy selektor modelu dla sesji, jeśli adaptacyjny dobór modelu jest włączony w konfiguracji."""
+
+    if not ADAPTIVE_MODEL:
+        return None
+    selector = AdaptiveModelSelector(DEFAULT_MODEL_NAME, downgrade_backlog=ADAPTIVE_MODEL_BACKLOG)
+    log.info(f"Adaptacyjny dobór modelu: {', '.join(selector.ladder)} (próg zaległości: {ADAPTIVE_MODEL_BACKLOG})")
+    return selector
+
+
+def _new_decode_stats() -> dict:
+    """Tworzy słownik statystyk dekodowania sesji."""
+    return {"fragments": 0, "windows": 0, "decodes": 0, "fallback_fragments": 0, "fallback_seconds": 0.0, "transcribe_seconds": 0.0, "audio_seconds": 0.0, "cache_hits": 0}
+
+
+def _update_decode_stats(decode_stats: dict, result: dict) -> None:
+    """Uwzględnia w statystykach sesji liczbę dekodowań, czas transkrypcji i długość nagrania fragmentu."""
+
+    decode_stats["fragments"] += 1
+    decode_stats["audio_seconds"] += result["audio_seconds"]
+    decode_stats["windows"] += result["windows"]
+    decode_stats["decodes"] += result["decodes"]
+    decode_stats["transcribe_seconds"] += result["transcribe_seconds"]
+    decode_stats["cache_hits"] += result["cached"]
+    if result["decodes"] > result["windows"]:
+        # Fragment wymagał ponownego dekodowania w wyższej temperaturze
+        decode_stats["fallback_fragments"] += 1
+        decode_stats["fallback_seconds"] += result["transcribe_seconds"]
+
+
+def _log_cache_hit_rate(decode_stats: dict) -> None:
+    """Loguje współczynnik trafień pamięci podręcznej transkrypcji w sesji."""
+
+    if not TRANSCRIPTION_CACHE or not decode_stats["fragments"]:
+        return
+    hit_rate = decode_stats["cache_hits"] / decode_stats["fragments"]
+    log.info(f"Pamięć podręczna transkrypcji: {decode_stats['cache_hits']}/{decode_stats['fragments']} fragmentów ({hit_rate:.0%} trafień)")
+
+
+def _finish_meeting(meeting_directory: str) -> None:
+    """Zapisuje zakończenie transkrypcji w bazie spotkań i dopisuje spotkanie do indeksu wyszukiwania tematycznego."""
+
+    get_meeting_store().finish_meeting(meeting_directory)
     try:
-        if device == "cuda":
-            with torch.cuda.device(device):
-                result = model.transcribe(audio=audio, language="pl")
+        get_vector_index().add_meeting(meeting_directory)
+    except (OSError, ValueError) as err:
+        log.warning(f"Nie udało się dodać spotkania do indeksu wyszukiwania tematycznego: {err}")
+
+
+def _init_transcription_worker(model_name: str, num_threads: int) -> None:
+    """
+    Przygotowuje proces puli transkrypcji: ogranicza liczbę wątków PyTorch i ładuje własny model.
+
+    Args:
+        model_name:
+            Nazwa modelu Whisper ładowanego przez proces.
+        num_threads:
+            Liczba wątków PyTorch przydzielona procesowi.
+    """
+
+    torch.set_num_threads(num_threads)
+    get_whisper_model(model_name)
+
+
+def _create_transcription_pool(workers: int = TRANSCRIPTION_WORKERS) -> ProcessPoolExecutor | None:
+    """
+    Tworzy pulę procesów transkrypcji, dzieląc rdzenie procesora równo między procesy.
+
+    Args:
+        workers:
+            Liczba procesów. Dla wartości mniejszej od 2 pula nie jest tworzona.
+
+    Returns:
+        Pula procesów | None, jeśli transkrypcja ma się odbywać w bieżącym wątku.
+    """
+
+    if workers < 2:
+        # Model ładowany jest raz, przed pierwszym fragmentem, i współdzielony przez całą sesję
+        get_whisper_model(DEFAULT_MODEL_NAME)
+        return None
+
+    num_threads = max(1, (os.cpu_count() or 1) // workers)
+    log.info(f"Uruchamianie puli transkrypcji: {workers} procesów po {num_threads} wątków")
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_transcription_worker,
+        initargs=(DEFAULT_MODEL_NAME, num_threads)
+    )
+
+
+def _submit_transcription(pool: ProcessPoolExecutor | None, function: Callable, *args, **kwargs) -> Future:
+    """
+    Zleca transkrypcję puli procesów lub wykonuje ją od razu, gdy pula nie jest używana.
+
+    Args:
+        pool:
+            Pula procesów transkrypcji lub None.
+        function:
+            Funkcja transkrypcji zwracająca (nazwa fragmentu, tekst).
+        args:
+            Argumenty funkcji. Ostatnim argumentem jest funkcja aktualizacji statusu, która w procesach
+            puli jest zastępowana wartością "placeholder" (tylko logowanie).
+        kwargs:
+            Argumenty nazwane funkcji.
+
+    Returns:
+        Obiekt Future z wynikiem transkrypcji.
+    """
+
+    if pool is None:
+        future = Future()
+        future.set_result(function(*args, **kwargs))
+        return future
+
+    return pool.submit(function, *args[:-1], "placeholder", **kwargs)
+
+
+class _TranscriptionPool:
+    """
+    Pula procesów transkrypcji odtwarzana po awarii procesu.
+
+    Awaria jednego procesu psuje całą pulę ProcessPoolExecutor: wszystkie zlecone fragmenty kończą się wyjątkiem
+    BrokenProcessPool, a kolejne zlecenia są odrzucane. Dlatego pula pamięta argumenty zleceń do czasu zapisu ich
+    wyników i po awarii zleca nieukończone fragmenty nowej puli. Po POOL_RESTARTS odtworzeniach fragmenty są
+    transkrybowane w wątku sesji.
+
+    Args:
+        workers:
+            Liczba procesów. Dla wartości mniejszej od 2 transkrypcja odbywa się w wątku sesji.
+    """
+
+    def __init__(self, workers: int = TRANSCRIPTION_WORKERS):
+        self.workers = workers
+        self.executor = _create_transcription_pool(workers)
+        self.restarts = 0
+        # Zlecenia oczekujące na zapis: Future -> (pula, funkcja, argumenty, argumenty nazwane)
+        self._jobs: dict[Future, tuple] = {}
+
+    def submit(self, function: Callable, *args, **kwargs) -> Future:
+        """Zleca transkrypcję (argumenty jak w `_submit_transcription`) i zapamiętuje zlecenie."""
+
+        try:
+            future = _submit_transcription(self.executor, function, *args, **kwargs)
+        except BrokenProcessPool as err:
+            self._restart(err)
+            future = _submit_transcription(self.executor, function, *args, **kwargs)
+        if self.executor is not None:
+            self._jobs[future] = (self.executor, function, args, kwargs)
+        return future
+
+    def release(self, future: Future) -> None:
+        """Zapomina zlecenie, którego wynik został zapisany."""
+        self._jobs.pop(future, None)
+
+    def recover(self, pending: deque, err: BrokenProcessPool) -> bool:
+        """
+        Odtwarza pulę po awarii procesu i ponownie zleca nieukończone fragmenty.
+
+        Args:
+            pending:
+                Kolejka obiektów Future w kolejności fragmentów. Obiekty zleceń uszkodzonej puli, które nie zwróciły
+                wyniku, są w niej zastępowane nowymi zleceniami (z zachowaniem kolejności).
+            err:
+                Wyjątek zgłoszony przez uszkodzoną pulę.
+
+        Returns:
+            True, jeśli pierwszy fragment kolejki został zlecony ponownie.
+        """
+
+        job = self._jobs.get(pending[0])
+        if job is None:
+            return False
+        broken = job[0]
+        if broken is self.executor:
+            self._restart(err)
+
+        for index in range(len(pending)):
+            future = pending[index]
+            executor, function, args, kwargs = self._jobs.get(future, (None, None, None, None))
+            if executor is not broken or (future.done() and not future.cancelled() and future.exception() is None):
+                continue
+            del self._jobs[future]
+            pending[index] = self.submit(function, *args, **kwargs)
+        return True
+
+    def _restart(self, err: BrokenProcessPool) -> None:
+        """Zamyka uszkodzoną pulę i tworzy nową lub, po POOL_RESTARTS awariach, przechodzi do wątku sesji."""
+
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.restarts += 1
+        if self.restarts > POOL_RESTARTS:
+            log.warning(f"Awaria procesu puli transkrypcji ({err}). Pula uległa awarii {self.restarts} razy, transkrypcja będzie kontynuowana w wątku sesji.")
+            self.executor = _create_transcription_pool(1)
         else:
-            result = model.transcribe(audio=audio, language="pl")
+            log.warning(f"Awaria procesu puli transkrypcji ({err}). Odtwarzanie puli ({self.restarts}/{POOL_RESTARTS}) i ponowne zlecenie nieukończonych fragmentów.")
+            self.executor = _create_transcription_pool(self.workers)
 
-        # Tekst z transkrypcji
-        transcribed_text = result["text"]
-        log.success(f"Skutecznie dokonano transkrypcji audio: {filename}.mp3")
-    except Exception as err:
-        log_status(f"Wystąpił problem w czasie transkrypcji!", "error", update_status)
-        log.error(f"Błąd: {err}", "error", update_status)
-        return filename, None
+    def shutdown(self) -> None:
+        """Zamyka pulę procesów."""
+        if self.executor is not None:
+            self.executor.shutdown()
 
-    return filename, transcribed_text
 
-def transcribe_audio_from_folder(folder_path: str, update_status: Callable[[str], None], app: tkinter.Tk, transription_false_update: Callable[[None], None]) -> Optional[str]:
+def _save_finished_transcriptions(pending: deque, writer: TranscriptWriter, update_status: Callable[[str], None], count_of_transcribed: int, wait_all: bool = False, selector: AdaptiveModelSelector | None = None, waiting: int = 0, decode_stats: dict | None = None, manifest: SessionManifest | None = None, pool: _TranscriptionPool | None = None) -> int:
+    """
+    Zapisuje ukończone transkrypcje w kolejności fragmentów.
+
+    Transkrypcja jest zapisywana dopiero wtedy, gdy wszystkie wcześniejsze fragmenty zostały zapisane,
+    dzięki czemu pliki txt i pełna transkrypcja zachowują kolejność nagrania.
+
+    Args:
+        pending:
+            Kolejka obiektów Future w kolejności fragmentów.
+        writer:
+            Obiekt zapisujący transkrypcje fragmentów i pełną transkrypcję sesji.
+        update_status:
+            Funkcja aktualizująca wiadomości statusu w interfejsie GUI.
+        count_of_transcribed:
+            Liczba dotychczas zapisanych transkrypcji.
+        wait_all:
+            Czy czekać na zakończenie wszystkich zleconych transkrypcji.
+        selector:
+            Selektor modelu, któremu przekazywany jest RTF i liczba zaległych fragmentów.
+        waiting:
+            Liczba fragmentów oczekujących na zlecenie transkrypcji.
+        decode_stats:
+            Statystyki dekodowania sesji, uzupełniane o zapisane fragmenty. Suma długości fragmentów jest wyświetlana jako czas nagrywania.
+        manifest:
+            Manifest sesji, w którym odnotowywany jest zapis transkrypcji fragmentu.
+        pool:
+            Pula transkrypcji, która zleciła fragmenty. Po awarii procesu puli nieukończone fragmenty są
+            zlecane ponownie.
+
+    Returns:
+        Liczba zapisanych transkrypcji po wywołaniu funkcji.
+    """
+
+    while pending and (wait_all or pending[0].done()):
+        try:
+            result = pending[0].result()
+        except BrokenProcessPool as err:
+            if pool is not None and pool.recover(pending, err):
+                continue
+            result, error = None, err
+        except Exception as err:
+            result, error = None, err
+        future = pending.popleft()
+        if pool is not None:
+            pool.release(future)
+        if result is None:
+            log_status(f"Wystąpił problem w procesie transkrypcji: {error}", "error", update_status)
+            continue
+        count_of_transcribed += 1
+
+        # Fragment, którego nie udało się wczytać, ani wynik z pamięci podręcznej nie mierzą szybkości modelu
+        rtf = result["transcribe_seconds"] / result["audio_seconds"] if result["audio_seconds"] and not result["cached"] else None
+        log.debug(f"Fragment {result['filename']}: model {result['model']}, RTF {'-' if rtf is None else f'{rtf:.2f}'}, dekodowania {result['decodes']}/{result['windows']} okien")
+        if selector is not None and rtf is not None:
+            selector.update(rtf, len(pending) + waiting)
+        if decode_stats is not None:
+            _update_decode_stats(decode_stats, result)
+
+        # zapis tranksrypcji do odpowiedniego pliku .txt
+        writer.write(result["filename"], result["text"])
+        _record_transcript_model(writer.transcription_folder, result, rtf)
+        if manifest is not None and result["text"] is not None:
+            manifest.record(FRAGMENT_TRANSCRIBED, result["filename"])
+        log.debug(f"Liczba przetranskrybowanych plików: {count_of_transcribed}")
+        if decode_stats is not None:
+            # Długość przetranskrybowanego nagrania (fragmenty mają różną długość, np. przy podziale według ciszy)
+            log_status(f"Czas nagrywania: {decode_stats['audio_seconds']/60 : .2f} min", "info", update_status)
+
+    return count_of_transcribed
+
+
+def transcribe_audio_from_folder(folder_path: str, update_status: Callable[[str], None], app: tkinter.Tk, transription_false_update: Callable[[None], None], end_event: threading.Event | None = None, decoding_profile: str | None = None, manifest: SessionManifest | None = None) -> Optional[str]:
     """
     Uruchamia transkrypcję audio z wykorzystaniem modelu Whisper dla każdego pliku audio we wskazanym folderze.
 
-    Funkcja szuka nowych plików do transkrypcji we wskazanym folderze. Robi to tak długo aż nie natrafi
-    na plik o nazwie koniec.txt. Wtedy wykonuje jeszcze tylko transkrypcję audio, które jeszcze nie
-    wykonał, a następnie kończy proces transkrypcji.
+    Funkcja pobiera nowe pliki do transkrypcji z kolejki wypełnianej przez `FragmentWatcher`, który obserwuje
+    wskazany folder. Gdy nagrywanie się zakończy (zdarzenie `end_event` lub, gdy go nie podano, plik koniec.txt),
+    wykonuje jeszcze tylko transkrypcję audio, której jeszcze nie wykonał, a następnie kończy proces transkrypcji.
 
     Args:
         folder_path:
@@ -109,6 +700,12 @@ def transcribe_audio_from_folder(folder_path: str, update_status: Callable[[str]
             Główna instancja Tkinter.
         transription_false_update:
             Funkcja GUI odblokowująca przycisk "play" po zakończeniu transkrypcji.
+        end_event:
+            Zdarzenie sygnalizujące koniec nagrywania, ustawiane przez moduł nagrywania.
+        decoding_profile:
+            Profil dekodowania sesji (fast, balanced, accurate). Domyślnie profil z konfiguracji.
+        manifest:
+            Manifest sesji, w którym odnotowywane są zapisane transkrypcje i koniec transkrypcji.
 
     Returns:
         Optional[str]:
@@ -116,41 +713,181 @@ def transcribe_audio_from_folder(folder_path: str, update_status: Callable[[str]
     """
 
     count_of_transcribed = 0
-    is_end = None
-    transcribed_files = []
-
-    folder_path_pattern = f"{folder_path}/*.mp3"
-    end_path = f"{folder_path}/koniec.txt"
+    pending = deque()
 
     base_path, timestamp = (folder_path.replace("\\", "/")).rsplit("/audio-", 1)
     transcription_folder = base_path + "/" + f"txt-{timestamp}"
     log.debug(f"Txt folder path: {transcription_folder}")
+    writer = TranscriptWriter(transcription_folder, update_status)
 
     log.debug("Rozpoczęto transkrypcję plików audio z folderu")
 
-    while is_end is None:
-        filepaths = glob.glob(folder_path_pattern)
-        is_end = glob.glob(end_path)
-        if (is_end) == []:
-            is_end = None
+    pool = _TranscriptionPool()
+    selector = _create_model_selector()
+    decode_stats = _new_decode_stats()
+    decoding_profile = decoding_profile or default_decoding_profile
+    log.info(f"Profil dekodowania: {decoding_profile or 'domyślny'}")
+
+    watcher = FragmentWatcher(folder_path, end_event)
+    watcher.start()
+
+    while not watcher.is_done():
+        filepath = watcher.get(timeout=0.5)
+        if filepath is not None:
+            model_name = selector.current if selector is not None else DEFAULT_MODEL_NAME
+            pending.append(pool.submit(_transcribe_fragment, None, filepath, update_status, model_name=model_name, decoding_profile=decoding_profile))
+        count_of_transcribed = _save_finished_transcriptions(pending, writer, update_status, count_of_transcribed, selector=selector, waiting=watcher.work_queue.qsize(), decode_stats=decode_stats, manifest=manifest, pool=pool)
+
+    watcher.stop()
+
+    # Zaległe fragmenty po zakończeniu nagrywania są transkrybowane równolegle przez pulę
+    count_of_transcribed = _save_finished_transcriptions(pending, writer, update_status, count_of_transcribed, wait_all=True, decode_stats=decode_stats, manifest=manifest, pool=pool)
+    writer.close()
+    pool.shutdown()
+    if selector is not None:
+        log.info(f"Statystyki doboru modelu: {selector.get_stats()}")
+    log.info(f"Statystyki dekodowania: {decode_stats}")
+    _log_cache_hit_rate(decode_stats)
+    _finish_meeting(os.path.dirname(writer.transcription_folder))
+    if manifest is not None:
+        manifest.record(TRANSCRIPTION_FINISHED)
+
+    log.info("Dokonano transkrypcji wszystkich plików audio.")
+    app.after(0, lambda: transription_false_update())
 
-        filepaths.sort()
-        for filepath in filepaths:
-            if filepath not in transcribed_files:
-                filename, transcribed_text = transcribe_with_whisper_offline(filepath, update_status)
-                transcribed_files.append(filepath)
-                count_of_transcribed += 1
 
-                filename_and_path, ext = os.path.splitext(filepath)
-                filename = (filename_and_path.replace("\\", "/")).split("/")[-1]
+def transcribe_audio_from_queue(audio_queue: FragmentQueue, transcription_folder: str, update_status: Callable[[str], None], app: tkinter.Tk, transription_false_update: Callable[[None], None], decoding_profile: str | None = None, manifest: SessionManifest | None = None) -> None:
+    """
+    Uruchamia transkrypcję fragmentów audio przekazywanych przez moduł nagrywania w pamięci.
 
-                # zapis tranksrypcji do odpowiedniego pliku .txt
-                save_text_to_txt(filename, transcribed_text,update_status,transcription_folder)
-                log.debug(f"Liczba przetranskrybowanych plików: {count_of_transcribed}")
-                log_status(f"Czas nagrywania: {(count_of_transcribed*20)/60 : .2f} min", "info", update_status)
+    Funkcja pobiera kolejne fragmenty z kolejki aż do jej zamknięcia przez `stop_recording`. Fragmenty
+    przekazane bez próbek (z powodu przepełnienia kolejki) są odczytywane z pliku archiwalnego.
 
-        time.sleep(0.1)
+    Args:
+        audio_queue:
+            Kolejka fragmentów audio wypełniana przez moduł nagrywania.
+        transcription_folder:
+            Ścieżka do folderu na transkrypcje fragmentów nagrania.
+        update_status:
+            Funkcja aktualizująca wiadomości statusu w interfejsie GUI.
+        app:
+            Główna instancja Tkinter.
+        transription_false_update:
+            Funkcja GUI odblokowująca przycisk "play" po zakończeniu transkrypcji.
+        decoding_profile:
+            Profil dekodowania sesji (fast, balanced, accurate). Domyślnie profil z konfiguracji.
+        manifest:
+            Manifest sesji, w którym odnotowywane są zapisane transkrypcje i koniec transkrypcji.
+    """
 
-    log.info("Dokonano transkrypcji wszystkich plików audio.")
+    count_of_transcribed = 0
+    pending = deque()
+
+    log.debug("Rozpoczęto transkrypcję fragmentów audio przekazywanych w pamięci")
+    writer = TranscriptWriter(transcription_folder, update_status)
+
+    pool = _TranscriptionPool()
+    selector = _create_model_selector()
+    decode_stats = _new_decode_stats()
+    decoding_profile = decoding_profile or default_decoding_profile
+    log.info(f"Profil dekodowania: {decoding_profile or 'domyślny'}")
+
+    while not audio_queue.is_finished():
+        item = audio_queue.get(timeout=0.5)
+        if item is not None:
+            filename, audio, archive_path, mel = item
+            model_name = selector.current if selector is not None else DEFAULT_MODEL_NAME
+            if audio is None:
+                # Fragment nie zmieścił się w kolejce - czekamy na jego zapis w archiwum
+                waited = 0.0
+                while not os.path.exists(archive_path) and waited < 60:
+                    time.sleep(0.1)
+                    waited += 0.1
+            pending.append(pool.submit(_transcribe_fragment, audio, archive_path, update_status, model_name=model_name, mel=mel, decoding_profile=decoding_profile))
+        count_of_transcribed = _save_finished_transcriptions(pending, writer, update_status, count_of_transcribed, selector=selector, waiting=audio_queue.qsize(), decode_stats=decode_stats, manifest=manifest, pool=pool)
+
+    count_of_transcribed = _save_finished_transcriptions(pending, writer, update_status, count_of_transcribed, wait_all=True, decode_stats=decode_stats, manifest=manifest, pool=pool)
+    writer.close()
+    pool.shutdown()
+    if selector is not None:
+        log.info(f"Statystyki doboru modelu: {selector.get_stats()}")
+    log.info(f"Statystyki dekodowania: {decode_stats}")
+    _log_cache_hit_rate(decode_stats)
+    _finish_meeting(os.path.dirname(writer.transcription_folder))
+    if manifest is not None:
+        manifest.record(TRANSCRIPTION_FINISHED)
+
+    log.info(f"Statystyki kolejki fragmentów: {audio_queue.get_stats()}")
+    log.info("Dokonano transkrypcji wszystkich fragmentów audio.")
     app.after(0, lambda: transription_false_update())
 
+
+def resume_meeting_transcription(meeting_directory: str, update_status: Callable[[str], None], decoding_profile: str | None = None) -> int:
+    """
+    Wznawia transkrypcję spotkania przerwanego awarią aplikacji.
+
+    Transkrybowane są tylko fragmenty audio z folderu nagrania, których transkrypcja nie została odnotowana
+    w manifeście sesji ani zapisana w folderze transkrypcji. Po zakończeniu w manifeście odnotowywany jest
+    koniec nagrywania (jeśli go brakowało) i koniec transkrypcji, a w folderze nagrania tworzony jest plik koniec.txt.
+
+    Args:
+        meeting_directory:
+            Ścieżka do folderu spotkania.
+        update_status:
+            Funkcja aktualizująca wiadomości statusu w interfejsie GUI.
+        decoding_profile:
+            Profil dekodowania (fast, balanced, accurate). Domyślnie profil z konfiguracji.
+
+    Returns:
+        Liczba przetranskrybowanych fragmentów.
+    """
+
+    meeting_directory = meeting_directory.replace("\\", "/").rstrip("/")
+    timestamp = meeting_directory.rsplit("/", 1)[-1]
+    recording_folder = f"{meeting_directory}/audio-{timestamp}"
+    transcription_folder = f"{meeting_directory}/txt-{timestamp}"
+    os.makedirs(transcription_folder, exist_ok=True)
+
+    state = read_manifest(meeting_directory) or {"transcribed": [], "recording_finished": False}
+    # Zapisy do bazy spotkań mogły przepaść razem z aplikacją - spotkanie zostanie uzgodnione z plikami
+    get_meeting_store().mark_dirty(meeting_directory)
+    writer = TranscriptWriter(transcription_folder, update_status)
+    manifest = SessionManifest(meeting_directory)
+
+    # Transkrypcja zapisana przed awarią, ale nieodnotowana w manifeście
+    transcribed = set(state["transcribed"])
+    for name in os.listdir(transcription_folder):
+        fragment, ext = os.path.splitext(name)
+        if ext == ".txt" and fragment not in transcribed:
+            transcribed.add(fragment)
+            manifest.record(FRAGMENT_TRANSCRIBED, fragment)
+
+    fragments = sorted(
+        name for name in os.listdir(recording_folder)
+        if name.rsplit(".", 1)[-1].lower() in AUDIO_EXTENSIONS and os.path.splitext(name)[0] not in transcribed
+    ) if os.path.isdir(recording_folder) else []
+    log_status(f"Wznawianie transkrypcji spotkania {timestamp}: {len(fragments)} brakujących fragmentów", "info", update_status)
+
+    pool = _TranscriptionPool() if fragments else None
+    decode_stats = _new_decode_stats()
+    pending = deque(
+        pool.submit(_transcribe_fragment, None, f"{recording_folder}/{name}", update_status, decoding_profile=decoding_profile or default_decoding_profile)
+        for name in fragments
+    )
+    count_of_transcribed = _save_finished_transcriptions(pending, writer, update_status, 0, wait_all=True, decode_stats=decode_stats, manifest=manifest, pool=pool)
+    writer.close()
+    if pool is not None:
+        pool.shutdown()
+
+    if os.path.isdir(recording_folder) and not os.path.exists(f"{recording_folder}/koniec.txt"):
+        with open(f"{recording_folder}/koniec.txt", "w") as f:
+            f.write("Nagrywanie zakończone.")
+    if not state["recording_finished"]:
+        manifest.record(RECORDING_FINISHED)
+    manifest.record(TRANSCRIPTION_FINISHED)
+    manifest.close()
+    _finish_meeting(meeting_directory)
+
+    log.info(f"Statystyki dekodowania: {decode_stats}")
+    log_status(f"Wznowiono transkrypcję spotkania {timestamp}: przetranskrybowano {count_of_transcribed} fragmentów", "success", update_status)
+    return count_of_transcribed
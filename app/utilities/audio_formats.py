@@ -0,0 +1,197 @@
+# app/utilities/audio_formats.py
+
+"""Moduł formatów zapisu fragmentów audio
+
+Skrypt opisuje formaty, w jakich mogą być zapisywane fragmenty nagrania, oraz umożliwia ich zapis i odczyt
+w postaci gotowej dla modelu Whisper (16 kHz, mono, float32). Określa również długość fragmentu nagrania
+(zmienna środowiskowa KNZS_FRAGMENT_SECONDS, domyślnie 20 s; "window" - 30 s, pełne okno modelu Whisper).
+
+Dostępne formaty (zmienna środowiskowa KNZS_AUDIO_FORMAT):
+
+    - mp3 (domyślny): 44.1 kHz stereo, 192 kbps. Odczyt wymaga dekodowania i resamplingu przez FFmpeg.
+    - wav: 16 kHz mono PCM. Zapis i odczyt bez FFmpeg.
+    - flac: 16 kHz mono, kompresja bezstratna. Zapis i odczyt bez FFmpeg, jeśli zainstalowano soundfile.
+    - opus: 16 kHz mono, 24 kbps. Format archiwalny, odczyt przez FFmpeg.
+
+Wymagane zależności
+
+Aby uruchomić skrypt, należy zainstalować następujące pakiety w środowisku Python:
+
+    - numpy: Operacje na próbkach audio
+    - pydub: Eksport fragmentów do formatów skompresowanych
+    - soundfile (opcjonalnie): Zapis i odczyt FLAC bez uruchamiania FFmpeg
+
+Skrypt może być używany jako moduł i zawiera następujące funkcje:
+
+    * get_audio_format - zwraca opis formatu zapisu fragmentów.
+    * encode_fragment - zapisuje surowe PCM (s16le) do pliku w wybranym formacie.
+    * pcm_to_float32 - zamienia surowe PCM (s16le) na próbki float32 mono.
+    * load_audio - wczytuje fragment audio jako tablicę float32 16 kHz mono.
+"""
+
+import os
+import wave
+import numpy as np
+from pydub import AudioSegment
+from loguru import logger as log
+
+try:
+    import soundfile
+except ImportError:
+    soundfile = None
+
+# Częstotliwość próbkowania oczekiwana przez model Whisper
+WHISPER_SAMPLE_RATE = 16000
+# Długość okna, do której Whisper dopełnia ciszą każde wejście (enkoder zawsze przetwarza 30 s)
+WHISPER_WINDOW_SECONDS = 30
+SAMPLE_WIDTH = 2  # bajty na próbkę (s16le)
+
+AUDIO_FORMATS = {
+    "mp3": {
+        "extension": "mp3",
+        "sample_rate": 44100,
+        "channels": 2,
+        "export": {"format": "mp3", "bitrate": "192k"},
+        "ffmpeg_codec": ["-c:a", "libmp3lame", "-b:a", "192k"],
+    },
+    "wav": {
+        "extension": "wav",
+        "sample_rate": WHISPER_SAMPLE_RATE,
+        "channels": 1,
+        "export": {"format": "wav"},
+        "ffmpeg_codec": ["-c:a", "pcm_s16le"],
+    },
+    "flac": {
+        "extension": "flac",
+        "sample_rate": WHISPER_SAMPLE_RATE,
+        "channels": 1,
+        "export": {"format": "flac"},
+        "ffmpeg_codec": ["-c:a", "flac"],
+    },
+    "opus": {
+        "extension": "opus",
+        "sample_rate": WHISPER_SAMPLE_RATE,
+        "channels": 1,
+        "export": {"format": "opus", "bitrate": "24k"},
+        "ffmpeg_codec": ["-c:a", "libopus", "-b:a", "24k"],
+    },
+}
+
+# Rozszerzenia wszystkich obsługiwanych formatów, używane przy wyszukiwaniu fragmentów
+AUDIO_EXTENSIONS = tuple(fmt["extension"] for fmt in AUDIO_FORMATS.values())
+
+# Format zapisu fragmentów wybrany w konfiguracji
+audio_format = os.environ.get("KNZS_AUDIO_FORMAT", "mp3")
+
+# Długość fragmentu nagrania w sekundach. Wartość "window" wyrównuje fragmenty do okna modelu Whisper (30 s),
+# dzięki czemu enkoder nie przetwarza ciszy dopełniającej krótsze fragmenty.
+_fragment_seconds = os.environ.get("KNZS_FRAGMENT_SECONDS", "20")
+FRAGMENT_SECONDS = WHISPER_WINDOW_SECONDS if _fragment_seconds == "window" else int(_fragment_seconds)
+
+
+def get_audio_format(name: str | None = None) -> dict:
+    """
+    Zwraca opis formatu zapisu fragmentów.
+
+    Args:
+        name:
+            Nazwa formatu (mp3, wav, flac, opus). Domyślnie format z konfiguracji.
+
+    Returns:
+        Słownik z rozszerzeniem, częstotliwością próbkowania, liczbą kanałów i parametrami eksportu.
+    """
+
+    name = name or audio_format
+    if name not in AUDIO_FORMATS:
+        log.warning(f"Nieznany format audio: {name}. Używam formatu mp3.")
+        name = "mp3"
+    return AUDIO_FORMATS[name]
+
+
+def encode_fragment(pcm: bytes, output_file: str, name: str | None = None, sample_rate: int | None = None, channels: int | None = None) -> None:
+    """
+    Zapisuje surowe PCM (s16le) do pliku w wybranym formacie.
+
+    Args:
+        pcm:
+            Surowe dane PCM.
+        output_file:
+            Ścieżka do pliku wynikowego.
+        name:
+            Nazwa formatu. Domyślnie format z konfiguracji.
+        sample_rate:
+            Częstotliwość próbkowania danych PCM. Domyślnie częstotliwość formatu.
+        channels:
+            Liczba kanałów danych PCM. Domyślnie liczba kanałów formatu.
+    """
+
+    fmt = get_audio_format(name)
+    sample_rate = sample_rate or fmt["sample_rate"]
+    channels = channels or fmt["channels"]
+
+    if fmt["extension"] == "wav":
+        with wave.open(output_file, "wb") as f:
+            f.setnchannels(channels)
+            f.setsampwidth(SAMPLE_WIDTH)
+            f.setframerate(sample_rate)
+            f.writeframes(pcm)
+        return
+
+    if fmt["extension"] == "flac" and soundfile is not None:
+        samples = np.frombuffer(pcm, dtype=np.int16).reshape(-1, channels)
+        soundfile.write(output_file, samples, sample_rate, format="FLAC", subtype="PCM_16")
+        return
+
+    audio_segment = AudioSegment(data=bytes(pcm), sample_width=SAMPLE_WIDTH, frame_rate=sample_rate, channels=channels)
+    audio_segment.export(output_file, **fmt["export"])
+
+
+def pcm_to_float32(pcm: bytes, channels: int = 1) -> np.ndarray:
+    """
+    Zamienia surowe PCM (s16le) na tablicę float32 mono w zakresie [-1, 1].
+
+    Args:
+        pcm:
+            Surowe dane PCM.
+        channels:
+            Liczba przeplatanych kanałów w danych.
+
+    Returns:
+        Jednowymiarowa tablica float32.
+    """
+
+    samples = np.frombuffer(pcm, dtype=np.int16)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples.astype(np.float32) / 32768.0
+
+
+def load_audio(audio_file_path: str) -> np.ndarray:
+    """
+    Wczytuje fragment audio jako tablicę float32 16 kHz mono, gotową dla modelu Whisper.
+
+    Pliki WAV oraz FLAC (przy zainstalowanym soundfile) zapisane w 16 kHz są odczytywane bez uruchamiania
+    procesu FFmpeg. Pozostałe pliki są dekodowane przez `whisper.load_audio`.
+
+    Args:
+        audio_file_path:
+            Ścieżka do pliku audio.
+
+    Returns:
+        Jednowymiarowa tablica float32 z próbkami audio.
+    """
+
+    ext = audio_file_path.rsplit(".", 1)[-1].lower()
+
+    if ext == "wav":
+        with wave.open(audio_file_path, "rb") as f:
+            if f.getframerate() == WHISPER_SAMPLE_RATE and f.getsampwidth() == SAMPLE_WIDTH:
+                return pcm_to_float32(f.readframes(f.getnframes()), f.getnchannels())
+
+    if ext == "flac" and soundfile is not None:
+        samples, sample_rate = soundfile.read(audio_file_path, dtype="float32", always_2d=True)
+        if sample_rate == WHISPER_SAMPLE_RATE:
+            return samples.mean(axis=1) if samples.shape[1] > 1 else samples[:, 0]
+
+    import whisper
+    return whisper.load_audio(audio_file_path)
@@ -0,0 +1,259 @@
+# app/utilities/change_detection.py
+
+"""Moduł wykrywania zmian w monitorowanym obszarze ekranu
+
+Skrypt porównuje kolejne klatki monitorowanego obszaru ekranu (moduł app.screenshots) i wyznacza procent zmiany
+obrazu: sumę bezwzględnych różnic kanałów RGB wszystkich pikseli podzieloną przez największą możliwą sumę
+(szerokość * wysokość * 255 * 3). Porównanie odbywa się na tablicach NumPy, w bibliotece NumPy (poza GIL-em
+interpretera), zamiast pętli po pikselach w Pythonie, więc nie spowalnia wątku nagrywania dźwięku.
+
+Poprzednia klatka i bufory pośrednie są alokowane raz, przy pierwszej klatce, i wykorzystywane ponownie
+w każdym kolejnym porównaniu.
+
+Tryb wykrywania wybiera zmienna środowiskowa KNZS_SCREENSHOT_DETECTOR:
+
+    - pixel (domyślnie): procent zmiany obliczany dla każdej klatki w pełnej rozdzielczości.
+    - hash: klatka jest zmniejszana do miniatury w skali szarości (HASH_SIZE + 1) x HASH_SIZE i porównywana
+      z poprzednią skrótem percepcyjnym dHash (znak różnicy sąsiednich pikseli miniatury). Pełne porównanie
+      pikseli jest wykonywane tylko wtedy, gdy odległość Hamminga skrótów przekracza KNZS_SCREENSHOT_HASH_DISTANCE,
+      aby potwierdzić zmianę. Ruch kursora czy odtwarzany mały film zmieniają niewiele bitów skrótu i nie
+      powodują zapisu zrzutu.
+
+Wymagane zależności
+
+Aby uruchomić skrypt, należy zainstalować następujące pakiety w środowisku Python:
+
+    - numpy: Operacje na tablicach pikseli
+    - Pillow: Konwersja zrzutów ekranu do tablic i miniatury
+    - loguru: Rozbudowany system logowania
+
+Skrypt może być używany jako moduł i zawiera następujące elementy:
+
+    * difference_percent - procent zmiany między dwiema klatkami.
+    * PixelChangeDetector - porównanie każdej klatki z poprzednią, z prealokowanym buforem poprzedniej klatki.
+    * dhash - skrót percepcyjny klatki.
+    * HashChangeDetector - porównanie skrótów percepcyjnych z potwierdzeniem zmiany pełnym porównaniem pikseli.
+    * create_change_detector - tworzy detektor w trybie z konfiguracji.
+"""
+
+import os
+import numpy as np
+from PIL import Image
+from loguru import logger as log
+
+# Tryb wykrywania zmian: "pixel" lub "hash"
+SCREENSHOT_DETECTOR = os.environ.get("KNZS_SCREENSHOT_DETECTOR", "pixel")
+# Bok miniatury skrótu dHash (skrót ma HASH_SIZE * HASH_SIZE bitów)
+HASH_SIZE = 16
+# Liczba próbek na piksel miniatury w każdym wymiarze (miniatura jest średnią siatki próbek, a nie wszystkich pikseli)
+HASH_SAMPLES = 8
+# Odległość Hamminga skrótów, powyżej której zmiana jest potwierdzana pełnym porównaniem
+HASH_DISTANCE = int(os.environ.get("KNZS_SCREENSHOT_HASH_DISTANCE", "6"))
+
+
+def _frame_array(frame: Image.Image | np.ndarray) -> np.ndarray:
+    """Zwraca klatkę jako tablicę uint8 o wymiarach (wysokość, szerokość, 3)."""
+
+    if isinstance(frame, Image.Image):
+        frame = np.asarray(frame.convert("RGB") if frame.mode != "RGB" else frame)
+    return frame
+
+
+def difference_percent(previous: np.ndarray, current: np.ndarray, maximum: np.ndarray | None = None, minimum: np.ndarray | None = None) -> float:
+    """
+    Wyznacza procent zmiany między dwiema klatkami.
+
+    Args:
+        previous:
+            Poprzednia klatka (tablica uint8 o wymiarach (wysokość, szerokość, 3)).
+        current:
+            Bieżąca klatka o tych samych wymiarach.
+        maximum, minimum:
+            Opcjonalne bufory uint8 o wymiarach klatki na wyniki pośrednie (bez alokacji przy każdym porównaniu).
+
+    Returns:
+        Suma bezwzględnych różnic kanałów w procentach największej możliwej sumy (0-100).
+    """
+
+    if maximum is None:
+        maximum = np.empty_like(current)
+    if minimum is None:
+        minimum = np.empty_like(current)
+
+    # |a - b| = max(a, b) - min(a, b) bez wychodzenia poza uint8
+    np.maximum(previous, current, out=maximum)
+    np.minimum(previous, current, out=minimum)
+    np.subtract(maximum, minimum, out=maximum)
+
+    # Sumy wierszy mieszczą się w uint32 (szerokość * 3 * 255), suma całkowita liczona w Pythonie bez przepełnienia
+    row_sums = np.add.reduce(maximum.reshape(len(maximum), -1), axis=1, dtype=np.uint32)
+    difference = int(row_sums.sum(dtype=np.uint64))
+    return difference / (current.size * 255) * 100
+
+
+class PixelChangeDetector:
+    """
+    Porównuje każdą klatkę z poprzednią i wyznacza procent zmiany obrazu.
+
+    Bufor poprzedniej klatki i bufory pośrednie są alokowane przy pierwszej klatce (lub po zmianie jej wymiarów)
+    i nadpisywane przy kolejnych.
+
+    Args:
+        threshold:
+            Procent zmiany, powyżej którego klatka jest uznawana za zmienioną.
+    """
+
+    def __init__(self, threshold: float = 2.0):
+        self.threshold = threshold
+        self._previous = None
+        self._maximum = None
+        self._minimum = None
+
+    def reset(self) -> None:
+        """Zapomina poprzednią klatkę; następna klatka nie jest porównywana."""
+        self._previous = None
+
+    def update(self, frame: Image.Image | np.ndarray) -> float | None:
+        """
+        Porównuje klatkę z poprzednią i zapamiętuje ją jako poprzednią.
+
+        Args:
+            frame:
+                Bieżąca klatka (obraz Pillow lub tablica uint8 RGB).
+
+        Returns:
+            Procent zmiany względem poprzedniej klatki | None dla pierwszej klatki.
+        """
+
+        current = _frame_array(frame)
+        if self._previous is None or self._previous.shape != current.shape:
+            self._previous = np.empty_like(current)
+            self._maximum = np.empty_like(current)
+            self._minimum = np.empty_like(current)
+            np.copyto(self._previous, current)
+            return None
+
+        percent = difference_percent(self._previous, current, self._maximum, self._minimum)
+        np.copyto(self._previous, current)
+        return percent
+
+    def is_changed(self, frame: Image.Image | np.ndarray) -> bool:
+        """
+        Sprawdza, czy klatka zmieniła się względem poprzedniej o więcej niż `threshold` procent.
+
+        Args:
+            frame:
+                Bieżąca klatka (obraz Pillow lub tablica uint8 RGB).
+
+        Returns:
+            True, jeśli zmiana przekracza próg (dla pierwszej klatki False).
+        """
+
+        percent = self.update(frame)
+        return percent is not None and percent > self.threshold
+
+
+def dhash(frame: Image.Image | np.ndarray, hash_size: int = HASH_SIZE) -> np.ndarray:
+    """
+    Wyznacza skrót percepcyjny dHash klatki.
+
+    Z klatki pobierana jest równomierna siatka HASH_SAMPLES x HASH_SAMPLES próbek na każdy piksel miniatury,
+    uśrednianych do miniatury w skali szarości o wymiarach (hash_size + 1) x hash_size. Bit skrótu określa,
+    czy piksel miniatury jest jaśniejszy od sąsiada z prawej. Odczytywanych jest kilkadziesiąt tysięcy pikseli
+    niezależnie od rozdzielczości klatki.
+
+    Args:
+        frame:
+            Klatka (obraz Pillow lub tablica uint8 RGB).
+        hash_size:
+            Bok skrótu w bitach.
+
+    Returns:
+        Tablica bool o wymiarach (hash_size, hash_size).
+    """
+
+    if isinstance(frame, np.ndarray):
+        frame = Image.fromarray(frame)
+    samples = frame.resize(((hash_size + 1) * HASH_SAMPLES, hash_size * HASH_SAMPLES), Image.NEAREST)
+    thumbnail = np.asarray(samples.resize((hash_size + 1, hash_size), Image.BOX).convert("L"), dtype=np.int16)
+    return thumbnail[:, 1:] > thumbnail[:, :-1]
+
+
+class HashChangeDetector:
+    """
+    Porównuje skrót percepcyjny każdej klatki ze skrótem poprzedniej.
+
+    Gdy odległość Hamminga skrótów przekracza `hash_distance`, zmiana jest potwierdzana pełnym porównaniem pikseli
+    z poprzednią klatką (`difference_percent` i próg `threshold`), więc zapisywane są te same zmiany co w trybie
+    pixel, z pominięciem drobnych zmian niewidocznych w miniaturze.
+
+    Args:
+        threshold:
+            Procent zmiany pikseli, powyżej którego klatka jest uznawana za zmienioną.
+        hash_distance:
+            Odległość Hamminga skrótów, powyżej której wykonywane jest pełne porównanie.
+    """
+
+    def __init__(self, threshold: float = 2.0, hash_distance: int = HASH_DISTANCE):
+        self.threshold = threshold
+        self.hash_distance = hash_distance
+        self._previous = None
+        self._previous_hash = None
+        self.comparisons = 0
+        self.confirmations = 0
+
+    def reset(self) -> None:
+        """Zapomina poprzednią klatkę; następna klatka nie jest porównywana."""
+        self._previous = None
+        self._previous_hash = None
+
+    def is_changed(self, frame: Image.Image | np.ndarray) -> bool:
+        """
+        Sprawdza, czy klatka zmieniła się względem poprzedniej.
+
+        Args:
+            frame:
+                Bieżąca klatka (obraz Pillow lub tablica uint8 RGB). Klatka jest zapamiętywana bez kopiowania,
+                więc źródło klatek nie może jej nadpisać przed zwróceniem następnej (moduł app.utilities.frame_sources).
+
+        Returns:
+            True, jeśli skróty się różnią, a pełne porównanie potwierdza zmianę ponad próg (dla pierwszej klatki False).
+        """
+
+        current_hash = dhash(frame)
+        previous, previous_hash = self._previous, self._previous_hash
+        self._previous, self._previous_hash = frame, current_hash
+        if previous_hash is None or previous_hash.shape != current_hash.shape:
+            return False
+
+        self.comparisons += 1
+        if np.count_nonzero(previous_hash != current_hash) <= self.hash_distance:
+            return False
+
+        previous, current = _frame_array(previous), _frame_array(frame)
+        if previous.shape != current.shape:
+            return True
+        self.confirmations += 1
+        return difference_percent(previous, current) > self.threshold
+
+
+def create_change_detector(threshold: float = 2.0, mode: str | None = None) -> PixelChangeDetector | HashChangeDetector:
+    """
+    Tworzy detektor zmian w monitorowanym obszarze ekranu.
+
+    Args:
+        threshold:
+            Procent zmiany pikseli, powyżej którego zapisywany jest zrzut ekranu.
+        mode:
+            Tryb wykrywania ("pixel" lub "hash"). Domyślnie tryb z konfiguracji (KNZS_SCREENSHOT_DETECTOR).
+
+    Returns:
+        Detektor z metodą `is_changed(frame)`. Dla nieznanego trybu zwracany jest detektor pixel.
+    """
+
+    mode = mode or SCREENSHOT_DETECTOR
+    if mode == "hash":
+        return HashChangeDetector(threshold)
+    if mode != "pixel":
+        log.warning(f"Nieznany tryb wykrywania zmian: {mode}. Używam trybu pixel.")
+    return PixelChangeDetector(threshold)
@@ -0,0 +1,159 @@
+# app/utilities/fragment_queue.py
+
+"""Moduł kolejki fragmentów audio przekazywanych w pamięci
+
+Skrypt udostępnia ograniczoną kolejkę, przez którą moduł nagrywania przekazuje fragmenty audio (float32, 16 kHz, mono)
+bezpośrednio do modułu transkrypcji, bez zapisu i ponownego dekodowania plików.
+
+Kolejka przechowuje w pamięci co najwyżej `maxsize` fragmentów. Gdy transkrypcja nie nadąża, kolejne fragmenty
+są przekazywane bez próbek audio, a jedynie ze ścieżką do pliku archiwalnego, z którego transkrypcja je odczyta.
+Dzięki temu wątek nagrywania nigdy nie jest blokowany, pamięć pozostaje ograniczona, a kolejność fragmentów
+zostaje zachowana.
+
+Wymagane zależności
+
+Aby uruchomić skrypt, należy zainstalować następujące pakiety w środowisku Python:
+
+    - numpy: Próbki audio przekazywane w kolejce
+    - loguru: Rozbudowany system logowania
+
+Skrypt może być używany jako moduł i zawiera następującą klasę:
+
+    * FragmentQueue - ograniczona kolejka fragmentów audio z metrykami przeciążenia (backpressure).
+"""
+
+import time
+import threading
+import numpy as np
+from collections import deque
+from loguru import logger as log
+
+
+class FragmentQueue:
+    """
+    Ograniczona kolejka fragmentów audio przekazywanych z nagrywania do transkrypcji.
+
+    Każdy element kolejki to krotka (nazwa fragmentu, próbki audio lub None, ścieżka do pliku archiwalnego,
+    spektrogram log-mel lub None).
+
+    Args:
+        maxsize:
+            Maksymalna liczba fragmentów przechowywanych w pamięci jednocześnie.
+    """
+
+    def __init__(self, maxsize: int = 8):
+        self.maxsize = maxsize
+        self._items = deque()
+        self._in_memory = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._stats = {
+            "put": 0,
+            "get": 0,
+            "spilled": 0,
+            "max_depth": 0,
+            "consumer_wait_seconds": 0.0,
+            "queue_latency_seconds": 0.0,
+        }
+
+    def put(self, name: str, audio: np.ndarray, archive_path: str, mel: np.ndarray | None = None) -> bool:
+        """
+        Dodaje fragment do kolejki bez blokowania wątku nagrywania.
+
+        Args:
+            name:
+                Nazwa fragmentu (timestamp w formacie HH-MM-SS).
+            audio:
+                Próbki audio float32, 16 kHz, mono.
+            archive_path:
+                Ścieżka do pliku, do którego fragment jest archiwizowany.
+            mel:
+                Spektrogram log-mel fragmentu obliczony w trakcie nagrywania (opcjonalnie).
+
+        Returns:
+            True, jeśli fragment trafił do pamięci, False, jeśli kolejka była pełna i transkrypcja
+            odczyta fragment z pliku archiwalnego.
+        """
+
+        with self._condition:
+            in_memory = self._in_memory < self.maxsize
+            if in_memory:
+                self._in_memory += 1
+            else:
+                audio = mel = None
+                self._stats["spilled"] += 1
+                log.warning(f"Kolejka fragmentów pełna ({self.maxsize}), fragment {name} zostanie odczytany z dysku.")
+
+            self._items.append((name, audio, archive_path, mel, time.perf_counter()))
+            self._stats["put"] += 1
+            self._stats["max_depth"] = max(self._stats["max_depth"], len(self._items))
+            self._condition.notify()
+
+        return in_memory
+
+    def get(self, timeout: float | None = None) -> tuple[str, np.ndarray | None, str, np.ndarray | None] | None:
+        """
+        Pobiera najstarszy fragment z kolejki, czekając na jego pojawienie się.
+
+        Args:
+            timeout:
+                Maksymalny czas oczekiwania w sekundach. Domyślnie bez limitu.
+
+        Returns:
+            Krotka (nazwa, próbki audio lub None, ścieżka archiwalna, spektrogram lub None) | None, jeśli kolejka została
+            zamknięta i jest pusta albo upłynął czas oczekiwania.
+        """
+
+        start = time.perf_counter()
+        with self._condition:
+            while not self._items and not self._closed:
+                if not self._condition.wait(timeout):
+                    break
+            self._stats["consumer_wait_seconds"] += time.perf_counter() - start
+
+            if not self._items:
+                return None
+
+            name, audio, archive_path, mel, put_time = self._items.popleft()
+            if audio is not None:
+                self._in_memory -= 1
+            self._stats["get"] += 1
+            self._stats["queue_latency_seconds"] += time.perf_counter() - put_time
+
+        return name, audio, archive_path, mel
+
+    def close(self) -> None:
+        """Oznacza koniec nagrywania. Transkrypcja pobierze pozostałe fragmenty i zakończy pracę."""
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def is_finished(self) -> bool:
+        """Zwraca True, jeśli kolejka została zamknięta i wszystkie fragmenty zostały pobrane."""
+
+        with self._condition:
+            return self._closed and not self._items
+
+    def qsize(self) -> int:
+        """Zwraca liczbę fragmentów oczekujących w kolejce."""
+
+        with self._condition:
+            return len(self._items)
+
+    def get_stats(self) -> dict:
+        """
+        Zwraca metryki kolejki.
+
+        Returns:
+            Słownik z liczbą dodanych i pobranych fragmentów, liczbą fragmentów przekazanych przez dysk
+            z powodu przepełnienia (spilled), maksymalną głębokością kolejki, łącznym czasem oczekiwania
+            transkrypcji oraz średnim czasem przebywania fragmentu w kolejce.
+        """
+
+        with self._condition:
+            stats = dict(self._stats)
+            stats["depth"] = len(self._items)
+
+        stats["mean_queue_latency_seconds"] = stats["queue_latency_seconds"] / stats["get"] if stats["get"] else 0.0
+        return stats
@@ -0,0 +1,204 @@
+# app/utilities/fragment_watcher.py
+
+"""Moduł wykrywania nowych fragmentów audio w folderze nagrania
+
+Skrypt obserwuje folder nagrania i przekazuje ścieżki nowych fragmentów audio do kolejki zadań transkrypcji.
+Jeśli zainstalowano bibliotekę watchdog, wykorzystywane są powiadomienia systemu plików (inotify, ReadDirectoryChangesW),
+w przeciwnym razie folder jest okresowo skanowany. Zbiór znanych fragmentów jest przechowywany jako set, więc
+koszt obsługi fragmentu nie rośnie wraz z długością spotkania.
+
+Koniec nagrywania jest sygnalizowany jawnie przez `threading.Event` przekazany z modułu nagrywania. Dla folderów
+bez aktywnego nagrywania (np. archiwalnych) końcem jest pojawienie się pliku `koniec.txt`.
+
+Wymagane zależności
+
+Aby uruchomić skrypt, należy zainstalować następujące pakiety w środowisku Python:
+
+    - loguru: Rozbudowany system logowania
+    - watchdog (opcjonalnie): Powiadomienia o zmianach w systemie plików
+
+Skrypt może być używany jako moduł i zawiera następującą klasę:
+
+    * FragmentWatcher - obserwator folderu nagrania wypełniający kolejkę fragmentów do transkrypcji.
+"""
+
+import os
+import queue
+import threading
+from loguru import logger as log
+from app.utilities.audio_formats import AUDIO_EXTENSIONS
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+END_FILENAME = "koniec.txt"
+
+
+class _WatchdogHandler(FileSystemEventHandler):
+    """Przekazuje zdarzenia systemu plików do obserwatora fragmentów."""
+
+    def __init__(self, watcher: "FragmentWatcher"):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.watcher._offer(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.watcher._offer(event.dest_path)
+
+
+class FragmentWatcher:
+    """
+    Obserwuje folder nagrania i wypełnia kolejkę ścieżkami nowych fragmentów audio.
+
+    Args:
+        folder_path:
+            Ścieżka do folderu z fragmentami audio.
+        end_event:
+            Zdarzenie ustawiane przez moduł nagrywania po zapisaniu ostatniego fragmentu.
+            Jeśli nie zostanie podane, końcem jest pojawienie się pliku `koniec.txt`.
+        poll_interval:
+            Odstęp między skanowaniami folderu w sekundach, gdy watchdog jest niedostępny.
+        use_watchdog:
+            Czy korzystać z powiadomień systemu plików, jeśli biblioteka watchdog jest dostępna.
+    """
+
+    def __init__(self, folder_path: str, end_event: threading.Event | None = None, poll_interval: float = 1.0, use_watchdog: bool = True):
+        self.folder_path = folder_path
+        self.end_event = end_event
+        self.poll_interval = poll_interval
+        self.use_watchdog = use_watchdog and Observer is not None
+
+        self.work_queue = queue.Queue()
+        self.finished = threading.Event()
+        self._seen: set[str] = set()
+        self._finishing = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._observer = None
+        self._thread = None
+
+    def start(self) -> None:
+        """Rozpoczyna obserwację folderu. Fragmenty istniejące w folderze trafiają do kolejki od razu."""
+
+        if self.use_watchdog:
+            self._observer = Observer()
+            self._observer.schedule(_WatchdogHandler(self), self.folder_path, recursive=False)
+            self._observer.start()
+            log.debug(f"Obserwacja folderu nagrania (watchdog): {self.folder_path}")
+        else:
+            log.debug(f"Obserwacja folderu nagrania (skanowanie co {self.poll_interval} s): {self.folder_path}")
+
+        self._scan()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Kończy obserwację folderu."""
+
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def get(self, timeout: float | None = None) -> str | None:
+        """
+        Pobiera ścieżkę kolejnego fragmentu do transkrypcji.
+
+        Args:
+            timeout:
+                Maksymalny czas oczekiwania w sekundach.
+
+        Returns:
+            Ścieżka do fragmentu | None, jeśli w tym czasie nie pojawił się nowy fragment.
+        """
+
+        try:
+            return self.work_queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def is_done(self) -> bool:
+        """Zwraca True, jeśli nagrywanie się zakończyło i wszystkie fragmenty zostały pobrane z kolejki."""
+
+        return self.finished.is_set() and self.work_queue.empty()
+
+    def _offer(self, path: str) -> None:
+        """Dodaje fragment do kolejki, jeśli ma obsługiwane rozszerzenie i nie był wcześniej zgłoszony."""
+
+        name = os.path.basename(path)
+        if name == END_FILENAME and self.end_event is None:
+            self._finish()
+            return
+
+        if name.rsplit(".", 1)[-1].lower() not in AUDIO_EXTENSIONS:
+            return
+
+        path = path.replace("\\", "/")
+        with self._lock:
+            if path in self._seen:
+                return
+            self._seen.add(path)
+        self.work_queue.put(path)
+
+    def _scan_fragments(self) -> list[str]:
+        """
+        Skanuje folder i zgłasza fragmenty w kolejności ich nazw (timestampów).
+
+        Returns:
+            Posortowana lista nazw plików w folderze.
+        """
+
+        try:
+            names = sorted(entry.name for entry in os.scandir(self.folder_path) if entry.is_file())
+        except FileNotFoundError:
+            return []
+
+        for name in names:
+            if name != END_FILENAME:
+                self._offer(os.path.join(self.folder_path, name))
+        return names
+
+    def _scan(self) -> None:
+        """Skanuje folder, a w folderach bez aktywnego nagrywania wykrywa również plik `koniec.txt`."""
+
+        names = self._scan_fragments()
+        if END_FILENAME in names and self.end_event is None:
+            self._finish()
+
+    def _finish(self) -> None:
+        """Oznacza koniec nagrywania po ostatnim skanowaniu, które wychwytuje pominięte fragmenty."""
+
+        with self._lock:
+            if self._finishing:
+                return
+            self._finishing = True
+
+        self._scan_fragments()
+        self.finished.set()
+        log.debug("Wykryto koniec nagrywania.")
+
+    def _run(self) -> None:
+        """Czeka na koniec nagrywania, a bez watchdog okresowo skanuje folder."""
+
+        while not self._stop.is_set() and not self.finished.is_set():
+            if self.end_event is not None:
+                if self.end_event.wait(self.poll_interval):
+                    self._finish()
+                    break
+            else:
+                self._stop.wait(self.poll_interval)
+
+            if not self.use_watchdog:
+                self._scan()
@@ -0,0 +1,254 @@
+# app/utilities/frame_sources.py
+
+"""Moduł źródeł klatek monitorowanego obszaru ekranu
+
+Skrypt dostarcza klatki (tablice uint8 RGB o wymiarach (wysokość, szerokość, 3)) do monitorowania zmian obrazu
+w module app.screenshots. Dostępne są źródła:
+
+    - mss: zrzut obszaru ekranu biblioteką mss (na Linuksie bezpośrednio przez X11, z pamięcią współdzieloną
+      MIT-SHM w wersjach mss, które ją obsługują). Piksele są przepisywane do dwóch prealokowanych buforów
+      używanych na zmianę, więc kolejne zrzuty nie alokują nowych tablic.
+    - imagegrab: dotychczasowy zrzut przez PIL.ImageGrab, używany, gdy mss nie jest zainstalowany.
+    - odtwarzanie: kolejne obrazy z folderu (ImageSequenceSource) lub klatki pliku wideo odczytywane przez FFmpeg
+      (VideoReplaySource). Pozwala testować i mierzyć wykrywanie zmian slajdów bez ekranu.
+
+Źródło zrzutów ekranu wybiera zmienna środowiskowa KNZS_FRAME_SOURCE: auto (domyślnie - mss, jeśli jest
+zainstalowany, w przeciwnym razie imagegrab), mss lub imagegrab.
+
+Klatka zwrócona przez `grab` pozostaje niezmieniona do zakończenia następnego wywołania `grab`, więc detektor zmian
+może porównywać bieżącą klatkę z poprzednią bez kopiowania.
+
+Wymagane zależności
+
+Aby uruchomić skrypt, należy zainstalować następujące pakiety w środowisku Python:
+
+    - numpy: Bufory klatek
+    - Pillow: Zrzuty ekranu (ImageGrab) i odczyt obrazów
+    - mss (opcjonalnie): Szybkie zrzuty ekranu z ponownym użyciem buforów
+    - loguru: Rozbudowany system logowania
+
+Skrypt może być używany jako moduł i zawiera następujące elementy:
+
+    * FrameSource - interfejs źródła klatek.
+    * MssSource - zrzuty obszaru ekranu biblioteką mss.
+    * ImageGrabSource - zrzuty obszaru ekranu przez PIL.ImageGrab.
+    * ImageSequenceSource - odtwarzanie obrazów z folderu.
+    * VideoReplaySource - odtwarzanie klatek pliku wideo.
+    * create_frame_source - tworzy źródło zrzutów ekranu z konfiguracji.
+"""
+
+import os
+import json
+import subprocess
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+import numpy as np
+from PIL import Image, ImageGrab
+from loguru import logger as log
+
+try:
+    import mss
+except ImportError:
+    mss = None
+
+# Źródło zrzutów ekranu: "auto", "mss" lub "imagegrab"
+FRAME_SOURCE = os.environ.get("KNZS_FRAME_SOURCE", "auto")
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+class FrameSource(ABC):
+    """
+    Interfejs źródła klatek.
+
+    Atrybut `live` określa, czy klatki pochodzą z ekranu (monitorowanie czeka między zrzutami), czy z nagrania
+    (klatki są przetwarzane jedna po drugiej).
+    """
+
+    live = True
+
+    @abstractmethod
+    def grab(self) -> tuple[np.ndarray, datetime] | None:
+        """
+        Zwraca kolejną klatkę.
+
+        Returns:
+            Para (klatka, czas klatki) | None, jeśli źródło się skończyło.
+        """
+
+    def close(self) -> None:
+        """Zwalnia zasoby źródła."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class MssSource(FrameSource):
+    """
+    Zrzuty obszaru ekranu biblioteką mss z ponownym użyciem buforów.
+
+    Obiekt mss jest związany z wątkiem, w którym został utworzony, więc źródło należy utworzyć w wątku monitorowania.
+
+    Args:
+        bbox:
+            Obszar ekranu (lewo, góra, prawo, dół).
+    """
+
+    def __init__(self, bbox: tuple[int, int, int, int]):
+        if mss is None:
+            raise ImportError("Pakiet mss nie jest zainstalowany.")
+        left, top, right, bottom = bbox
+        self.monitor = {"left": left, "top": top, "width": right - left, "height": bottom - top}
+        self._sct = mss.mss()
+        # Dwa bufory używane na zmianę: poprzednia klatka pozostaje ważna w trakcie kolejnego zrzutu
+        self._buffers = [np.empty((bottom - top, right - left, 3), dtype=np.uint8) for _ in range(2)]
+        self._next = 0
+
+    def grab(self) -> tuple[np.ndarray, datetime]:
+        shot = self._sct.grab(self.monitor)
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        frame = self._buffers[self._next]
+        if frame.shape[:2] != bgra.shape[:2]:
+            # Zrzut o innej wielkości niż obszar (np. skalowanie ekranu HiDPI)
+            frame = self._buffers[self._next] = np.empty((shot.height, shot.width, 3), dtype=np.uint8)
+        np.copyto(frame, bgra[:, :, 2::-1])
+        self._next ^= 1
+        return frame, datetime.now()
+
+    def close(self) -> None:
+        self._sct.close()
+
+
+class ImageGrabSource(FrameSource):
+    """
+    Zrzuty obszaru ekranu przez PIL.ImageGrab.
+
+    Args:
+        bbox:
+            Obszar ekranu (lewo, góra, prawo, dół).
+    """
+
+    def __init__(self, bbox: tuple[int, int, int, int]):
+        self.bbox = bbox
+
+    def grab(self) -> tuple[np.ndarray, datetime]:
+        return np.asarray(ImageGrab.grab(self.bbox).convert("RGB")), datetime.now()
+
+
+class ImageSequenceSource(FrameSource):
+    """
+    Odtwarzanie obrazów z folderu w kolejności nazw plików.
+
+    Args:
+        paths:
+            Folder z obrazami (png, jpg, bmp) lub lista ścieżek do obrazów.
+        interval:
+            Odstęp czasu między kolejnymi klatkami w sekundach (czas klatek, bez oczekiwania).
+        start_time:
+            Czas pierwszej klatki. Domyślnie chwila utworzenia źródła.
+    """
+
+    live = False
+
+    def __init__(self, paths: str | list[str], interval: float = 3.0, start_time: datetime | None = None):
+        if isinstance(paths, str):
+            paths = [os.path.join(paths, name) for name in sorted(os.listdir(paths)) if name.lower().endswith(IMAGE_EXTENSIONS)]
+        self.paths = list(paths)
+        self.interval = interval
+        self.start_time = start_time or datetime.now()
+        self._index = 0
+
+    def grab(self) -> tuple[np.ndarray, datetime] | None:
+        if self._index >= len(self.paths):
+            return None
+        with Image.open(self.paths[self._index]) as image:
+            frame = np.asarray(image.convert("RGB"))
+        frame_time = self.start_time + timedelta(seconds=self._index * self.interval)
+        self._index += 1
+        return frame, frame_time
+
+
+class VideoReplaySource(FrameSource):
+    """
+    Odtwarzanie klatek pliku wideo co `interval` sekund nagrania.
+
+    Klatki są dekodowane przez FFmpeg do surowego strumienia RGB i odczytywane do dwóch prealokowanych buforów.
+
+    Args:
+        path:
+            Ścieżka do pliku wideo.
+        interval:
+            Odstęp czasu między pobieranymi klatkami w sekundach nagrania.
+        start_time:
+            Czas pierwszej klatki. Domyślnie chwila utworzenia źródła.
+    """
+
+    live = False
+
+    def __init__(self, path: str, interval: float = 3.0, start_time: datetime | None = None):
+        probe = subprocess.run(
+            ["ffprobe", "-v", "error", "-select_streams", "v:0", "-show_entries", "stream=width,height", "-of", "json", path],
+            capture_output=True, check=True, text=True)
+        stream = json.loads(probe.stdout)["streams"][0]
+        width, height = stream["width"], stream["height"]
+
+        self.interval = interval
+        self.start_time = start_time or datetime.now()
+        self._buffers = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(2)]
+        self._next = 0
+        self._index = 0
+        self._process = subprocess.Popen(
+            ["ffmpeg", "-v", "error", "-i", path, "-vf", f"fps=1/{interval}", "-f", "rawvideo", "-pix_fmt", "rgb24", "-"],
+            stdout=subprocess.PIPE)
+
+    def grab(self) -> tuple[np.ndarray, datetime] | None:
+        frame = self._buffers[self._next]
+        view = memoryview(frame).cast("B")
+        received = 0
+        while received < len(view):
+            count = self._process.stdout.readinto(view[received:])
+            if not count:
+                return None
+            received += count
+        self._next ^= 1
+        frame_time = self.start_time + timedelta(seconds=self._index * self.interval)
+        self._index += 1
+        return frame, frame_time
+
+    def close(self) -> None:
+        self._process.stdout.close()
+        self._process.terminate()
+        self._process.wait()
+
+
+def create_frame_source(bbox: tuple[int, int, int, int], name: str | None = None) -> FrameSource:
+    """
+    Tworzy źródło zrzutów obszaru ekranu.
+
+    Args:
+        bbox:
+            Obszar ekranu (lewo, góra, prawo, dół).
+        name:
+            Nazwa źródła ("auto", "mss", "imagegrab"). Domyślnie źródło z konfiguracji (KNZS_FRAME_SOURCE).
+
+    Returns:
+        Źródło mss lub - gdy mss nie jest zainstalowany albo nie działa - ImageGrab.
+    """
+
+    name = name or FRAME_SOURCE
+    if name not in ("auto", "mss", "imagegrab"):
+        log.warning(f"Nieznane źródło zrzutów ekranu: {name}. Używam źródła auto.")
+        name = "auto"
+    if name == "imagegrab" or (name == "auto" and mss is None):
+        return ImageGrabSource(bbox)
+    if mss is None:
+        log.warning("Pakiet mss nie jest zainstalowany. Używam PIL.ImageGrab.")
+        return ImageGrabSource(bbox)
+    try:
+        return MssSource(bbox)
+    except (mss.ScreenShotError, OSError) as err:
+        log.warning(f"Zrzuty ekranu przez mss są niedostępne ({err}). Używam PIL.ImageGrab.")
+        return ImageGrabSource(bbox)
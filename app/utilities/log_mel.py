@@ -0,0 +1,200 @@
+# app/utilities/log_mel.py
+
+"""Moduł przyrostowego obliczania spektrogramu log-mel
+
+Skrypt oblicza 80-pasmowy spektrogram log-mel w postaci oczekiwanej przez model Whisper (STFT: okno Hanna 400 próbek,
+przesunięcie 160 próbek, 16 kHz) przyrostowo, w miarę napływania próbek audio. Dzięki temu wątek nagrywania
+przygotowuje cechy jeszcze w trakcie trwania fragmentu, a po jego zamknięciu do transkrypcji trafia gotowy
+spektrogram - etap ekstrakcji cech znika ze ścieżki krytycznej transkrypcji.
+
+Wynik jest zgodny z `whisper.log_mel_spectrogram(audio, padding=N_SAMPLES)`: obejmuje również ramki 30 s ciszy,
+którą Whisper dopełnia każde wejście, a normalizacja (obcięcie do maksimum - 8 i skalowanie) wykonywana jest
+po zamknięciu fragmentu, ponieważ zależy od maksimum całego spektrogramu.
+
+Wymagane zależności
+
+Aby uruchomić skrypt, należy zainstalować następujące pakiety w środowisku Python:
+
+    - numpy: STFT i banki filtrów melowych
+
+Skrypt może być używany jako moduł i zawiera następujące elementy:
+
+    * mel_filters - bank filtrów melowych (skala i normalizacja Slaney, jak w librosa i Whisper).
+    * StreamingLogMel - przyrostowe obliczanie spektrogramu log-mel fragmentu audio.
+"""
+
+import numpy as np
+from app.utilities.audio_formats import WHISPER_SAMPLE_RATE, WHISPER_WINDOW_SECONDS
+
+N_FFT = 400
+HOP_LENGTH = 160
+N_MELS = 80
+# Liczba ramek odpowiadająca 30 s ciszy dopełniającej wejście modelu Whisper
+PADDING_FRAMES = WHISPER_WINDOW_SECONDS * WHISPER_SAMPLE_RATE // HOP_LENGTH
+
+_filters_cache: dict[int, np.ndarray] = {}
+
+
+def _hz_to_mel(freq: np.ndarray) -> np.ndarray:
+    """Skala melowa Slaney: liniowa do 1 kHz, logarytmiczna powyżej."""
+    freq = np.asanyarray(freq, dtype=np.float64)
+    mels = freq / (200.0 / 3)
+    log_region = freq >= 1000.0
+    mels = np.where(log_region, 15.0 + np.log(np.maximum(freq, 1e-10) / 1000.0) / (np.log(6.4) / 27.0), mels)
+    return mels
+
+
+def _mel_to_hz(mels: np.ndarray) -> np.ndarray:
+    """Odwrotność `_hz_to_mel`."""
+    mels = np.asanyarray(mels, dtype=np.float64)
+    freqs = mels * (200.0 / 3)
+    log_region = mels >= 15.0
+    return np.where(log_region, 1000.0 * np.exp((np.log(6.4) / 27.0) * (mels - 15.0)), freqs)
+
+
+def mel_filters(n_mels: int = N_MELS) -> np.ndarray:
+    """
+    Zwraca bank trójkątnych filtrów melowych dla STFT o długości N_FFT przy 16 kHz.
+
+    Args:
+        n_mels:
+            Liczba pasm melowych.
+
+    Returns:
+        Macierz float32 o wymiarach (n_mels, N_FFT // 2 + 1).
+    """
+
+    if n_mels in _filters_cache:
+        return _filters_cache[n_mels]
+
+    fft_freqs = np.linspace(0, WHISPER_SAMPLE_RATE / 2, N_FFT // 2 + 1)
+    mel_points = _mel_to_hz(np.linspace(_hz_to_mel(0.0), _hz_to_mel(WHISPER_SAMPLE_RATE / 2), n_mels + 2))
+
+    differences = np.diff(mel_points)
+    ramps = mel_points[:, None] - fft_freqs[None, :]
+    lower = -ramps[:-2] / differences[:-1, None]
+    upper = ramps[2:] / differences[1:, None]
+    weights = np.maximum(0, np.minimum(lower, upper))
+    weights *= (2.0 / (mel_points[2:] - mel_points[:-2]))[:, None]
+
+    _filters_cache[n_mels] = weights.astype(np.float32)
+    return _filters_cache[n_mels]
+
+
+class StreamingLogMel:
+    """
+    Przyrostowo oblicza spektrogram log-mel jednego fragmentu audio.
+
+    Po każdym `feed` obliczane są wszystkie ramki STFT, dla których dostępne są już wszystkie próbki.
+    `finish` dolicza ramki końcowe (z dopełnieniem zerami), normalizuje spektrogram i przygotowuje obiekt
+    do kolejnego fragmentu.
+
+    Args:
+        max_seconds:
+            Maksymalna długość fragmentu, dla której prealokowana jest tablica ramek.
+        n_mels:
+            Liczba pasm melowych.
+    """
+
+    def __init__(self, max_seconds: float, n_mels: int = N_MELS):
+        self.n_mels = n_mels
+        self.filters = mel_filters(n_mels)
+        self.window = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(N_FFT) / N_FFT)).astype(np.float32)
+        self._mel = np.empty((n_mels, int(max_seconds * WHISPER_SAMPLE_RATE) // HOP_LENGTH + PADDING_FRAMES + 1), dtype=np.float32)
+        self._carry = b""
+        self.reset()
+
+    def reset(self) -> None:
+        """Przygotowuje obiekt do obliczania spektrogramu nowego fragmentu."""
+
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._started = False
+        self._samples = 0
+        self._frames = 0
+
+    def feed_pcm(self, pcm: memoryview | bytes) -> None:
+        """
+        Dopisuje surowe dane PCM (s16le, 16 kHz, mono) w dowolnych porcjach.
+
+        Args:
+            pcm:
+                Dane PCM; niepełna próbka jest przechowywana do kolejnego wywołania.
+        """
+
+        if self._carry:
+            pcm = self._carry + bytes(pcm)
+        usable = len(pcm) - len(pcm) % 2
+        self._carry = bytes(pcm[usable:])
+        self.feed(np.frombuffer(pcm[:usable], dtype=np.int16).astype(np.float32) / 32768.0)
+
+    def feed(self, samples: np.ndarray) -> None:
+        """
+        Dopisuje próbki float32 i oblicza ramki, dla których dostępne są wszystkie próbki.
+
+        Args:
+            samples:
+                Próbki audio float32, 16 kHz, mono.
+        """
+
+        if samples.size == 0:
+            return
+
+        if not self._started:
+            # Początek fragmentu: odbicie lustrzane N_FFT // 2 próbek, jak w torch.stft(center=True)
+            head = np.concatenate((self._pending, samples))
+            if head.size <= N_FFT // 2:
+                self._pending = head
+                return
+            samples = np.concatenate((head[1:N_FFT // 2 + 1][::-1], head))
+            self._pending = np.zeros(0, dtype=np.float32)
+            self._started = True
+            self._samples = head.size
+        else:
+            self._samples += samples.size
+
+        self._process(np.concatenate((self._pending, samples)))
+
+    def _process(self, buffer: np.ndarray) -> None:
+        """Oblicza wszystkie pełne ramki w buforze i zachowuje próbki potrzebne do kolejnych ramek."""
+
+        count = (buffer.size - N_FFT) // HOP_LENGTH + 1 if buffer.size >= N_FFT else 0
+        if count > 0:
+            frames = np.lib.stride_tricks.sliding_window_view(buffer, N_FFT)[::HOP_LENGTH][:count]
+            spectrum = np.fft.rfft(frames * self.window, axis=1)
+            power = spectrum.real ** 2 + spectrum.imag ** 2
+            self._mel[:, self._frames:self._frames + count] = self.filters @ power.T.astype(np.float32)
+            self._frames += count
+        self._pending = buffer[count * HOP_LENGTH:]
+
+    def finish(self) -> np.ndarray:
+        """
+        Zamyka fragment i zwraca jego znormalizowany spektrogram log-mel.
+
+        Returns:
+            Tablica float32 o wymiarach (n_mels, liczba próbek // HOP_LENGTH + PADDING_FRAMES), zgodna
+            z `whisper.log_mel_spectrogram(audio, padding=N_SAMPLES)`.
+        """
+
+        if not self._started:
+            # Fragment krótszy niż połowa okna STFT
+            pending = self._pending
+            self.reset()
+            if pending.size:
+                self.feed(np.concatenate((pending, np.zeros(N_FFT, dtype=np.float32))))
+                self._samples = pending.size
+        total_frames = self._samples // HOP_LENGTH + PADDING_FRAMES
+
+        # Ramki zachodzące na koniec fragmentu: dopełnienie zerami (cisza Whisper), a ramki w samej ciszy są stałe
+        tail = min(total_frames - self._frames, N_FFT // HOP_LENGTH + 2)
+        if tail > 0:
+            self._process(np.concatenate((self._pending, np.zeros(tail * HOP_LENGTH + N_FFT, dtype=np.float32))))
+        self._frames = min(self._frames, total_frames)
+
+        mel = self._mel[:, :total_frames]
+        mel[:, self._frames:] = 0.0
+        log_spec = np.log10(np.maximum(mel, 1e-10))
+        log_spec = np.maximum(log_spec, log_spec.max() - 8.0)
+        log_spec = (log_spec + 4.0) / 4.0
+
+        self.reset()
+        return log_spec
@@ -0,0 +1,607 @@
+# app/utilities/meeting_store.py
+
+"""Moduł bazy danych spotkań
+
+Skrypt prowadzi wbudowaną bazę SQLite (jedną na instalację), w której zapisywane są spotkania oraz ich pliki:
+fragmenty audio, zrzuty ekranu, transkrypcje fragmentów (wraz z tekstem) i raporty PDF. Moduły aplikacji dopisują
+do niej pliki w chwili ich zapisu, a listy spotkań i raportów, kolejność plików spotkania oraz treść raportu
+są odczytywane zapytaniami po indeksach (spotkanie, timestamp) zamiast przeszukiwania folderów.
+
+Treść transkrypcji jest indeksowana pełnotekstowo (SQLite FTS5) w chwili zapisu każdego fragmentu, dzięki czemu
+`MeetingStore.search` przeszukuje całe archiwum spotkań jednym zapytaniem.
+
+Spotkania utworzone przed wprowadzeniem bazy (lub skopiowane do folderu `spotkania`) są do niej importowane
+jednokrotnie, przy pierwszym odwołaniu - import przegląda foldery spotkania tak, jak robiły to wcześniej moduły.
+
+Położenie bazy określa zmienna środowiskowa KNZS_MEETING_DB (domyślnie `spotkania/spotkania.db` w katalogu
+roboczym aplikacji).
+
+Wymagane zależności
+
+Aby uruchomić skrypt, należy zainstalować następujące pakiety w środowisku Python:
+
+    - loguru: Rozbudowany system logowania
+
+Skrypt może być używany jako moduł i zawiera następujące elementy:
+
+    * MeetingStore - baza spotkań i ich plików.
+    * search_words - słowa zapytania wyszukiwane w transkrypcjach (bez słów funkcyjnych).
+    * get_meeting_store - współdzielona instancja bazy spotkań aplikacji.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from loguru import logger as log
+from app.utilities.session_manifest import read_manifest
+
+# Ścieżka do bazy spotkań, None - spotkania/spotkania.db w katalogu roboczym
+MEETING_DB_PATH = os.environ.get("KNZS_MEETING_DB")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    directory TEXT NOT NULL UNIQUE,
+    created_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE TABLE IF NOT EXISTS fragments (
+    id INTEGER PRIMARY KEY,
+    meeting_id INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    timestamp TEXT NOT NULL,
+    path TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS screenshots (
+    id INTEGER PRIMARY KEY,
+    meeting_id INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    timestamp TEXT NOT NULL,
+    path TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS transcripts (
+    id INTEGER PRIMARY KEY,
+    meeting_id INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    timestamp TEXT NOT NULL,
+    path TEXT NOT NULL UNIQUE,
+    text TEXT NOT NULL,
+    archived INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    meeting_id INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    path TEXT NOT NULL UNIQUE,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS meetings_name ON meetings(name);
+CREATE INDEX IF NOT EXISTS fragments_meeting_timestamp ON fragments(meeting_id, timestamp);
+CREATE INDEX IF NOT EXISTS screenshots_meeting_timestamp ON screenshots(meeting_id, timestamp);
+CREATE INDEX IF NOT EXISTS transcripts_meeting_timestamp ON transcripts(meeting_id, archived, timestamp);
+CREATE INDEX IF NOT EXISTS reports_meeting ON reports(meeting_id);
+"""
+
+# Indeks pełnotekstowy transkrypcji (bez przeniesionych do archiwum - ich treść jest w pliku grupy),
+# aktualizowany wyzwalaczami przy każdym zapisie transkrypcji
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE transcripts_fts USING fts5(
+    text, content='transcripts', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER transcripts_fts_insert AFTER INSERT ON transcripts WHEN new.archived = 0 BEGIN
+    INSERT INTO transcripts_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER transcripts_fts_delete AFTER DELETE ON transcripts WHEN old.archived = 0 BEGIN
+    INSERT INTO transcripts_fts (transcripts_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+CREATE TRIGGER transcripts_fts_update AFTER UPDATE ON transcripts BEGIN
+    INSERT INTO transcripts_fts (transcripts_fts, rowid, text) SELECT 'delete', old.id, old.text WHERE old.archived = 0;
+    INSERT INTO transcripts_fts (rowid, text) SELECT new.id, new.text WHERE new.archived = 0;
+END;
+INSERT INTO transcripts_fts (rowid, text) SELECT id, text FROM transcripts WHERE archived = 0;
+"""
+
+# Słowa funkcyjne pomijane w zapytaniach: występują w prawie każdym fragmencie, więc nie zawężają wyników,
+# a odczyt i ocena trafności ich dopasowań w całym archiwum zajmuje najwięcej czasu
+STOP_WORDS = frozenset((
+    "a", "i", "o", "u", "w", "z", "we", "ze", "że", "na", "do", "od", "po", "za", "dla", "przez", "przy", "pod", "nad",
+    "to", "ten", "ta", "te", "tym", "tego", "jest", "są", "być", "był", "była", "było", "będzie", "się", "nie", "tak",
+    "ale", "jak", "już", "może", "czy", "co", "no", "więc", "też", "oraz", "lub", "albo", "tylko", "jeszcze", "tu",
+    "tam", "ja", "ty", "on", "ona", "my", "wy", "oni", "mi", "mnie", "go", "jej", "ich",
+))
+# Minimalna długość słowa zapytania wyszukiwanego również jako początek dłuższego słowa
+PREFIX_MIN_LENGTH = 4
+
+_meeting_store = None
+_meeting_store_lock = threading.Lock()
+
+
+def _normalize(path: str) -> str:
+    """Ścieżka bezwzględna z ukośnikami, w postaci przechowywanej w bazie."""
+    return os.path.abspath(path).replace("\\", "/")
+
+
+def _timestamp(path: str) -> str:
+    """Timestamp pliku spotkania - nazwa pliku bez rozszerzenia (np. 23-07-50)."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def _file_meeting(path: str) -> str:
+    """Zwraca folder spotkania pliku zapisanego w jednym z folderów spotkania (audio-, screenshots-, txt-)."""
+    return os.path.dirname(os.path.dirname(os.path.abspath(path)))
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class MeetingStore:
+    """
+    Baza SQLite spotkań i ich plików.
+
+    Jedno połączenie jest współdzielone przez wątki nagrywania, zrzutów ekranu i transkrypcji (dostęp chroniony
+    blokadą). Błąd zapisu do bazy jest logowany i nie przerywa nagrywania - spotkanie jest wtedy oznaczane jako
+    nieuzgodnione, a przed zbudowaniem raportu i łączeniem transkrypcji (`ensure_meeting`) jego wpisy są odtwarzane
+    z plików na dysku. Pozostałe spotkania są odczytywane wyłącznie z bazy.
+
+    Args:
+        path:
+            Ścieżka do pliku bazy.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # Foldery spotkań, których zapis do bazy się nie powiódł - uzgadniane z plikami przy kolejnym odczycie
+        self._dirty: set[str] = set()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("PRAGMA foreign_keys=ON")
+        self._connection.executescript(SCHEMA)
+        self.search_available = self._create_search_index()
+
+    def _create_search_index(self) -> bool:
+        """Tworzy indeks pełnotekstowy (wraz z transkrypcjami zapisanymi wcześniej), jeśli jeszcze go nie ma."""
+
+        exists = self._connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'transcripts_fts'").fetchone()
+        if exists:
+            return True
+        try:
+            self._connection.executescript(f"BEGIN;{FTS_SCHEMA}COMMIT;")
+            return True
+        except sqlite3.OperationalError as err:
+            self._connection.rollback()
+            log.warning(f"Wyszukiwanie pełnotekstowe niedostępne (SQLite bez FTS5): {err}")
+            return False
+
+    def _meeting_id(self, directory: str) -> int:
+        """Zwraca identyfikator spotkania, dodając je do bazy, jeśli go nie ma. Wywoływane pod blokadą."""
+
+        directory = _normalize(directory)
+        row = self._connection.execute("SELECT id FROM meetings WHERE directory = ?", (directory,)).fetchone()
+        if row is not None:
+            return row[0]
+        cursor = self._connection.execute(
+            "INSERT INTO meetings (name, directory, created_at) VALUES (?, ?, ?)",
+            (os.path.basename(directory), directory, _now()))
+        return cursor.lastrowid
+
+    def _write(self, description: str, function, *args, meeting: str | None = None) -> bool:
+        """
+        Wykonuje zapis w jednej transakcji; błąd bazy jest logowany.
+
+        Po nieudanym zapisie spotkanie `meeting` (ścieżka do folderu) jest oznaczane jako nieuzgodnione z plikami.
+        """
+
+        with self._lock:
+            try:
+                with self._connection:
+                    function(*args)
+                return True
+            except sqlite3.Error as err:
+                log.warning(f"Błąd zapisu do bazy spotkań ({description}): {err}")
+                if meeting is not None:
+                    self._dirty.add(_normalize(meeting))
+                return False
+
+    def _add_file(self, table: str, path: str) -> None:
+        """Dodaje plik spotkania do tabeli; spotkanie to folder nadrzędny folderu pliku."""
+
+        meeting_id = self._meeting_id(_file_meeting(path))
+        self._connection.execute(
+            f"INSERT OR IGNORE INTO {table} (meeting_id, timestamp, path) VALUES (?, ?, ?)",
+            (meeting_id, _timestamp(path), _normalize(path)))
+
+    def add_meeting(self, meeting_directory: str) -> None:
+        """
+        Dodaje spotkanie do bazy.
+
+        Args:
+            meeting_directory:
+                Ścieżka do folderu spotkania; nazwa folderu (timestamp) jest nazwą spotkania.
+        """
+
+        self._write("spotkanie", self._meeting_id, meeting_directory, meeting=meeting_directory)
+
+    def finish_meeting(self, meeting_directory: str) -> None:
+        """
+        Zapisuje czas zakończenia transkrypcji spotkania.
+
+        Args:
+            meeting_directory:
+                Ścieżka do folderu spotkania.
+        """
+
+        def finish():
+            meeting_id = self._meeting_id(meeting_directory)
+            self._connection.execute("UPDATE meetings SET finished_at = ? WHERE id = ?", (_now(), meeting_id))
+
+        self._write("koniec spotkania", finish, meeting=meeting_directory)
+
+    def add_fragment(self, path: str) -> None:
+        """
+        Dodaje fragment audio spotkania.
+
+        Args:
+            path:
+                Ścieżka do pliku fragmentu (w folderze audio-timestamp).
+        """
+
+        self._write("fragment audio", self._add_file, "fragments", path, meeting=_file_meeting(path))
+
+    def add_screenshot(self, path: str) -> None:
+        """
+        Dodaje zrzut ekranu spotkania.
+
+        Args:
+            path:
+                Ścieżka do pliku zrzutu (w folderze screenshots-timestamp).
+        """
+
+        self._write("zrzut ekranu", self._add_file, "screenshots", path, meeting=_file_meeting(path))
+
+    def add_transcript(self, path: str, text: str) -> None:
+        """
+        Dodaje (lub zastępuje) transkrypcję fragmentu spotkania.
+
+        Args:
+            path:
+                Ścieżka do pliku txt fragmentu (w folderze txt-timestamp).
+            text:
+                Treść zapisana w pliku.
+        """
+
+        def add():
+            meeting_id = self._meeting_id(_file_meeting(path))
+            self._connection.execute(
+                "INSERT INTO transcripts (meeting_id, timestamp, path, text) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET text = excluded.text, archived = 0",
+                (meeting_id, _timestamp(path), _normalize(path), text))
+
+        self._write("transkrypcja", add, meeting=_file_meeting(path))
+
+    def add_report(self, path: str) -> None:
+        """
+        Dodaje raport PDF spotkania.
+
+        Args:
+            path:
+                Ścieżka do pliku raportu (w folderze spotkania).
+        """
+
+        def add():
+            meeting_id = self._meeting_id(os.path.dirname(os.path.abspath(path)))
+            self._connection.execute(
+                "INSERT OR IGNORE INTO reports (meeting_id, path, created_at) VALUES (?, ?, ?)",
+                (meeting_id, _normalize(path), _now()))
+
+        self._write("raport", add, meeting=os.path.dirname(os.path.abspath(path)))
+
+    def merge_transcripts(self, updated: list[tuple[str, str]], archived: list[tuple[str, str]]) -> None:
+        """
+        Zapisuje wynik łączenia transkrypcji między zrzutami ekranu w jednej transakcji.
+
+        Args:
+            updated:
+                Pary (ścieżka, nowa treść) plików, do których dołączono kolejne fragmenty.
+            archived:
+                Pary (dotychczasowa ścieżka, ścieżka w archiwum) fragmentów przeniesionych do archiwum.
+        """
+
+        def merge():
+            self._connection.executemany("UPDATE transcripts SET text = ? WHERE path = ?",
+                                         [(text, _normalize(path)) for path, text in updated])
+            self._connection.executemany("UPDATE transcripts SET path = ?, archived = 1 WHERE path = ?",
+                                         [(_normalize(new), _normalize(old)) for old, new in archived])
+
+        meetings = {_file_meeting(path) for path, _ in updated} | {_file_meeting(old) for old, _ in archived}
+        self._write("łączenie transkrypcji", merge, meeting=meetings.pop() if len(meetings) == 1 else None)
+
+    def import_meeting(self, meeting_directory: str) -> None:
+        """
+        Importuje do bazy spotkanie zapisane na dysku: fragmenty audio, zrzuty ekranu, transkrypcje i raporty.
+
+        Spotkanie, które jest już w bazie, jest uzgadniane z plikami: brakujące pliki są dodawane, treść transkrypcji
+        jest odczytywana z dysku, a wpisy plików usuniętych z dysku są usuwane. Naprawia to wpisy pominięte przez
+        nieudany zapis do bazy (np. baza zablokowana przez inny proces).
+
+        Args:
+            meeting_directory:
+                Ścieżka do folderu spotkania.
+        """
+
+        directory = _normalize(meeting_directory)
+        name = os.path.basename(directory)
+
+        def files(folder, extensions=None):
+            if not os.path.isdir(folder):
+                return []
+            with os.scandir(folder) as entries:
+                return [entry.path for entry in entries if entry.is_file()
+                        and not entry.name.endswith((".part", ".tmp"))
+                        and (extensions is None or entry.name.endswith(extensions))]
+
+        transcripts = []
+        for archived, folder in ((0, f"{directory}/txt-{name}"), (1, f"{directory}/txt-{name}/archiwum")):
+            for path in files(folder, ".txt"):
+                try:
+                    with open(path, encoding="utf-8") as file:
+                        transcripts.append((_timestamp(path), _normalize(path), file.read(), archived))
+                except (OSError, UnicodeDecodeError) as err:
+                    log.warning(f"Pominięto transkrypcję {path}: {err}")
+
+        def remove_missing(table, meeting_id, paths):
+            stored = {row[0] for row in self._connection.execute(f"SELECT path FROM {table} WHERE meeting_id = ?", (meeting_id,))}
+            self._connection.executemany(f"DELETE FROM {table} WHERE path = ?", [(path,) for path in stored - paths])
+
+        # Spotkanie spoza bazy bez manifestu (nagrane wcześniejszą wersją aplikacji) jest zakończone
+        state = read_manifest(directory)
+        finished = state is None or state["transcription_finished"]
+
+        def import_files():
+            known = self._connection.execute("SELECT 1 FROM meetings WHERE directory = ?", (directory,)).fetchone()
+            meeting_id = self._meeting_id(directory)
+            if known is None and finished:
+                self._connection.execute("UPDATE meetings SET finished_at = ? WHERE id = ?", (_now(), meeting_id))
+            for table, folder, extensions in (("fragments", f"{directory}/audio-{name}", None),
+                                              ("screenshots", f"{directory}/screenshots-{name}", ".jpg")):
+                rows = [(meeting_id, _timestamp(path), _normalize(path)) for path in files(folder, extensions)]
+                self._connection.executemany(
+                    f"INSERT OR IGNORE INTO {table} (meeting_id, timestamp, path) VALUES (?, ?, ?)", rows)
+                remove_missing(table, meeting_id, {row[2] for row in rows})
+            self._connection.executemany(
+                "INSERT INTO transcripts (meeting_id, timestamp, path, text, archived) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET text = excluded.text, archived = excluded.archived "
+                "WHERE text IS NOT excluded.text OR archived IS NOT excluded.archived",
+                [(meeting_id, *transcript) for transcript in transcripts])
+            remove_missing("transcripts", meeting_id, {transcript[1] for transcript in transcripts})
+            reports = [_normalize(path) for path in files(directory, ".pdf")]
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO reports (meeting_id, path, created_at) VALUES (?, ?, ?)",
+                [(meeting_id, path, _now()) for path in reports])
+            remove_missing("reports", meeting_id, set(reports))
+
+        with self._lock:
+            # Zapis nieudany w trakcie importu ponownie oznaczy spotkanie
+            self._dirty.discard(directory)
+        if self._write("import spotkania", import_files, meeting=directory):
+            log.debug(f"Uzgodniono spotkanie w bazie z plikami: {name}")
+
+    def mark_dirty(self, meeting_directory: str) -> None:
+        """
+        Oznacza spotkanie jako nieuzgodnione z plikami (np. po awarii aplikacji, w której mogły przepaść zapisy).
+
+        Args:
+            meeting_directory:
+                Ścieżka do folderu spotkania.
+        """
+
+        with self._lock:
+            self._dirty.add(_normalize(meeting_directory))
+
+    def ensure_meeting(self, meeting_directory: str) -> None:
+        """
+        Importuje spotkanie, którego nie ma w bazie, lub uzgadnia z plikami spotkanie, którego zapis się nie powiódł.
+
+        Wywoływane przed odczytem plików spotkania z bazy (raport PDF, łączenie transkrypcji), aby pliki zapisane
+        na dysku, ale pominięte przez nieudany zapis do bazy, nie zostały pominięte. Spotkanie bez nieudanych
+        zapisów jest odczytywane z bazy bez przeglądania folderów.
+
+        Args:
+            meeting_directory:
+                Ścieżka do folderu spotkania.
+        """
+
+        directory = _normalize(meeting_directory)
+        with self._lock:
+            dirty = directory in self._dirty
+            known = self._connection.execute("SELECT 1 FROM meetings WHERE directory = ?", (directory,)).fetchone() is not None
+        if dirty or not known:
+            self.import_meeting(directory)
+
+    def sync_meetings(self, meetings_folder: str) -> None:
+        """
+        Importuje spotkania z folderu `spotkania`, których nie ma jeszcze w bazie.
+
+        Args:
+            meetings_folder:
+                Ścieżka do folderu ze spotkaniami.
+        """
+
+        if not os.path.isdir(meetings_folder):
+            return
+        with self._lock:
+            known = {row[0] for row in self._connection.execute("SELECT directory FROM meetings")}
+        with os.scandir(meetings_folder) as entries:
+            new = [entry.path for entry in entries if entry.is_dir() and _normalize(entry.path) not in known]
+        for directory in sorted(new):
+            self.import_meeting(directory)
+
+    def _query(self, sql: str, parameters: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def list_meetings(self, finished_only: bool = False) -> list[tuple[str, str]]:
+        """
+        Zwraca spotkania posortowane po nazwie (timestampie rozpoczęcia).
+
+        Args:
+            finished_only:
+                True - tylko spotkania z zakończoną transkrypcją (bez spotkań w trakcie nagrywania lub transkrypcji).
+
+        Returns:
+            Lista par (nazwa spotkania, ścieżka do folderu spotkania).
+        """
+
+        condition = " WHERE finished_at IS NOT NULL" if finished_only else ""
+        return self._query(f"SELECT name, directory FROM meetings{condition} ORDER BY name")
+
+    def list_reports(self) -> list[str]:
+        """
+        Zwraca ścieżki do raportów PDF wszystkich spotkań, posortowane po ścieżce.
+
+        Returns:
+            Lista ścieżek do raportów.
+        """
+
+        return [row[0] for row in self._query("SELECT path FROM reports ORDER BY path")]
+
+    def get_transcripts(self, meeting_directory: str) -> list[tuple[str, str, str]]:
+        """
+        Zwraca transkrypcje fragmentów spotkania (bez przeniesionych do archiwum), posortowane po timestampie.
+
+        Args:
+            meeting_directory:
+                Ścieżka do folderu spotkania.
+
+        Returns:
+            Lista krotek (timestamp, ścieżka, treść).
+        """
+
+        return self._query(
+            "SELECT t.timestamp, t.path, t.text FROM transcripts t JOIN meetings m ON m.id = t.meeting_id "
+            "WHERE m.directory = ? AND t.archived = 0 ORDER BY t.timestamp",
+            (_normalize(meeting_directory),))
+
+    def get_screenshots(self, meeting_directory: str) -> list[tuple[str, str]]:
+        """
+        Zwraca zrzuty ekranu spotkania posortowane po timestampie.
+
+        Args:
+            meeting_directory:
+                Ścieżka do folderu spotkania.
+
+        Returns:
+            Lista par (timestamp, ścieżka).
+        """
+
+        return self._query(
+            "SELECT s.timestamp, s.path FROM screenshots s JOIN meetings m ON m.id = s.meeting_id "
+            "WHERE m.directory = ? ORDER BY s.timestamp",
+            (_normalize(meeting_directory),))
+
+    def get_report_items(self, meeting_directory: str) -> list[tuple[str, str, str, str | None]]:
+        """
+        Zwraca zrzuty ekranu i transkrypcje spotkania w kolejności raportu (po timestampie, zrzut przed transkrypcją).
+
+        Args:
+            meeting_directory:
+                Ścieżka do folderu spotkania.
+
+        Returns:
+            Lista krotek (rodzaj: "screenshot" | "transcript", timestamp, ścieżka, treść transkrypcji | None).
+        """
+
+        return self._query(
+            "SELECT kind, timestamp, path, text FROM ("
+            "  SELECT 'screenshot' AS kind, 0 AS position, s.timestamp, s.path, NULL AS text"
+            "  FROM screenshots s JOIN meetings m ON m.id = s.meeting_id WHERE m.directory = ?"
+            "  UNION ALL"
+            "  SELECT 'transcript', 1, t.timestamp, t.path, t.text"
+            "  FROM transcripts t JOIN meetings m ON m.id = t.meeting_id WHERE m.directory = ? AND t.archived = 0"
+            ") ORDER BY timestamp, position",
+            (_normalize(meeting_directory), _normalize(meeting_directory)))
+
+    def search(self, query: str, limit: int = 20) -> list[dict]:
+        """
+        Wyszukuje transkrypcje wszystkich spotkań zawierające podane słowa.
+
+        Każde słowo zapytania musi wystąpić w transkrypcji; słowa od PREFIX_MIN_LENGTH liter również jako początek
+        dłuższego słowa (np. "budż" znajdzie "budżetu"). Wielkość liter i polskie znaki diakrytyczne nie mają znaczenia.
+        Słowa funkcyjne (STOP_WORDS) są pomijane - zapytanie złożone wyłącznie z nich nie zwraca wyników
+        (`search_words`). Wyniki są sortowane według trafności (BM25) spośród wszystkich dopasowań.
+
+        Args:
+            query:
+                Słowa do wyszukania.
+            limit:
+                Maksymalna liczba wyników.
+
+        Returns:
+            Lista słowników z nazwą ("meeting") i folderem ("directory") spotkania, timestampem ("timestamp")
+            i ścieżką ("path") fragmentu, fragmentem tekstu z zaznaczonymi słowami ("snippet") oraz ścieżką
+            do zrzutu ekranu widocznego w chwili rozpoczęcia fragmentu ("screenshot", None jeśli spotkanie nie ma zrzutów).
+        """
+
+        words = search_words(query)
+        if not words or not self.search_available:
+            return []
+        # Krótkie słowa tylko w całości: jako początek słowa pasowałyby do większości transkrypcji
+        match = " ".join(f'"{word}"*' if len(word) >= PREFIX_MIN_LENGTH else f'"{word}"' for word in words)
+
+        rows = self._query(
+            "SELECT m.name, m.directory, t.timestamp, t.path, hits.snippet, "
+            "  COALESCE("
+            "    (SELECT s.path FROM screenshots s WHERE s.meeting_id = t.meeting_id AND s.timestamp <= t.timestamp"
+            "     ORDER BY s.timestamp DESC LIMIT 1),"
+            "    (SELECT s.path FROM screenshots s WHERE s.meeting_id = t.meeting_id ORDER BY s.timestamp LIMIT 1))"
+            " FROM ("
+            "   SELECT rowid, rank, snippet(transcripts_fts, 0, '[', ']', '…', 12) AS snippet FROM transcripts_fts"
+            "   WHERE transcripts_fts MATCH ? ORDER BY rank LIMIT ?"
+            " ) AS hits JOIN transcripts t ON t.id = hits.rowid JOIN meetings m ON m.id = t.meeting_id"
+            " ORDER BY hits.rank",
+            (match, limit))
+
+        keys = ("meeting", "directory", "timestamp", "path", "snippet", "screenshot")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def close(self) -> None:
+        """Zamyka połączenie z bazą."""
+
+        with self._lock:
+            self._connection.close()
+
+
+def search_words(query: str) -> list[str]:
+    """
+    Zwraca słowa zapytania wyszukiwane w transkrypcjach, z pominięciem słów funkcyjnych (STOP_WORDS).
+
+    Args:
+        query:
+            Zapytanie wyszukiwania.
+
+    Returns:
+        Lista słów | pusta lista, jeśli zapytanie zawiera wyłącznie słowa funkcyjne.
+    """
+
+    return [word for word in re.findall(r"\w+", query) if word.lower() not in STOP_WORDS]
+
+
+def get_meeting_store() -> MeetingStore:
+    """
+    Zwraca współdzieloną instancję bazy spotkań, tworząc ją przy pierwszym wywołaniu.
+
+    Returns:
+        Baza spotkań w pliku KNZS_MEETING_DB lub spotkania/spotkania.db w katalogu roboczym.
+    """
+
+    global _meeting_store
+    with _meeting_store_lock:
+        if _meeting_store is None:
+            path = MEETING_DB_PATH or os.path.join(os.getcwd(), "spotkania", "spotkania.db")
+            _meeting_store = MeetingStore(path)
+            log.debug(f"Baza spotkań: {path}")
+        return _meeting_store
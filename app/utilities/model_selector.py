@@ -0,0 +1,113 @@
+# app/utilities/model_selector.py
+
+"""Moduł adaptacyjnego wyboru modelu transkrypcji
+
+Skrypt dobiera rozmiar modelu Whisper do bieżącego obciążenia transkrypcji. Po każdym fragmencie przekazywany jest
+współczynnik czasu rzeczywistego (RTF - czas transkrypcji / długość fragmentu) oraz liczba fragmentów oczekujących
+na transkrypcję. Gdy zaległości przekraczają próg, wybierany jest mniejszy model (medium -> small -> base -> tiny);
+gdy transkrypcja nadrobi zaległości i działa wyraźnie szybciej niż w czasie rzeczywistym, model jest przywracany
+o jeden stopień w górę, co najwyżej do modelu z konfiguracji.
+
+Wymagane zależności
+
+Aby uruchomić skrypt, należy zainstalować następujące pakiety w środowisku Python:
+
+    - loguru: Rozbudowany system logowania
+
+Skrypt może być używany jako moduł i zawiera następującą klasę:
+
+    * AdaptiveModelSelector - wybór modelu na podstawie RTF i liczby zaległych fragmentów.
+"""
+
+from loguru import logger as log
+
+# Modele uporządkowane od najszybszego do najdokładniejszego
+MODEL_LADDER = ("tiny", "base", "small", "medium")
+
+
+class AdaptiveModelSelector:
+    """
+    Dobiera model Whisper na podstawie współczynnika czasu rzeczywistego i liczby zaległych fragmentów.
+
+    Args:
+        max_model:
+            Największy dopuszczalny model, od którego rozpoczyna się transkrypcja.
+        downgrade_backlog:
+            Liczba zaległych fragmentów, powyżej której wybierany jest mniejszy model.
+        upgrade_rtf:
+            Średni RTF, poniżej którego (przy braku zaległości) model jest przywracany o stopień w górę.
+        cooldown:
+            Minimalna liczba fragmentów między kolejnymi zmianami modelu.
+        smoothing:
+            Waga najnowszego pomiaru w średniej wykładniczej RTF.
+    """
+
+    def __init__(self, max_model: str = "medium", downgrade_backlog: int = 3, upgrade_rtf: float = 0.5, cooldown: int = 3, smoothing: float = 0.3):
+        self.ladder = MODEL_LADDER[:MODEL_LADDER.index(max_model) + 1] if max_model in MODEL_LADDER else (max_model,)
+        self.level = len(self.ladder) - 1
+        self.downgrade_backlog = downgrade_backlog
+        self.upgrade_rtf = upgrade_rtf
+        self.cooldown = cooldown
+        self.smoothing = smoothing
+
+        self.mean_rtf = None
+        self._since_change = 0
+        self._stats = {"fragments": 0, "downgrades": 0, "upgrades": 0, "max_rtf": 0.0, "max_backlog": 0}
+
+    @property
+    def current(self) -> str:
+        """Nazwa modelu, którym należy transkrybować kolejny fragment."""
+        return self.ladder[self.level]
+
+    def update(self, rtf: float, backlog: int) -> str:
+        """
+        Uwzględnia pomiar z ukończonego fragmentu i zwraca model dla kolejnych fragmentów.
+
+        Args:
+            rtf:
+                Współczynnik czasu rzeczywistego ukończonego fragmentu.
+            backlog:
+                Liczba fragmentów oczekujących na transkrypcję.
+
+        Returns:
+            Nazwa modelu dla kolejnych fragmentów.
+        """
+
+        self._stats["fragments"] += 1
+        self._stats["max_rtf"] = max(self._stats["max_rtf"], rtf)
+        self._stats["max_backlog"] = max(self._stats["max_backlog"], backlog)
+        self.mean_rtf = rtf if self.mean_rtf is None else self.smoothing * rtf + (1 - self.smoothing) * self.mean_rtf
+        self._since_change += 1
+
+        if self._since_change < self.cooldown:
+            return self.current
+
+        if backlog > self.downgrade_backlog and self.level > 0:
+            self._change(-1, f"zaległe fragmenty: {backlog}, RTF: {self.mean_rtf:.2f}")
+        elif backlog == 0 and self.mean_rtf < self.upgrade_rtf and self.level < len(self.ladder) - 1:
+            self._change(1, f"brak zaległości, RTF: {self.mean_rtf:.2f}")
+
+        return self.current
+
+    def _change(self, step: int, reason: str) -> None:
+        """Zmienia model o jeden stopień i resetuje średnią RTF, która dotyczyła poprzedniego modelu."""
+
+        previous = self.current
+        self.level += step
+        self._since_change = 0
+        self.mean_rtf = None
+        self._stats["upgrades" if step > 0 else "downgrades"] += 1
+        log.info(f"Zmiana modelu transkrypcji: {previous} -> {self.current} ({reason})")
+
+    def get_stats(self) -> dict:
+        """
+        Zwraca statystyki doboru modelu.
+
+        Returns:
+            Słownik z liczbą fragmentów, liczbą zmian modelu w dół i w górę, maksymalnym RTF,
+            maksymalną liczbą zaległych fragmentów oraz bieżącym modelem.
+        """
+
+        stats = dict(self._stats)
+        stats["model"] = self.current
+        return stats
@@ -4,7 +4,8 @@
 
 Skrypt umożliwia generowanie pliku PDF, który łączy zrzuty ekranu (*.jpg) oraz transkrypcje (*.txt),
 sortując pliki na podstawie timestampów zawartych w nazwach plików. Zrzuty ekranu i transkrypcje są dodawane
-do pliku PDF w odpowiedniej kolejności.
+do pliku PDF w odpowiedniej kolejności, pobieranej jednym zapytaniem z bazy spotkań (moduł app.utilities.meeting_store),
+w której zapisywany jest również wygenerowany raport.
 
 Wymagane zależności
 
@@ -36,6 +37,7 @@ from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfbase import pdfmetrics
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Image, ListFlowable, ListItem
 from app.utilities.api.openai_api import summarize_transcription
+from app.utilities.meeting_store import get_meeting_store
 from textwrap import wrap
 import markdown2
 from reportlab.lib import colors
@@ -57,15 +59,15 @@ def create_horizontal_line(width=450):
     line.add(Line(0, 0, width, 0, strokeWidth=1, strokeColor=colors.black))
     return line
 
-def generate_pdf_from_files(output_pdf, screenshots_folder, transcripts_folder, full_transcription_path):
+def generate_pdf_from_files(output_pdf, screenshots_folder, full_transcription_path):
     """
     Generuje plik PDF na podstawie zrzutów ekranu (*.jpg) i transkrypcji (*.txt),
     sortując pliki według timestampów w nazwach.
 
     Args:
         output_pdf (str): Ścieżka do wyjściowego pliku PDF.
-        screenshots_folder (str): Ścieżka do folderu zawierającego pliki zrzutów ekranu.
-        transcripts_folder (str): Ścieżka do folderu zawierającego pliki transkrypcji.
+        screenshots_folder (str): Ścieżka do folderu zawierającego pliki zrzutów ekranu (w folderze spotkania,
+            które przed zbudowaniem raportu jest uzgadniane w bazie spotkań z plikami na dysku).
         full_transcription_path (str): Ścieżka do pełnej transkrypcji do podsumowania.
     """
     # **Załaduj czcionkę obsługującą polskie znaki**
@@ -139,21 +141,14 @@ def generate_pdf_from_files(output_pdf, screenshots_folder, transcripts_folder,
 
     elements.append(PageBreak())  # Przejście do nowej strony
 
-    # **Dodawanie screenshotów i transkrypcji**
-    screenshots = sorted([f for f in os.listdir(screenshots_folder) if f.endswith('.jpg')])
-    transcripts = sorted([f for f in os.listdir(transcripts_folder) if f.endswith('.txt')])
+    # **Dodawanie screenshotów i transkrypcji** (kolejność według timestampów z bazy spotkań)
+    meeting_directory = os.path.dirname(os.path.normpath(screenshots_folder))
+    store = get_meeting_store()
+    store.ensure_meeting(meeting_directory)
 
-    def extract_timestamp(filename):
-        return tuple(map(int, filename.split('.')[0].split('-')))
-
-    combined = sorted(
-        [(f, 'screenshot') for f in screenshots] + [(f, 'transcript') for f in transcripts],
-        key=lambda x: extract_timestamp(x[0])
-    )
-
-    for filename, file_type in combined:
+    for file_type, timestamp, file_path, text in store.get_report_items(meeting_directory):
+        filename = os.path.basename(file_path)
         if file_type == 'screenshot':
-            file_path = os.path.join(screenshots_folder, filename)
             try:
                 elements.append(Image(file_path, width=400, height=250))
                 elements.append(Spacer(1, 10))
@@ -161,11 +156,7 @@ def generate_pdf_from_files(output_pdf, screenshots_folder, transcripts_folder,
                 print(f"Błąd dodawania obrazu {filename}: {e}")
 
         elif file_type == 'transcript':
-            file_path = os.path.join(transcripts_folder, filename)
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    text = f.read()
-
                 elements.append(Paragraph(text, normal_style))
                 elements.append(Spacer(1, 15))
             except Exception as e:
@@ -173,4 +164,5 @@ def generate_pdf_from_files(output_pdf, screenshots_folder, transcripts_folder,
 
     # **Zapisz dokument**
     doc.build(elements)
+    store.add_report(output_pdf)
     print(f"Raport PDF wygenerowany: {output_pdf}")
\ No newline at end of file
@@ -8,6 +8,9 @@ Wymagane zależności
 
 Do poprawnego działania skryptu nie są wymagane dodatkowe pakiety zewnętrzne poza standardowymi bibliotekami Pythona.
 
+Spotkania i ich pliki są rejestrowane w bazie spotkań (moduł app.utilities.meeting_store), z której korzysta również
+łączenie transkrypcji.
+
 Skrypt może być używany jako moduł i zawiera następujące funkcje:
 
     * create_output_folder — tworzy hierarchię katalogów dla bieżącego spotkania, w tym podfoldery dla nagrań audio, transkrypcji i zrzutów ekranu.
@@ -18,8 +21,8 @@ Każda funkcja posiada odpowiednie mechanizmy obsługi błędów, sortowania pli
 
 from datetime import datetime
 import os
-import glob
 from typing import List, Any
+from app.utilities.meeting_store import get_meeting_store
 
 def create_output_folder() -> list[str]:
     """Tworzy foldery wynikowe na zapisywane pliki .jpg, .txt i .mp3
@@ -55,6 +58,8 @@ def create_output_folder() -> list[str]:
     screenshots_directory = os.path.join(meeting_directory, f"screenshots-{timestamp}")
     os.makedirs(screenshots_directory, exist_ok=True)
 
+    get_meeting_store().add_meeting(meeting_directory)
+
     output_list = [meeting_directory.replace("\\", "/"), recording_directory.replace("\\", "/"), screenshots_directory.replace("\\", "/"), transcription_directory.replace("\\", "/")]
 
     return output_list
@@ -63,52 +68,57 @@ def txt_files_aggregation(meeting_folder: str) -> None:
     """
     Funkcja łączy poszczególne fragmenty transkrypcji między screenami ekranu w większą całość.
 
-    Funkcja buduje listę ścieżek do txt i jpg. Sortuje ją po timestampie. Następnie łączy pliki transkrypcji,
-    która była między poszczególnymi momentami wykonania zrzutów ekranu w jeden plik txt, który nosi nazwę
-    najwcześniejszego timestampu audio z grupy.
+    Funkcja pobiera z bazy spotkań dwie listy posortowane po timestampie - transkrypcji i zrzutów ekranu - i przechodzi
+    je jednokrotnie, równolegle (merge-join). Transkrypcje, które były między poszczególnymi momentami wykonania zrzutów ekranu,
+    łączy w jeden plik txt, który nosi nazwę najwcześniejszego timestampu audio z grupy. Tekst grupy jest składany
+    w pamięci, a plik wynikowy zapisywany raz na grupę.
 
     Notes:
-        Stare pliki funkcja przenosi do folderu archiwum w folderze z transkrypcjami (timestamp/txt-timestamp/archiwum).
+        Stare pliki funkcja przenosi do folderu archiwum w folderze z transkrypcjami (timestamp/txt-timestamp/archiwum),
+        wszystkie naraz, po zapisaniu plików grup. Zrzut ekranu o tym samym timestampie co fragment transkrypcji
+        zamyka grupę po tym fragmencie.
 
     Arguments:
         meeting_folder:
             ścieżka do folderu głównego spotkania
     """
 
-    timestamp = (meeting_folder.replace("\\", "/")).rsplit("/", 1)[1]
-    txt_pattern = meeting_folder + f"/txt-{timestamp}/*.txt"
-    screenshots_pattern = meeting_folder + f"/screenshots-{timestamp}/*.jpg"
-
+    meeting_folder = meeting_folder.replace("\\", "/").rstrip("/")
+    timestamp = meeting_folder.rsplit("/", 1)[1]
     archiwum_path = meeting_folder + f"/txt-{timestamp}/archiwum"
     os.makedirs(archiwum_path, exist_ok=True)
 
-    txt_files = glob.glob(txt_pattern)
-    jpg_files = glob.glob(screenshots_pattern)
-
-    files = txt_files + jpg_files
-
-    print("Posortowane pliki, patrz na timestamp(nazwe pliku jpg lub txt)")
-    files.sort(key= lambda f: ((f.replace("\\", "/")).rsplit("/", 1)[1]).rsplit(".", 1)[0])
-    for file in files:
-        print(file)
-
-    done_files = []
-    temp_done_list = []
-    for file in files:
-        if file not in done_files:
-            ext = file.rsplit(".",1)[1]
-            filename = ((file.rsplit(".",1)[0]).replace("\\", "/")).rsplit("/", 1)[1]
-
-            if ext == "txt":
-                if temp_done_list == []:
-                    temp_done_list.append(file)
-                else:
-                    with open(file, 'r', encoding='utf-8') as f:
-                        text = f.read()
-                    with open(temp_done_list[0], 'a', encoding='utf-8') as f:
-                        f.write(text, )
-                    done_files.append(file)
-
-                    os.rename(file, f"{file.replace('\\', '/').rsplit('/', 1)[0]}/archiwum/{filename}.{ext}")
-            elif ext == "jpg":
-                temp_done_list = []
+    store = get_meeting_store()
+    store.ensure_meeting(meeting_folder)
+    txt_files = store.get_transcripts(meeting_folder)
+    jpg_stems = [stem for stem, _ in store.get_screenshots(meeting_folder)]
+
+    groups = []
+    jpg_index = 0
+    for stem, path, text in txt_files:
+        # Zrzut ekranu między poprzednim a bieżącym fragmentem rozpoczyna nową grupę
+        new_group = not groups
+        while jpg_index < len(jpg_stems) and jpg_stems[jpg_index] < stem:
+            jpg_index += 1
+            new_group = True
+        if new_group:
+            groups.append([(path, text)])
+        else:
+            groups[-1].append((path, text))
+
+    updated = []
+    archived = []
+    for (head, head_text), *rest in groups:
+        if not rest:
+            continue
+        appended = "".join(text for _, text in rest)
+        with open(head, 'a', encoding='utf-8') as f:
+            f.write(appended)
+        updated.append((head, head_text + appended))
+        archived.extend((path, f"{archiwum_path}/{path.rsplit('/', 1)[1]}") for path, _ in rest)
+
+    for path, archive_path in archived:
+        os.replace(path, archive_path)
+    store.merge_transcripts(updated, archived)
+
+    print(f"Połączono {len(txt_files)} plików transkrypcji w {len(groups)} grup(y) między {len(jpg_stems)} zrzutami ekranu")
@@ -18,13 +18,26 @@ Ten plik może zostać zaimportowany również jako moduł i zawiera następują
 
     * save_text_to_txt - zapis przetranskrybowanego tekstu do pliku .txt
     * format_text - formatowanie zawartości pliku tekstowego zgodnie z podaną maksymalną szerokością linii
+    * wrap_text - zawijanie tekstu do podanej szerokości linii w pamięci
+    * TranscriptWriter - zapis transkrypcji fragmentów sesji przez otwarty plik pełnej transkrypcji
 
+Sesje transkrypcji korzystają z `TranscriptWriter`: tekst fragmentu jest zawijany w pamięci i zapisywany jednym
+wywołaniem przez plik tymczasowy i zmianę nazwy (plik fragmentu nigdy nie jest widoczny w niepełnej postaci),
+a pełna transkrypcja jest dopisywana przez uchwyt otwarty przez całą sesję. Zapis na dysk (fsync) pełnej
+transkrypcji wykonywany jest co KNZS_TRANSCRIPT_FSYNC_EVERY fragmentów (0 - tylko przy zamknięciu).
+
+Transkrypcje fragmentów spotkań (zapisywane w folderze txt-timestamp) są dodawane wraz z treścią do bazy spotkań
+(moduł app.utilities.meeting_store).
 """
 
 import os
 from loguru import logger as log
 from typing import Callable
 from app.utilities.logger import log_status
+from app.utilities.meeting_store import get_meeting_store
+
+# Liczba fragmentów między kolejnymi zapisami pełnej transkrypcji na dysk (fsync), 0 - tylko przy zamknięciu
+TRANSCRIPT_FSYNC_EVERY = int(os.environ.get("KNZS_TRANSCRIPT_FSYNC_EVERY", "5"))
 
 def save_text_to_txt(filename: str, transcribed_text: str, update_status: Callable[[str], None], transcription_folder: str | None = None) -> str | None:
     """
@@ -62,6 +75,8 @@ def save_text_to_txt(filename: str, transcribed_text: str, update_status: Callab
         format_text(txt_path, 80)
 
         if transcription_folder is not None:
+            with open(txt_path, 'r', encoding='utf-8') as file:
+                get_meeting_store().add_transcript(txt_path, file.read())
             with open(full_transcript_path, 'a', encoding='utf-8') as file:
                 file.write(transcribed_text, )
             log_status(f"Dokonano zapisu txt (pelna transkrypcja): {txt_path.rsplit("/",1)[1]}", "success", update_status)
@@ -87,22 +102,119 @@ def format_text(txt_path: str, line_width: int = 80) -> None:
         text = f.read()
 
     with open(txt_path, "w", encoding="utf-8") as f:
+        f.write(wrap_text(text, line_width))
+
+def wrap_text(text: str, line_width: int = 80) -> str:
+    """
+    Zawija tekst do podanej szerokości linii (jak `format_text`, ale bez operacji na pliku).
+
+    Arguments:
+        text:
+            Tekst do zawinięcia.
+        line_width:
+            Maksymalna szerokość linii w znakach.
+
+    Returns:
+        Tekst podzielony na linie zakończone znakiem nowej linii.
+    """
+
+    output = []
+    for line in text.splitlines():  # Podział na linie wejściowe
+        line_buffer = ""
 
-        lines = text.splitlines()  # Podział na linie wejściowe
+        for word in line.split():  # Podział linii na słowa
+            # Sprawdzanie, czy bieżąca linia mieści kolejne słowo
+            if len(line_buffer) + len(word) + 1 <= line_width:
+                line_buffer += (word + " ")
+            else:
+                output.append(line_buffer.strip() + "\n")
+                line_buffer = word + " "
 
-        for line in lines:
-            words = line.split()  # Podział linii na słowa
-            line_buffer = ""
+        # Pozostałość linii (jeśli istnieje)
+        if line_buffer:
+            output.append(line_buffer.strip() + "\n")
 
-            for word in words:
-                # Sprawdzanie, czy bieżąca linia mieści kolejne słowo
-                if len(line_buffer) + len(word) + 1 <= line_width:
-                    line_buffer += (word + " ")
-                else:
-                    # Zapis linii do pliku
-                    f.write(line_buffer.strip() + "\n")
-                    line_buffer = word + " "
+    return "".join(output)
+
+
+class TranscriptWriter:
+    """
+    Zapisuje transkrypcje fragmentów sesji do plików .txt fragmentów oraz do pliku pełnej transkrypcji.
+
+    Tekst fragmentu jest zawijany w pamięci i zapisywany jednym wywołaniem do pliku tymczasowego, któremu następnie
+    nadawana jest docelowa nazwa. Plik pełnej transkrypcji pozostaje otwarty do zamknięcia sesji; każdy fragment
+    trafia do niego jednym zapisem, a fsync wykonywany jest co `fsync_every` fragmentów.
+
+    Args:
+        transcription_folder:
+            Ścieżka do folderu na transkrypcje fragmentów nagrania (txt-timestamp).
+        update_status:
+            Funkcja aktualizująca wiadomości statusu w aplikacji GUI.
+        line_width:
+            Maksymalna szerokość linii w plikach fragmentów.
+        fsync_every:
+            Liczba fragmentów między kolejnymi fsync pełnej transkrypcji (0 - tylko przy zamknięciu).
+    """
 
-            # Zapis pozostałości linii (jeśli istnieje)
-            if line_buffer:
-                f.write(line_buffer.strip() + "\n")
\ No newline at end of file
+    def __init__(self, transcription_folder: str, update_status: Callable[[str], None], line_width: int = 80, fsync_every: int = TRANSCRIPT_FSYNC_EVERY):
+        self.transcription_folder = transcription_folder.replace("\\", "/")
+        self.update_status = update_status
+        self.line_width = line_width
+        self.fsync_every = fsync_every
+
+        base_path, timestamp = self.transcription_folder.rsplit("/txt-", 1)
+        self.full_transcript_path = base_path + "/" + f"full-{timestamp}.txt"
+        os.makedirs(self.transcription_folder, exist_ok=True)
+        self._full_file = open(self.full_transcript_path, "a", encoding="utf-8")
+        self._unsynced = 0
+
+    def write(self, filename: str, transcribed_text: str) -> str | None:
+        """
+        Zapisuje transkrypcję fragmentu.
+
+        Args:
+            filename:
+                Nazwa fragmentu (nazwa pliku txt bez rozszerzenia).
+            transcribed_text:
+                Przetranskrybowany tekst fragmentu.
+
+        Returns:
+            Ścieżka do zapisanego pliku txt fragmentu | None w razie błędu.
+        """
+
+        txt_path = f"{self.transcription_folder}/{filename}.txt"
+        temporary_path = txt_path + ".tmp"
+        try:
+            wrapped_text = wrap_text(transcribed_text, self.line_width)
+            with open(temporary_path, "w", encoding="utf-8") as file:
+                file.write(wrapped_text)
+            os.replace(temporary_path, txt_path)
+            get_meeting_store().add_transcript(txt_path, wrapped_text)
+            log_status(f"Dokonano zapisu txt: {filename}.txt", "success", self.update_status)
+
+            self._full_file.write(transcribed_text)
+            self._full_file.flush()
+            self._unsynced += 1
+            if self.fsync_every and self._unsynced >= self.fsync_every:
+                self._sync()
+            log_status(f"Dokonano zapisu txt (pelna transkrypcja): {filename}.txt", "success", self.update_status)
+
+            return txt_path
+        except Exception as err:
+            log_status(f"Wystąpił problem w czasie zapisu do pliku txt: {err}", "error", self.update_status)
+            return None
+
+    def _sync(self) -> None:
+        """Zapisuje pełną transkrypcję na dysk."""
+        os.fsync(self._full_file.fileno())
+        self._unsynced = 0
+
+    def close(self) -> None:
+        """Zapisuje pełną transkrypcję na dysk i zamyka jej plik."""
+
+        if self._full_file.closed:
+            return
+        self._full_file.flush()
+        if self._unsynced:
+            self._sync()
+        self._full_file.close()
\ No newline at end of file
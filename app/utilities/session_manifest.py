@@ -0,0 +1,163 @@
+# app/utilities/session_manifest.py
+
+"""Moduł manifestu sesji nagrania
+
+Skrypt prowadzi w folderze spotkania manifest sesji - plik JSON Lines, do którego dopisywane są kolejne zdarzenia:
+rozpoczęcie sesji, zapis fragmentu audio, zapis zrzutu ekranu, zapis transkrypcji fragmentu, koniec nagrywania
+i koniec transkrypcji. Każdy wpis jest zapisywany na dysk (fsync) przed kontynuacją, więc po awarii aplikacji
+manifest opisuje stan spotkania do ostatniego zakończonego kroku. Niepełny ostatni wiersz (przerwany zapis) jest
+pomijany przy odczycie.
+
+Na podstawie manifestu aplikacja po ponownym uruchomieniu wykrywa niedokończone spotkania w folderze `spotkania`
+i wznawia transkrypcję wyłącznie fragmentów, które nie zostały jeszcze przetranskrybowane.
+
+Wymagane zależności
+
+Aby uruchomić skrypt, należy zainstalować następujące pakiety w środowisku Python:
+
+    - loguru: Rozbudowany system logowania
+
+Skrypt może być używany jako moduł i zawiera następujące elementy:
+
+    * SessionManifest - dopisywanie zdarzeń sesji do manifestu spotkania.
+    * read_manifest - odczyt stanu spotkania z manifestu.
+    * find_unfinished_meetings - wyszukiwanie spotkań z niedokończoną transkrypcją.
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+from loguru import logger as log
+
+MANIFEST_FILENAME = "manifest.jsonl"
+
+# Zdarzenia zapisywane w manifeście
+SESSION_STARTED = "session_started"
+FRAGMENT_RECORDED = "fragment_recorded"
+SCREENSHOT_SAVED = "screenshot_saved"
+FRAGMENT_TRANSCRIBED = "fragment_transcribed"
+RECORDING_FINISHED = "recording_finished"
+TRANSCRIPTION_FINISHED = "transcription_finished"
+
+
+class SessionManifest:
+    """
+    Dopisuje zdarzenia sesji do manifestu w folderze spotkania.
+
+    Plik jest otwierany raz, w trybie dopisywania, a każdy wpis jest zapisywany na dysk przed powrotem z `record`.
+    Z manifestu mogą korzystać równolegle wątki nagrywania, zrzutów ekranu i transkrypcji.
+
+    Args:
+        meeting_directory:
+            Ścieżka do folderu spotkania.
+    """
+
+    def __init__(self, meeting_directory: str):
+        self.meeting_directory = meeting_directory
+        self.path = os.path.join(meeting_directory, MANIFEST_FILENAME)
+        self._lock = threading.Lock()
+
+        # Wiersz przerwany przez awarię jest zamykany, aby nie połączył się z kolejnym wpisem
+        with open(self.path, "ab+") as file:
+            if file.tell() > 0:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    file.write(b"\n")
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def record(self, event: str, name: str | None = None) -> None:
+        """
+        Dopisuje zdarzenie do manifestu.
+
+        Args:
+            event:
+                Rodzaj zdarzenia (np. FRAGMENT_RECORDED).
+            name:
+                Nazwa pliku, którego dotyczy zdarzenie (bez ścieżki).
+        """
+
+        entry = {"event": event, "time": datetime.now().isoformat(timespec="seconds")}
+        if name is not None:
+            entry["name"] = name
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+
+        with self._lock:
+            if self._file.closed:
+                return
+            try:
+                self._file.write(line)
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            except OSError as err:
+                log.error(f"Błąd zapisu manifestu sesji: {err}")
+
+    def close(self) -> None:
+        """Zamyka plik manifestu."""
+
+        with self._lock:
+            self._file.close()
+
+
+def read_manifest(meeting_directory: str) -> dict | None:
+    """
+    Odczytuje stan spotkania z manifestu.
+
+    Args:
+        meeting_directory:
+            Ścieżka do folderu spotkania.
+
+    Returns:
+        Słownik z listami nazw nagranych fragmentów ("fragments"), zrzutów ekranu ("screenshots")
+        i przetranskrybowanych fragmentów ("transcribed") oraz flagami "recording_finished"
+        i "transcription_finished" | None, jeśli spotkanie nie ma manifestu.
+    """
+
+    path = os.path.join(meeting_directory, MANIFEST_FILENAME)
+    if not os.path.exists(path):
+        return None
+
+    state = {"fragments": [], "screenshots": [], "transcribed": [], "recording_finished": False, "transcription_finished": False}
+    lists = {FRAGMENT_RECORDED: "fragments", SCREENSHOT_SAVED: "screenshots", FRAGMENT_TRANSCRIBED: "transcribed"}
+
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Wiersz przerwany przez awarię w trakcie zapisu
+                continue
+            event = entry.get("event")
+            if event in lists:
+                state[lists[event]].append(entry.get("name"))
+            elif event == RECORDING_FINISHED:
+                state["recording_finished"] = True
+            elif event == TRANSCRIPTION_FINISHED:
+                state["transcription_finished"] = True
+
+    return state
+
+
+def find_unfinished_meetings(meetings_folder: str) -> list[str]:
+    """
+    Wyszukuje spotkania, których transkrypcja nie została zakończona.
+
+    Args:
+        meetings_folder:
+            Ścieżka do folderu ze spotkaniami (`spotkania`).
+
+    Returns:
+        Posortowana lista ścieżek do folderów spotkań z manifestem bez zdarzenia końca transkrypcji.
+    """
+
+    if not os.path.isdir(meetings_folder):
+        return []
+
+    unfinished = []
+    for entry in sorted(os.scandir(meetings_folder), key=lambda e: e.name):
+        if not entry.is_dir():
+            continue
+        state = read_manifest(entry.path)
+        if state is not None and not state["transcription_finished"]:
+            unfinished.append(entry.path.replace("\\", "/"))
+    return unfinished
@@ -0,0 +1,173 @@
+# app/utilities/transcription_cache.py
+
+"""Moduł pamięci podręcznej transkrypcji na dysku
+
+Skrypt przechowuje wyniki transkrypcji fragmentów na dysku, w kluczu wyznaczonym przez skrót SHA-256 zdekodowanych
+próbek audio oraz parametrów transkrypcji (silnik, model, precyzja, opcje dekodowania). Ponowna transkrypcja
+tego samego fragmentu - np. po awarii lub przy ponownym przetwarzaniu folderu z archiwum - zwraca wynik od razu,
+bez ładowania modelu.
+
+Rozmiar pamięci podręcznej jest ograniczony: po przekroczeniu limitu usuwane są wpisy najdawniej używane (LRU),
+a czas użycia wpisu to czas modyfikacji jego pliku, odświeżany przy każdym trafieniu.
+
+Wymagane zależności
+
+Aby uruchomić skrypt, należy zainstalować następujące pakiety w środowisku Python:
+
+    - numpy: Próbki audio, z których wyznaczany jest klucz
+    - loguru: Rozbudowany system logowania
+
+Skrypt może być używany jako moduł i zawiera następującą klasę:
+
+    * TranscriptionCache - pamięć podręczna wyników transkrypcji z ograniczeniem rozmiaru (LRU).
+"""
+
+import os
+import json
+import hashlib
+import threading
+import numpy as np
+from loguru import logger as log
+
+
+class TranscriptionCache:
+    """
+    Pamięć podręczna wyników transkrypcji na dysku, z usuwaniem najdawniej używanych wpisów.
+
+    Każdy wpis to plik JSON o nazwie równej kluczowi. Zapis odbywa się przez plik tymczasowy i `os.replace`,
+    więc z jednego katalogu mogą korzystać równolegle procesy puli transkrypcji.
+
+    Args:
+        directory:
+            Katalog pamięci podręcznej.
+        max_mb:
+            Maksymalny łączny rozmiar wpisów w megabajtach.
+    """
+
+    def __init__(self, directory: str, max_mb: float = 200.0):
+        self.directory = directory
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(entry.stat().st_size for entry in os.scandir(directory) if entry.name.endswith(".json"))
+
+    @staticmethod
+    def make_key(audio: np.ndarray, engine: str, model_name: str, dtype: str, options: dict) -> str:
+        """
+        Wyznacza klucz wpisu: skrót SHA-256 próbek audio i parametrów transkrypcji.
+
+        Args:
+            audio:
+                Próbki audio float32, 16 kHz, mono.
+            engine:
+                Nazwa silnika transkrypcji.
+            model_name:
+                Nazwa modelu.
+            dtype:
+                Precyzja obliczeń modelu.
+            options:
+                Opcje dekodowania przekazywane do silnika.
+
+        Returns:
+            Klucz w postaci szesnastkowej.
+        """
+
+        digest = hashlib.sha256(np.ascontiguousarray(audio, dtype=np.float32).tobytes())
+        digest.update(json.dumps([engine, model_name, dtype, options], sort_keys=True, default=str).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> dict | None:
+        """
+        Zwraca zapisany wynik transkrypcji lub None, jeśli wpisu nie ma.
+
+        Args:
+            key:
+                Klucz wyznaczony przez `make_key`.
+        """
+
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as file:
+                result = json.load(file)
+            # Odświeżenie czasu użycia wpisu (kolejność LRU)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+
+        with self._lock:
+            self._stats["hits"] += 1
+        return result
+
+    def put(self, key: str, result: dict) -> None:
+        """
+        Zapisuje wynik transkrypcji i usuwa najdawniej używane wpisy, jeśli przekroczono limit rozmiaru.
+
+        Args:
+            key:
+                Klucz wyznaczony przez `make_key`.
+            result:
+                Wynik transkrypcji (wartości muszą dać się zapisać w JSON).
+        """
+
+        path = self._path(key)
+        data = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temporary_path, "wb") as file:
+                file.write(data)
+            previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(temporary_path, path)
+        except OSError as err:
+            log.warning(f"Nie udało się zapisać transkrypcji w pamięci podręcznej: {err}")
+            return
+
+        with self._lock:
+            self._stats["stores"] += 1
+            self._size += len(data) - previous_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Usuwa najdawniej używane wpisy, aż łączny rozmiar spadnie do 90% limitu."""
+
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+
+        self._size = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in entries:
+            if self._size <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._size -= size
+            self._stats["evictions"] += 1
+
+    def get_stats(self) -> dict:
+        """
+        Zwraca metryki pamięci podręcznej.
+
+        Returns:
+            Słownik z liczbą trafień, chybień, zapisów i usuniętych wpisów, współczynnikiem trafień
+            oraz łącznym rozmiarem wpisów w megabajtach.
+        """
+
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size_mb"] = self._size / (1024 * 1024)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
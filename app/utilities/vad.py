@@ -0,0 +1,204 @@
+# app/utilities/vad.py
+
+"""Moduł wykrywania mowy (VAD) i podziału nagrania na fragmenty w przerwach wypowiedzi
+
+Skrypt klasyfikuje ramki surowego PCM (s16le) jako mowę lub ciszę na podstawie energii i liczby przejść przez zero
+(ZCR), obliczanych wektorowo w NumPy dla wszystkich ramek odczytanego bloku naraz. Na tej podstawie `VadSegmenter`
+tnie strumień na fragmenty w przerwach między wypowiedziami, w granicach minimalnej i maksymalnej długości fragmentu.
+Fragmenty zawierające wyłącznie ciszę są oznaczane, aby nie trafiały do zapisu ani do transkrypcji.
+
+Próg energii dostosowuje się do poziomu szumu tła: ramka jest mową, jeśli jej energia przekracza zarówno próg
+bezwzględny, jak i poziom szumu o zadany margines. Ramki o niskiej energii i wysokim ZCR (szum) nie są traktowane
+jako mowa.
+
+Wymagane zależności
+
+Aby uruchomić skrypt, należy zainstalować następujące pakiety w środowisku Python:
+
+    - numpy: Obliczenia na ramkach audio
+
+Skrypt może być używany jako moduł i zawiera następujące elementy:
+
+    * frame_features - energia (dBFS) i ZCR kolejnych ramek PCM.
+    * VadSegmenter - podział strumienia PCM na fragmenty w przerwach wypowiedzi, z pomijaniem ciszy.
+"""
+
+import numpy as np
+from typing import Callable
+
+# Parametry detekcji mowy
+FRAME_MS = 30
+ENERGY_THRESHOLD_DB = -45.0
+NOISE_MARGIN_DB = 10.0
+NOISY_ZCR = 0.35
+
+
+def frame_features(pcm: memoryview | bytes, frame_samples: int, channels: int = 1) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Oblicza energię i współczynnik przejść przez zero dla kolejnych ramek PCM (s16le).
+
+    Args:
+        pcm:
+            Surowe dane PCM, zawierające całkowitą liczbę ramek.
+        frame_samples:
+            Liczba próbek (na kanał) w ramce.
+        channels:
+            Liczba przeplatanych kanałów.
+
+    Returns:
+        Krotka (energia ramek w dBFS, ZCR ramek w zakresie [0, 1]).
+    """
+
+    samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    frames = samples.reshape(-1, frame_samples)
+
+    energy = 10 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+    zcr = np.mean(np.signbit(frames[:, 1:]) != np.signbit(frames[:, :-1]), axis=1)
+    return energy, zcr
+
+
+class VadSegmenter:
+    """
+    Dzieli strumień PCM na fragmenty w przerwach wypowiedzi.
+
+    Fragment mowy jest zamykany, gdy ma co najmniej `min_seconds` i wystąpiła przerwa trwająca `pause_seconds`,
+    lub gdy osiągnie `max_seconds`. Cisza przed wypowiedzią jest wydzielana jako osobny fragment oznaczony jako cichy
+    (z wyjątkiem krótkiego wyprzedzenia dołączanego do wypowiedzi).
+
+    Dane trafiają do prealokowanego bufora, a odczyt odbywa się bezpośrednio do widoku zwracanego przez `writable`.
+
+    Args:
+        sample_rate:
+            Częstotliwość próbkowania strumienia.
+        channels:
+            Liczba kanałów strumienia.
+        min_seconds:
+            Minimalna długość fragmentu mowy.
+        max_seconds:
+            Maksymalna długość fragmentu.
+        pause_seconds:
+            Długość przerwy, w której można zamknąć fragment mowy.
+        preroll_seconds:
+            Długość ciszy dołączanej przed początkiem wypowiedzi.
+        min_speech_seconds:
+            Minimalna łączna długość mowy, aby fragment nie został uznany za cichy.
+        energy_threshold_db:
+            Bezwzględny próg energii ramki mowy w dBFS.
+        read_chunk_size:
+            Maksymalna liczba bajtów odczytywanych jednorazowo do bufora.
+    """
+
+    def __init__(self, sample_rate: int, channels: int = 1, min_seconds: float = 5.0, max_seconds: float = 20.0, pause_seconds: float = 0.6,
+                 preroll_seconds: float = 0.3, min_speech_seconds: float = 0.3, energy_threshold_db: float = ENERGY_THRESHOLD_DB, read_chunk_size: int = 4096):
+        self.channels = channels
+        self.frame_samples = sample_rate * FRAME_MS // 1000
+        self.frame_bytes = self.frame_samples * channels * 2
+        frames_per_second = 1000 / FRAME_MS
+
+        self.min_bytes = int(min_seconds * frames_per_second) * self.frame_bytes
+        self.max_bytes = int(max_seconds * frames_per_second) * self.frame_bytes
+        self.pause_frames = max(1, int(pause_seconds * frames_per_second))
+        self.preroll_bytes = int(preroll_seconds * frames_per_second) * self.frame_bytes
+        self.min_speech_frames = max(1, int(min_speech_seconds * frames_per_second))
+        self.energy_threshold_db = energy_threshold_db
+        self.read_chunk_size = read_chunk_size
+        self.bytes_per_second = sample_rate * channels * 2
+
+        self._buffer = bytearray(self.max_bytes + self.frame_bytes + read_chunk_size)
+        self._view = memoryview(self._buffer)
+        self._filled = 0
+        self._analyzed = 0
+        self._speech_frames = 0
+        self._trailing_silence = 0
+        self.noise_floor_db = -60.0
+
+        self._stats = {"fragments": 0, "speech_fragments": 0, "silent_fragments": 0, "speech_seconds": 0.0, "silent_seconds": 0.0}
+
+    def writable(self) -> memoryview:
+        """Zwraca widok bufora, do którego należy odczytać kolejne dane."""
+        return self._view[self._filled:self._filled + self.read_chunk_size]
+
+    def commit(self, count: int, on_fragment: Callable[[memoryview, bool], None]) -> None:
+        """
+        Uwzględnia `count` bajtów odczytanych do widoku z `writable` i przekazuje zamknięte fragmenty.
+
+        Args:
+            count:
+                Liczba odczytanych bajtów.
+            on_fragment:
+                Funkcja otrzymująca widok fragmentu oraz informację, czy fragment zawiera wyłącznie ciszę.
+                Widok jest ważny tylko do końca jej wywołania.
+        """
+
+        self._filled += count
+        frames = (self._filled - self._analyzed) // self.frame_bytes
+        if frames == 0:
+            return
+
+        energy, zcr = frame_features(self._view[self._analyzed:self._analyzed + frames * self.frame_bytes], self.frame_samples, self.channels)
+        threshold = max(self.energy_threshold_db, self.noise_floor_db + NOISE_MARGIN_DB)
+        speech = (energy > threshold) & ((zcr < NOISY_ZCR) | (energy > threshold + NOISE_MARGIN_DB))
+
+        silent_energy = energy[~speech]
+        if silent_energy.size:
+            self.noise_floor_db = 0.9 * self.noise_floor_db + 0.1 * float(np.median(silent_energy))
+
+        for is_speech in speech:
+            self._analyzed += self.frame_bytes
+            self._step(bool(is_speech), on_fragment)
+
+    def _step(self, is_speech: bool, on_fragment: Callable[[memoryview, bool], None]) -> None:
+        """Aktualizuje stan po przeanalizowaniu jednej ramki i zamyka fragment, jeśli to możliwe."""
+
+        if is_speech:
+            if self._speech_frames == 0:
+                # Początek wypowiedzi - poprzedzającą ciszę (bez wyprzedzenia) wydzielamy jako cichy fragment
+                silence_end = self._analyzed - self.frame_bytes - self.preroll_bytes
+                if silence_end > 0:
+                    self._cut(silence_end, True, on_fragment)
+            self._speech_frames += 1
+            self._trailing_silence = 0
+        else:
+            self._trailing_silence += 1
+
+        if self._speech_frames == 0:
+            if self._analyzed >= self.max_bytes:
+                self._cut(self._analyzed, True, on_fragment)
+            return
+
+        if self._analyzed >= self.min_bytes and self._trailing_silence >= self.pause_frames:
+            # Cięcie w połowie przerwy, druga połowa rozpoczyna kolejny fragment
+            keep = self._trailing_silence // 2
+            self._cut(self._analyzed - keep * self.frame_bytes, self._speech_frames < self.min_speech_frames, on_fragment)
+        elif self._analyzed >= self.max_bytes:
+            self._cut(self._analyzed, self._speech_frames < self.min_speech_frames, on_fragment)
+
+    def _cut(self, end: int, silent: bool, on_fragment: Callable[[memoryview, bool], None]) -> None:
+        """Przekazuje `end` pierwszych bajtów bufora jako fragment i przesuwa pozostałe dane na początek bufora."""
+
+        on_fragment(self._view[:end], silent)
+
+        seconds = end / self.bytes_per_second
+        self._stats["fragments"] += 1
+        self._stats["silent_fragments" if silent else "speech_fragments"] += 1
+        self._stats["silent_seconds" if silent else "speech_seconds"] += seconds
+
+        remaining = self._filled - end
+        self._view[:remaining] = self._view[end:self._filled]
+        self._filled = remaining
+        self._analyzed -= end
+        self._speech_frames = 0
+        self._trailing_silence = self._analyzed // self.frame_bytes
+
+    def get_stats(self) -> dict:
+        """
+        Zwraca metryki podziału nagrania.
+
+        Returns:
+            Słownik z liczbą fragmentów (wszystkich, z mową i cichych, pominiętych w transkrypcji)
+            oraz łączną długością mowy i ciszy w sekundach.
+        """
+
+        return dict(self._stats)
@@ -0,0 +1,613 @@
+# app/utilities/vector_index.py
+
+"""Moduł wyszukiwania tematycznego w transkrypcjach spotkań
+
+Skrypt zamienia transkrypcje fragmentów spotkań (pliki txt z folderu txt-timestamp) na wektory i pozwala znaleźć
+spotkania o zadanym temacie bez połączenia z siecią. Wektory wyznacza ukryta analiza semantyczna (LSA) dopasowana
+lokalnie do archiwum spotkań: słowa są sprowadzane do małych liter i skracane do pierwszych STEM_LENGTH znaków
+(przybliżenie odmiany polskich wyrazów), pomijane są słowa funkcyjne, a fragment jest opisywany wagami tf-idf słów
+(logarytm liczby wystąpień razy logarytm odwrotności liczby fragmentów archiwum zawierających słowo). Macierz wag
+fragmentów archiwum jest rozkładana obciętym rozkładem SVD (losowy rozkład według Halko i in., numpy.linalg) na
+EMBEDDING_DIM kierunków tematów; wektor fragmentu to rzut jego wag na te kierunki, znormalizowany do długości 1.
+Słowa występujące w podobnych kontekstach (np. „budżet” i „wydatki”) mają zbliżone kierunki, więc podobne są też
+fragmenty o tym samym temacie opisanym innymi słowami.
+
+Model (słownik, wagi idf i kierunki tematów) jest zapisywany obok macierzy wektorów. Spotkanie, którego
+transkrypcja się zakończyła, jest rzutowane na istniejący model i dopisywane na koniec macierzy float32 w pliku
+`.f32`, a jego opis (nazwa, folder i timestampy fragmentów) - jednym wierszem na koniec pliku `.jsonl`. Słowa
+spoza słownika modelu nie wpływają na wektor, dlatego gdy archiwum urośnie REFIT_GROWTH razy od ostatniego
+dopasowania, model jest dopasowywany ponownie (na próbce najwyżej FIT_FRAGMENTS fragmentów), a wektory wszystkich
+spotkań wyznaczane od nowa do plików nowej generacji indeksu. Zapytanie czyta macierz przez mapowanie pamięci
+i liczy iloczyny skalarne blokami wierszy, więc macierz nie jest w całości wczytywana do pamięci; w pamięci
+pozostają tylko opisy spotkań (timestampy fragmentów, kilkadziesiąt bajtów na fragment) i model.
+Do indeksu trafiają wyłącznie spotkania z zakończoną transkrypcją; spotkanie bez transkrypcji jest zapisywane w opisie
+bez wierszy macierzy, więc kolejne uzupełnienia indeksu go nie odczytują.
+
+Położenie indeksu określa zmienna środowiskowa KNZS_VECTOR_INDEX (ścieżka bez rozszerzenia, domyślnie
+`wektory` obok bazy spotkań).
+
+Wymagane zależności
+
+Aby uruchomić skrypt, należy zainstalować następujące pakiety w środowisku Python:
+
+    - numpy: Model tematów, wektory fragmentów i iloczyny skalarne
+    - loguru: Rozbudowany system logowania
+
+Skrypt może być używany jako moduł i zawiera następujące elementy:
+
+    * fit_model - dopasowuje model tematów do transkrypcji.
+    * embed_texts - wyznacza wektory tekstów w przestrzeni tematów modelu.
+    * VectorIndex - indeks wektorów fragmentów transkrypcji z wyszukiwaniem najbliższych spotkań.
+    * get_vector_index - współdzielona instancja indeksu aplikacji.
+"""
+
+import os
+import re
+import glob
+import json
+import math
+import uuid
+import threading
+import numpy as np
+from loguru import logger as log
+from app.utilities.meeting_store import get_meeting_store
+
+# Liczba kierunków tematów (szerokość wiersza macierzy wektorów)
+EMBEDDING_DIM = 256
+STEM_LENGTH = 6
+# Maksymalna liczba słów w słowniku modelu (najczęstsze w próbce archiwum)
+VOCABULARY_SIZE = 20000
+# Maksymalna liczba fragmentów archiwum, na których dopasowywany jest model (losowa próbka)
+FIT_FRAGMENTS = 20000
+# Model jest dopasowywany ponownie, gdy liczba fragmentów w indeksie wzrośnie tyle razy od ostatniego dopasowania
+REFIT_GROWTH = 2
+# Dodatkowe kierunki i iteracje potęgowe losowego rozkładu SVD (dokładność kierunków o mniejszym znaczeniu)
+SVD_OVERSAMPLING = 10
+SVD_POWER_ITERATIONS = 2
+# Liczba niezerowych wag przetwarzanych jednym iloczynem macierzy rzadkiej
+PRODUCT_CHUNK = 16384
+# Liczba wierszy macierzy przetwarzanych jednym iloczynem
+SEARCH_BLOCK_ROWS = 65536
+# Podobieństwo, poniżej którego spotkanie nie jest zwracane (wektory niezwiązanych tekstów mają podobieństwo bliskie 0)
+MIN_SCORE = 0.1
+
+# Ścieżka do indeksu bez rozszerzenia, None - "wektory" w folderze bazy spotkań
+VECTOR_INDEX_PATH = os.environ.get("KNZS_VECTOR_INDEX")
+
+STOP_WORDS = frozenset("""
+a aby ale ani bardzo bez bo by być był była było były będzie będą ci co czy dla do gdy gdzie go ich im
+i in innych iż ja jak jako je jego jej jest jestem jeszcze jeśli już ją każdy kiedy kto która które którego
+który których ma mają mam mi może można mnie mu na nad nam nas nawet nic nie nich nim no o od oraz po pod
+przez przy się sobie są ta tak takie tam te tego tej ten teraz też to tu tutaj tym tylko w we więc wszystko
+z za ze że żeby
+""".split())
+
+_vector_index = None
+_vector_index_lock = threading.Lock()
+
+
+def _terms(text: str) -> dict[str, int]:
+    """Zwraca liczbę wystąpień skróconych słów tekstu (bez słów funkcyjnych i słów krótszych niż 3 znaki)."""
+
+    counts = {}
+    for word in re.findall(r"\w+", text.lower()):
+        if len(word) < 3 or word in STOP_WORDS or word.isdigit():
+            continue
+        term = word[:STEM_LENGTH]
+        counts[term] = counts.get(term, 0) + 1
+    return counts
+
+
+class _SparseRows:
+    """Macierz rzadka w formacie CSR (wiersze - teksty, kolumny - słowa słownika) z iloczynem przez macierz gęstą."""
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, columns: int):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.columns = columns
+
+    @classmethod
+    def from_counts(cls, counts: list[dict[str, int]], vocabulary: dict[str, int], idf: np.ndarray) -> "_SparseRows":
+        """Wagi tf-idf słów słownika w tekstach, z wierszami znormalizowanymi do długości 1."""
+
+        indptr, indices, weights = [0], [], []
+        for text_counts in counts:
+            for term, count in text_counts.items():
+                column = vocabulary.get(term)
+                if column is not None:
+                    indices.append(column)
+                    weights.append(1.0 + math.log(count))
+            indptr.append(len(indices))
+        indptr = np.array(indptr, dtype=np.int64)
+        indices = np.array(indices, dtype=np.int64)
+        data = np.array(weights, dtype=np.float32) * idf[indices]
+        rows = np.repeat(np.arange(len(counts)), np.diff(indptr))
+        norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=len(counts)))
+        data /= norms[rows].astype(np.float32)
+        return cls(indptr, indices, data, len(idf))
+
+    def transpose(self) -> "_SparseRows":
+        rows = np.repeat(np.arange(len(self.indptr) - 1), np.diff(self.indptr))
+        order = np.argsort(self.indices, kind="stable")
+        indptr = np.zeros(self.columns + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=self.columns), out=indptr[1:])
+        return _SparseRows(indptr, rows[order], self.data[order], len(self.indptr) - 1)
+
+    def product(self, dense: np.ndarray) -> np.ndarray:
+        """Iloczyn macierzy rzadkiej i gęstej, liczony fragmentami po około PRODUCT_CHUNK niezerowych wagach."""
+
+        result = np.zeros((len(self.indptr) - 1, dense.shape[1]), dtype=np.float32)
+        start = 0
+        while start < len(result):
+            end = max(start + 1, int(np.searchsorted(self.indptr, self.indptr[start] + PRODUCT_CHUNK, side="right")) - 1)
+            end = min(end, len(result))
+            bounds = self.indptr[start:end + 1]
+            nonempty = np.flatnonzero(np.diff(bounds))
+            if len(nonempty):
+                first, last = bounds[0], bounds[-1]
+                products = self.data[first:last, None] * dense[self.indices[first:last]]
+                result[start + nonempty] = np.add.reduceat(products, bounds[nonempty] - first, axis=0)
+            start = end
+        return result
+
+
+def _topic_directions(rows: _SparseRows, dimensions: int) -> np.ndarray:
+    """
+    Wyznacza `dimensions` głównych kierunków prawej strony macierzy wag losowym, obciętym rozkładem SVD.
+
+    Macierz nie jest tworzona w postaci gęstej - rozkład korzysta wyłącznie z iloczynów macierzy rzadkiej
+    i jej transpozycji przez macierze gęste o SVD_OVERSAMPLING kolumn więcej niż liczba kierunków.
+
+    Returns:
+        Macierz float32 (liczba słów, dimensions) o ortonormalnych kolumnach.
+    """
+
+    columns = rows.transpose()
+    size = min(dimensions + SVD_OVERSAMPLING, len(rows.indptr) - 1, rows.columns)
+    rng = np.random.default_rng(0)
+    basis = rows.product(rng.standard_normal((rows.columns, size), dtype=np.float32))
+    for _ in range(SVD_POWER_ITERATIONS):
+        basis = rows.product(np.linalg.qr(columns.product(np.linalg.qr(basis)[0]))[0])
+    # Rzut macierzy na bazę jej obrazu (transponowany) ma te same prawe wektory osobliwe co cała macierz
+    projected = columns.product(np.linalg.qr(basis)[0])
+    directions = np.linalg.svd(projected, full_matrices=False)[0]
+    return directions[:, :dimensions].astype(np.float32)
+
+
+def fit_model(texts: list[str]) -> dict:
+    """
+    Dopasowuje model tematów (LSA) do transkrypcji.
+
+    Liczba kierunków tematów to połowa rzędu macierzy wag (najwyżej EMBEDDING_DIM): mniejsza liczba kierunków
+    łączy słowa występujące w podobnych kontekstach, większa zachowuje więcej różnic między pojedynczymi słowami.
+
+    Args:
+        texts:
+            Transkrypcje fragmentów (próbka archiwum).
+
+    Returns:
+        Słownik z identyfikatorem modelu ("id"), liczbą fragmentów, na których go dopasowano ("fragments"),
+        słownikiem {słowo: kolumna} ("vocabulary"), wagami idf ("idf") i kierunkami tematów ("directions",
+        macierz float32 (liczba słów, EMBEDDING_DIM), kolumny ponad liczbę kierunków są zerowe).
+    """
+
+    counts = [_terms(text) for text in texts]
+    frequency = {}
+    for text_counts in counts:
+        for term in text_counts:
+            frequency[term] = frequency.get(term, 0) + 1
+    terms = sorted(frequency, key=lambda term: (-frequency[term], term))[:VOCABULARY_SIZE]
+    vocabulary = {term: column for column, term in enumerate(terms)}
+    document_frequency = np.array([frequency[term] for term in terms], dtype=np.float32)
+    idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+    directions = np.zeros((len(terms), EMBEDDING_DIM), dtype=np.float32)
+    rows = _SparseRows.from_counts(counts, vocabulary, idf)
+    rank = min(int(np.count_nonzero(np.diff(rows.indptr))), len(terms))
+    dimensions = min(EMBEDDING_DIM, rank // 2)
+    if dimensions:
+        directions[:, :dimensions] = _topic_directions(rows, dimensions)
+    return {"id": uuid.uuid4().hex, "fragments": len(texts), "vocabulary": vocabulary, "idf": idf, "directions": directions}
+
+
+def embed_texts(model: dict, texts: list[str]) -> np.ndarray:
+    """
+    Wyznacza wektory tekstów w przestrzeni tematów modelu.
+
+    Args:
+        model:
+            Model tematów z `fit_model` (lub `VectorIndex.model`).
+        texts:
+            Teksty (transkrypcje fragmentów lub zapytania).
+
+    Returns:
+        Macierz float32 o wymiarach (len(texts), EMBEDDING_DIM) z wierszami o długości 1
+        (wiersz zerowy dla tekstu bez słów ze słownika modelu).
+    """
+
+    rows = _SparseRows.from_counts([_terms(text) for text in texts], model["vocabulary"], model["idf"])
+    vectors = rows.product(model["directions"])
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+def _transcript_count(meeting_directory: str) -> int:
+    """Zwraca liczbę plików transkrypcji fragmentów spotkania."""
+
+    transcription_folder = f"{meeting_directory}/txt-{os.path.basename(meeting_directory)}"
+    if not os.path.isdir(transcription_folder):
+        return 0
+    return sum(1 for file_name in os.listdir(transcription_folder) if file_name.endswith(".txt"))
+
+
+def _read_transcripts(meeting_directory: str) -> tuple[list[str], list[str]]:
+    """Zwraca timestampy i treść transkrypcji fragmentów spotkania (pliki txt z folderu txt-timestamp)."""
+
+    name = os.path.basename(meeting_directory)
+    transcription_folder = f"{meeting_directory}/txt-{name}"
+    if not os.path.isdir(transcription_folder):
+        return [], []
+    timestamps, texts = [], []
+    for file_name in sorted(os.listdir(transcription_folder)):
+        if not file_name.endswith(".txt"):
+            continue
+        try:
+            with open(f"{transcription_folder}/{file_name}", encoding="utf-8") as file:
+                texts.append(file.read())
+        except (OSError, UnicodeDecodeError) as err:
+            log.warning(f"Pominięto transkrypcję {file_name} przy indeksowaniu: {err}")
+            continue
+        timestamps.append(file_name[:-4])
+    return timestamps, texts
+
+
+class VectorIndex:
+    """
+    Indeks wektorów fragmentów transkrypcji.
+
+    Pliki generacji indeksu (model `-<id>.npz` i macierz wektorów `-<id>.f32`) są wskazywane przez pierwszy wiersz
+    pliku `.jsonl`; kolejne wiersze opisują spotkania (nazwa, folder i timestampy fragmentów w kolejności wierszy
+    macierzy). Wiersze jednego spotkania są zapisywane razem, więc w macierzy zajmują ciągły zakres. Po przerwanym
+    dopisywaniu indeks jest przycinany do ostatniego kompletnie zapisanego spotkania, a przerwane dopasowanie
+    modelu pozostawia poprzednią generację (nową generację zatwierdza podmiana pliku `.jsonl`).
+
+    Args:
+        path:
+            Ścieżka do indeksu bez rozszerzenia.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+        self.meetings_path = f"{self.path}.jsonl"
+        # _lock chroni stan odczytywany przez wyszukiwanie, _write_lock szereguje dopisywanie i dopasowanie modelu
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        self.model = None
+        # Opisy spotkań: {"meeting", "directory", "timestamps"}
+        self.meetings = []
+        header, meetings, damaged = self._read_meetings()
+        if header is not None:
+            self.model = self._load_model(header.get("model"))
+            if self.model is None:
+                log.warning("Brak modelu tematów indeksu wektorów - indeks zostanie zbudowany ponownie")
+            else:
+                self.meetings = meetings
+        elif meetings:
+            log.warning("Indeks wektorów w formacie bez modelu tematów - indeks zostanie zbudowany ponownie")
+
+        row_bytes = EMBEDDING_DIM * 4
+        size = os.path.getsize(self.vectors_path) if self.model and os.path.exists(self.vectors_path) else 0
+        stored_rows = size // row_bytes
+        complete = len(self.meetings)
+        while sum(len(meeting["timestamps"]) for meeting in self.meetings[:complete]) > stored_rows:
+            complete -= 1
+        self.meetings = self.meetings[:complete]
+        self._set_meetings(self.meetings)
+
+        if self.model is not None and (size != self._count * row_bytes or damaged or complete != len(meetings)):
+            log.warning(f"Indeks wektorów przycięty do {len(self.meetings)} spotkań ({self._count} wierszy)")
+            self._write_meetings(self.meetings_path, self.model["id"], self.meetings)
+            with open(self.vectors_path, "ab") as file:
+                file.truncate(self._count * row_bytes)
+        self._remove_stale_files()
+
+    @property
+    def vectors_path(self) -> str | None:
+        """Plik macierzy wektorów bieżącej generacji indeksu."""
+        return f"{self.path}-{self.model['id']}.f32" if self.model else None
+
+    def _read_meetings(self) -> tuple[dict | None, list[dict], bool]:
+        """Odczytuje nagłówek i opisy spotkań; trzeci element wskazuje niekompletny zapis pliku."""
+
+        if not os.path.exists(self.meetings_path):
+            return None, [], False
+        header, meetings, damaged = None, [], False
+        with open(self.meetings_path, encoding="utf-8") as file:
+            for number, line in enumerate(file):
+                try:
+                    entry = json.loads(line)
+                    if number == 0 and "model" in entry:
+                        header = entry
+                        continue
+                    entry["timestamps"]
+                except (ValueError, KeyError, TypeError):
+                    damaged = True
+                    break
+                meetings.append(entry)
+        return header, meetings, damaged
+
+    def _load_model(self, model_id: str | None) -> dict | None:
+        if not model_id:
+            return None
+        try:
+            with np.load(f"{self.path}-{model_id}.npz", allow_pickle=False) as data:
+                terms = data["terms"].tolist()
+                return {"id": model_id, "fragments": int(data["fragments"]), "vocabulary": {term: column for column, term in enumerate(terms)},
+                        "idf": data["idf"], "directions": data["directions"]}
+        except (OSError, ValueError, KeyError) as err:
+            log.warning(f"Nie udało się wczytać modelu tematów: {err}")
+            return None
+
+    def _save_model(self, model: dict) -> None:
+        terms = np.array(sorted(model["vocabulary"], key=model["vocabulary"].get), dtype=f"<U{STEM_LENGTH}")
+        with open(f"{self.path}-{model['id']}.npz", "wb") as file:
+            np.savez(file, terms=terms, fragments=np.int64(model["fragments"]), idf=model["idf"], directions=model["directions"])
+            file.flush()
+            os.fsync(file.fileno())
+
+    @staticmethod
+    def _write_meetings(path: str, model_id: str, meetings: list[dict]) -> None:
+        """Zapisuje nagłówek i opisy spotkań przez plik tymczasowy (podmiana pliku jest atomowa)."""
+
+        temporary_path = path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            file.write(json.dumps({"model": model_id}) + "\n")
+            file.writelines(json.dumps(meeting, ensure_ascii=False) + "\n" for meeting in meetings)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, path)
+
+    def _remove_stale_files(self) -> None:
+        """Usuwa pliki poprzednich generacji indeksu i przerwanych dopasowań modelu."""
+
+        current = {f"{self.path}-{self.model['id']}.npz", self.vectors_path} if self.model else set()
+        for stale in glob.glob(glob.escape(self.path) + "-*.npz") + glob.glob(glob.escape(self.path) + "-*.f32") + glob.glob(glob.escape(self.path) + ".f32"):
+            if stale not in current:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    # Macierz mapowana przez trwające wyszukiwanie (Windows) - zostanie usunięta przy kolejnym otwarciu
+                    pass
+
+    def _set_meetings(self, meetings: list[dict]) -> None:
+        """Ustawia opisy spotkań i indeksy pierwszych wierszy kolejnych spotkań."""
+
+        self.meetings = meetings
+        self._starts = []
+        self._count = 0
+        for meeting in meetings:
+            self._starts.append(self._count)
+            self._count += len(meeting["timestamps"])
+        self._directories = {meeting["directory"] for meeting in meetings}
+        self._matrix = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def contains(self, meeting_directory: str) -> bool:
+        """Sprawdza, czy fragmenty spotkania są już w indeksie."""
+        return os.path.abspath(meeting_directory).replace("\\", "/") in self._directories
+
+    def add_meeting(self, meeting_directory: str) -> int:
+        """
+        Dopisuje do indeksu transkrypcje fragmentów spotkania (pliki txt z folderu txt-timestamp).
+
+        Spotkanie należy dopisać po zakończeniu jego transkrypcji - dopisane spotkanie nie jest później uzupełniane.
+
+        Args:
+            meeting_directory:
+                Ścieżka do folderu spotkania.
+
+        Returns:
+            Liczba dopisanych fragmentów (0, jeśli spotkanie jest już w indeksie lub nie ma transkrypcji - takie
+            spotkanie jest zapisywane w indeksie bez fragmentów).
+        """
+
+        return self.sync_meetings([meeting_directory])
+
+    def sync_meetings(self, meeting_directories: list[str]) -> int:
+        """
+        Dopisuje do indeksu spotkania, których jeszcze w nim nie ma.
+
+        Spotkania są rzutowane na istniejący model tematów. Jeśli indeks nie ma jeszcze modelu albo po dopisaniu
+        liczba fragmentów przekroczy REFIT_GROWTH razy liczbę fragmentów z ostatniego dopasowania, model jest
+        dopasowywany ponownie, a wektory wszystkich spotkań wyznaczane od nowa.
+
+        Args:
+            meeting_directories:
+                Ścieżki do folderów spotkań z zakończoną transkrypcją (np. z `MeetingStore.list_meetings(finished_only=True)`).
+
+        Returns:
+            Liczba dopisanych fragmentów.
+        """
+
+        with self._write_lock:
+            directories = []
+            for meeting_directory in meeting_directories:
+                directory = os.path.abspath(meeting_directory).replace("\\", "/")
+                if directory not in self._directories and directory not in directories:
+                    directories.append(directory)
+            if not directories:
+                return 0
+            count = self._count
+            if self.model is None:
+                self._rebuild(directories)
+            else:
+                for directory in directories:
+                    self._append_meeting(directory)
+                if self._count and self._count >= REFIT_GROWTH * self.model["fragments"]:
+                    self._rebuild([])
+            return self._count - count
+
+    def _append_meeting(self, directory: str) -> None:
+        """Rzutuje fragmenty spotkania na bieżący model i dopisuje je na koniec indeksu."""
+
+        timestamps, texts = _read_transcripts(directory)
+        meeting = {"meeting": os.path.basename(directory), "directory": directory, "timestamps": timestamps}
+        if timestamps:
+            with open(self.vectors_path, "ab") as file:
+                file.write(embed_texts(self.model, texts).tobytes())
+                file.flush()
+                os.fsync(file.fileno())
+        with open(self.meetings_path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(meeting, ensure_ascii=False) + "\n")
+        with self._lock:
+            self._starts.append(self._count)
+            self._count += len(timestamps)
+            self.meetings.append(meeting)
+            self._directories.add(directory)
+            self._matrix = None
+        log.debug(f"Zaindeksowano tematycznie spotkanie {meeting['meeting']}: {len(timestamps)} fragmentów")
+
+    def _rebuild(self, new_directories: list[str]) -> None:
+        """
+        Dopasowuje model tematów do spotkań z indeksu i `new_directories` i zapisuje nową generację indeksu.
+
+        Transkrypcje są czytane dwukrotnie (próbka do dopasowania modelu, następnie wektory kolejnych spotkań),
+        więc w pamięci nie jest przechowywane całe archiwum - chyba że mieści się ono w próbce FIT_FRAGMENTS.
+        """
+
+        directories = [meeting["directory"] for meeting in self.meetings] + new_directories
+        expected = self._count + sum(_transcript_count(directory) for directory in new_directories)
+        probability = FIT_FRAGMENTS / max(expected, 1)
+        rng = np.random.default_rng(0)
+        sample, transcripts = [], {}
+        for directory in directories:
+            timestamps, texts = _read_transcripts(directory)
+            if probability >= 1:
+                transcripts[directory] = timestamps, texts
+                sample.extend(texts)
+            else:
+                sample.extend(text for text in texts if rng.random() < probability)
+        model = fit_model(sample)
+
+        meetings = []
+        vectors_path = f"{self.path}-{model['id']}.f32"
+        with open(vectors_path, "wb") as file:
+            for directory in directories:
+                timestamps, texts = transcripts.pop(directory, None) or _read_transcripts(directory)
+                if timestamps:
+                    file.write(embed_texts(model, texts).tobytes())
+                meetings.append({"meeting": os.path.basename(directory), "directory": directory, "timestamps": timestamps})
+            file.flush()
+            os.fsync(file.fileno())
+        model["fragments"] = sum(len(meeting["timestamps"]) for meeting in meetings)
+        self._save_model(model)
+        self._write_meetings(self.meetings_path, model["id"], meetings)
+
+        with self._lock:
+            self.model = model
+            self._set_meetings(meetings)
+        self._remove_stale_files()
+        log.info(f"Dopasowano model tematów: {len(model['vocabulary'])} słów, {len(sample)} fragmentów próbki, "
+                 f"{self._count} fragmentów w indeksie")
+
+    def _snapshot(self) -> tuple[dict | None, list[dict], list[int], np.ndarray | None]:
+        """Model, opisy spotkań, indeksy pierwszych wierszy i macierz wektorów jednej generacji indeksu."""
+
+        with self._lock:
+            if self._matrix is None and self._count:
+                self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(self._count, EMBEDDING_DIM))
+            return self.model, list(self.meetings), list(self._starts), self._matrix
+
+    def scores(self, queries: np.ndarray, matrix: np.ndarray | None = None) -> np.ndarray:
+        """
+        Liczy podobieństwo kosinusowe zapytań do wszystkich fragmentów w indeksie.
+
+        Args:
+            queries:
+                Macierz wektorów zapytań (liczba zapytań, EMBEDDING_DIM) z `embed_texts`.
+            matrix:
+                Macierz wektorów fragmentów (domyślnie macierz bieżącej generacji indeksu).
+
+        Returns:
+            Macierz float32 (liczba zapytań, liczba fragmentów).
+        """
+
+        if matrix is None:
+            matrix = self._snapshot()[3]
+        if matrix is None:
+            return np.zeros((len(queries), 0), dtype=np.float32)
+        # Iloczyn blok x zapytania (wiersze macierzy w kolejności pamięci) jest dla wielu zapytań szybszy
+        # niż zapytania x blok.T
+        result = np.empty((len(matrix), len(queries)), dtype=np.float32)
+        for start in range(0, len(matrix), SEARCH_BLOCK_ROWS):
+            block = matrix[start:start + SEARCH_BLOCK_ROWS]
+            np.matmul(block, queries.T, out=result[start:start + len(block)])
+        return result.T
+
+    def search(self, queries: list[str], k: int = 10) -> list[list[dict]]:
+        """
+        Wyszukuje spotkania najbliższe tematycznie każdemu z zapytań.
+
+        Spotkanie jest oceniane podobieństwem najbliższego zapytaniu fragmentu, który jest zwracany jako
+        wskazanie miejsca w spotkaniu. Spotkania o podobieństwie mniejszym niż MIN_SCORE są pomijane.
+
+        Args:
+            queries:
+                Zapytania (opisy tematów); wszystkie są porównywane z indeksem jednym przebiegiem po macierzy.
+            k:
+                Liczba spotkań zwracanych dla każdego zapytania.
+
+        Returns:
+            Dla każdego zapytania lista słowników z nazwą ("meeting") i folderem ("directory") spotkania, timestampem
+            ("timestamp") i ścieżką ("path") najbliższego fragmentu oraz podobieństwem ("score"), malejąco.
+        """
+
+        model, meetings, starts, matrix = self._snapshot()
+        if matrix is None:
+            return [[] for _ in queries]
+        # Spotkania bez transkrypcji nie mają wierszy w macierzy
+        indexed = [number for number, meeting in enumerate(meetings) if meeting["timestamps"]]
+        meetings = [meetings[number] for number in indexed]
+        starts = [starts[number] for number in indexed]
+        scores = self.scores(embed_texts(model, queries), matrix)
+
+        meeting_scores = np.maximum.reduceat(scores, starts, axis=1)
+        bounds = starts + [scores.shape[1]]
+
+        results = []
+        for query_scores, query_meeting_scores in zip(scores, meeting_scores):
+            top = np.argsort(-query_meeting_scores)[:k]
+            hits = []
+            for meeting in top:
+                if query_meeting_scores[meeting] < MIN_SCORE:
+                    break
+                start, end = bounds[meeting], bounds[meeting + 1]
+                best = start + int(np.argmax(query_scores[start:end]))
+                name, directory = meetings[meeting]["meeting"], meetings[meeting]["directory"]
+                timestamp = meetings[meeting]["timestamps"][best - start]
+                hits.append({"meeting": name, "directory": directory, "timestamp": timestamp,
+                             "path": f"{directory}/txt-{name}/{timestamp}.txt", "score": float(query_scores[best])})
+            results.append(hits)
+        return results
+
+
+def get_vector_index() -> VectorIndex:
+    """
+    Zwraca współdzieloną instancję indeksu wektorów, tworząc ją przy pierwszym wywołaniu.
+
+    Returns:
+        Indeks w KNZS_VECTOR_INDEX lub "wektory" w folderze bazy spotkań.
+    """
+
+    global _vector_index
+    with _vector_index_lock:
+        if _vector_index is None:
+            path = VECTOR_INDEX_PATH or os.path.join(os.path.dirname(os.path.abspath(get_meeting_store().path)), "wektory")
+            _vector_index = VectorIndex(path)
+        return _vector_index
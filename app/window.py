@@ -19,11 +19,15 @@ Do poprawnego działania skryptu należy zaimportować następujące funkcje:
     - `generate_pdf_from_files` z modułu `app.utilities.pdf_generator`
     - `send_email` z modułu `app.utilities.mail_sender`
     - `log_status` z modułu `app.utilities.logger`
+    - `get_meeting_store` z modułu `app.utilities.meeting_store`
+    - `search_meetings`, `search_topics`, `format_hit`, `no_results_message` z modułu `app.meeting_search`
+    - `DECODING_PROFILES`, `decoding_profile` z modułu `app.transcription_engines`
 
 Ten plik zawiera następujące funkcje:
 
     * transription_false_update - resetuje stan transkrypcji.
     * update_status - aktualizuje wiadomość statusu w GUI.
+    * update_caption - wyświetla napisy na żywo pod wiadomością statusu.
     * generate_notes - rozpoczyna proces generowania notatek.
     * open_file - pozwala na wczytanie pliku MP4.
     * show_settings - otwiera okno ustawień w GUI.
@@ -35,25 +39,32 @@ Ten plik zawiera następujące funkcje:
     * create_circle_button - tworzy okrągły przycisk z tekstem lub ikoną.
     * create_main_menu - tworzy główny przycisk menu.
     * get_audio_devices - pobiera listę dostępnych urządzeń audio.
-    * find_all_pdfs - wyszukuje wszystkie pliki PDF w katalogu spotkania.
+    * find_all_pdfs - zwraca raporty PDF spotkań z bazy spotkań.
     * show_email_input_window - wyświetla okno do podania adresu e-mail.
     * show_pdf_selection_window - wyświetla okno wyboru raportu PDF.
     * show_transcription_window - wyświetla okno transkrypcji.
     * start_recording_and_screenshots_with_disable - rozpoczyna nagrywanie i blokuje przycisk start.
     * stop_recording_all - zatrzymuje nagrywanie i przetwarzanie zrzutów ekranu.
     * generate_notes - obsługuje wybór spotkania i generuje raport PDF.
+    * offer_meeting_resume - proponuje wznowienie transkrypcji spotkań przerwanych awarią aplikacji.
+    * show_search_window - wyświetla okno wyszukiwania w transkrypcjach spotkań.
 """
 import tkinter as tk
 from tkinter import messagebox, filedialog, ttk
-from app.start_recording_and_screenshots import start_recording_and_screenshots, stop_recording_and_screenshots
+from app.start_recording_and_screenshots import start_recording_and_screenshots, stop_recording_and_screenshots, resume_unfinished_meetings
+from app.utilities.session_manifest import find_unfinished_meetings
 from app.utilities.logger import log_status
 from app.utilities.mail_sender import send_email
 from app.utilities.mail_sender import send_email
 from app.utilities.pdf_generator import generate_pdf_from_files
+from app.utilities.meeting_store import get_meeting_store
+from app.meeting_search import search_meetings, search_topics, index_meetings, format_hit, no_results_message
+from app.transcription_engines import DECODING_PROFILES, decoding_profile as default_decoding_profile
 from app.recorder_audio import start_recording, stop_recording
 from loguru import logger as log
 from PIL import Image, ImageDraw, ImageTk, ImageFont
 import os
+import threading
 import webbrowser
 import subprocess
 
@@ -62,6 +73,7 @@ recording_active = False  # Śledzenie stanu nagrywania
 transcription_active = False  # Śledzenie stanu transkrypcji nagrania
 font_path = r".\styles\OpenSans-ExtraBoldItalic.ttf"
 selected_audio_device = None  # Przechowywanie wybranego urządzenia audio
+topic_index_started = False  # Uzupełnienie indeksu wyszukiwania tematycznego (raz na uruchomienie aplikacji)
 if not os.path.exists(font_path):
     raise FileNotFoundError(f"Plik czcionki nie został znaleziony: {font_path}")
 
@@ -109,6 +121,15 @@ def update_status(new_status):
     # Wykonaj aktualizację w głównym wątku
     app.after(0, update_label)
 
+def update_caption(caption):
+    """
+    Wyświetla napisy na żywo pod wiadomością statusu.
+
+    Args:
+        caption: Tekst napisów (stabilny prefiks i tekst tymczasowy).
+    """
+    app.after(0, lambda: caption_label.config(text=caption))
+
 
 def generate_notes() -> None:
     """
@@ -129,17 +150,19 @@ def open_file() -> None:
         # Placeholder
 
 selected_audio_device = None  # Globalna zmienna na wybrane urządzenie
+selected_decoding_profile = default_decoding_profile  # Profil dekodowania sesji (None - ustawienia domyślne)
+DEFAULT_PROFILE_LABEL = "domyślny"
 
 def show_settings():
     """
-     Wyświetla okno ustawień, umożliwiające wybór urządzenia audio.
+     Wyświetla okno ustawień, umożliwiające wybór urządzenia audio i profilu dekodowania transkrypcji.
     """
-    global selected_audio_device
+    global selected_audio_device, selected_decoding_profile
 
     # Tworzenie okna ustawień
     settings_window = tk.Toplevel(app)
     settings_window.title("Ustawienia")
-    settings_window.geometry("300x300")  # Ustawienie rozmiaru okna
+    settings_window.geometry("300x380")  # Ustawienie rozmiaru okna
     settings_window.resizable(False, False)  # Zablokowanie możliwości zmiany rozmiaru
     settings_window.configure(bg="#ebe4d6")
 
@@ -165,24 +188,30 @@ def show_settings():
             font=("Arial", 10)
         ).pack(anchor="w", padx=20)
 
+    # Profil dekodowania kolejnych sesji transkrypcji i wznawianych spotkań
+    tk.Label(settings_window, text="Profil dekodowania:", bg="#ebe4d6", font=("Arial", 12)).pack(pady=(15, 5))
+    profile_var = tk.StringVar(value=selected_decoding_profile or DEFAULT_PROFILE_LABEL)
+    ttk.Combobox(settings_window, textvariable=profile_var, values=[DEFAULT_PROFILE_LABEL, *DECODING_PROFILES], state="readonly", width=15).pack()
+
     def save_settings():
-        """Zapisuje ustawienia użytkownika, w tym wybrane urządzenie audio.
+        """Zapisuje ustawienia użytkownika, w tym wybrane urządzenie audio i profil dekodowania.
 
         """
         nonlocal device_var
-        global selected_audio_device
+        global selected_audio_device, selected_decoding_profile
         if device_var.get() == "UNSELECTED":
             messagebox.showwarning("Brak wyboru", "Proszę wybrać urządzenie audio przed zapisaniem ustawień.")
             return
         selected_audio_device = device_var.get()
-        log.debug(f"Wybrane urządzenie audio: {selected_audio_device}")
+        selected_decoding_profile = None if profile_var.get() == DEFAULT_PROFILE_LABEL else profile_var.get()
+        log.debug(f"Wybrane urządzenie audio: {selected_audio_device}, profil dekodowania: {selected_decoding_profile or DEFAULT_PROFILE_LABEL}")
         settings_window.destroy()
 
     # Tworzenie okrągłego przycisku zapisu
     save_button = create_circle_button(
         settings_window,
         x=125,  # Pozycja przycisku w oknie
-        y=200,
+        y=300,
         size=50,  # Rozmiar przycisku
         text="✔️",  # Tekst na przycisku
         fill_color="#ad9d99",  # Kolor wypełnienia przycisku
@@ -383,6 +412,10 @@ status_label.place(relx=0.5, y=80, anchor="center")  # Wyśrodkowanie względem
 # Ustawienie początkowego statusu
 update_status("Gotowe")
 
+# Widżet napisów na żywo, pod wiadomością statusu
+caption_label = tk.Label(app, bg="#ebe4d6", font=("Arial", 10), wraplength=580)
+caption_label.place(relx=0.5, y=113, anchor="center")
+
 # Przyciski
 button_frame = tk.Frame(app, bg="#ebe4d6")
 button_frame.place(relx=0.5, y=160, anchor="center")
@@ -422,7 +455,7 @@ def start_recording_and_screenshots_with_disable(update_status, selected_audio_d
     start_button.config(state="disabled")
 
     # Uruchom oryginalną funkcję startującą nagrywanie i screeny
-    transcription_active = start_recording_and_screenshots(update_status, selected_audio_device, app, transription_false_update)
+    transcription_active = start_recording_and_screenshots(update_status, selected_audio_device, app, transription_false_update, update_caption, decoding_profile=selected_decoding_profile)
 
     # Ustawienie flagi, że nagrywanie jest aktywne
     recording_active = True
@@ -465,22 +498,17 @@ stop_button.grid(row=0, column=1, padx=10)
 
 def find_all_pdfs():
     """
-    Przeszukuje wszystkie podfoldery w katalogu spotkania w poszukiwaniu plików PDF.
+    Zwraca raporty PDF spotkań zapisane w bazie spotkań.
 
     Returns:
-        list: Posortowana lista pełnych ścieżek do znalezionych plików PDF.
+        list: Posortowana lista pełnych ścieżek do istniejących plików PDF.
     """
-    pdf_files = []  # Lista przechowująca znalezione pliki PDF
-    meetings_folder =".\\spotkania"
-    # Przeszukaj katalog spotkania rekurencyjnie
-    for root, _, files in os.walk(meetings_folder):
-        for file in files:
-            if file.endswith(".pdf"):  # Szukamy tylko plików PDF
-                pdf_files.append(os.path.join(root, file))  # Dodaj pełną ścieżkę do listy
+    store = get_meeting_store()
+    # Spotkania spoza bazy (np. sprzed jej wprowadzenia) są importowane jednokrotnie
+    store.sync_meetings("./spotkania")
 
-    # Posortuj listę plików PDF według nazw plików
-    pdf_files.sort()
-    return pdf_files
+    # Raporty zapisane w bazie, posortowane po ścieżce; pomijane są pliki usunięte z dysku
+    return [pdf for pdf in store.list_reports() if os.path.exists(pdf)]
 
 def show_email_input_window(selected_pdf_path):
     """
@@ -616,9 +644,9 @@ def generate_notes():
     """
     Wyświetla okno wyboru folderu spotkania, umożliwiając użytkownikowi zaznaczenie jednego folderu.
     """
-    meetings_folder = "./spotkania"
-    meeting_dirs = [d for d in os.listdir(meetings_folder) if os.path.isdir(os.path.join(meetings_folder, d))]
-    meeting_dirs.sort()
+    store = get_meeting_store()
+    store.sync_meetings("./spotkania")
+    meeting_dirs = [name for name, directory in store.list_meetings() if os.path.isdir(directory)]
 
     if not meeting_dirs:
         messagebox.showwarning("Brak spotkań", "Nie znaleziono żadnych folderów spotkań.")
@@ -696,7 +724,7 @@ def generate_notes():
             return
 
         # Generowanie PDF z podsumowaniem
-        generate_pdf_from_files(output_file, screenshot_folder, transcription_folder, full_transcription_path)
+        generate_pdf_from_files(output_file, screenshot_folder, full_transcription_path)
         messagebox.showinfo("Sukces", f"Wygenerowano raport: {output_file}")
         os.startfile(output_file)
 
@@ -727,6 +755,142 @@ notes_button = create_circle_button(
 notes_button.config(font=("Arial", 24))
 notes_button.grid(row=0, column=3, padx=10)
 
+
+def index_finished_meetings():
+    """Dopisuje do indeksu wyszukiwania tematycznego zakończone spotkania spoza indeksu (w osobnym wątku)."""
+    try:
+        fragments = index_meetings(None)
+    except (OSError, ValueError) as err:
+        log.warning(f"Nie udało się uzupełnić indeksu wyszukiwania tematycznego: {err}")
+        return
+    if fragments:
+        log.info(f"Dopisano do indeksu wyszukiwania tematycznego {fragments} fragmentów")
+
+
+def show_search_window():
+    """
+    Wyświetla okno wyszukiwania w transkrypcjach wszystkich spotkań.
+
+    Wyniki wskazują spotkanie, timestamp fragmentu i fragment tekstu. Dwuklik na wyniku otwiera plik transkrypcji,
+    a przycisk "Zrzut ekranu" - zrzut widoczny w chwili rozpoczęcia fragmentu.
+    Po zaznaczeniu wyszukiwania tematycznego zwracane są spotkania o treści najbliższej zapytaniu.
+    Import spotkań i wyszukiwanie działają w osobnych wątkach, a wyniki są wyświetlane przez `app.after`.
+    """
+    global topic_index_started
+    index_topics = not topic_index_started
+    topic_index_started = True
+    store_ready = threading.Event()
+
+    def prepare_search():
+        # Spotkania spoza bazy są importowane raz, przy otwarciu okna (wyszukiwanie czeka na koniec importu)
+        try:
+            get_meeting_store().sync_meetings("./spotkania")
+        except Exception as e:
+            log.warning(f"Nie udało się zaimportować spotkań do bazy: {e}")
+        finally:
+            store_ready.set()
+        if index_topics:
+            index_finished_meetings()
+
+    threading.Thread(target=prepare_search, daemon=True).start()
+
+    search_window = tk.Toplevel(app)
+    search_window.title("Wyszukiwanie w spotkaniach")
+    search_window.geometry("600x450")
+    search_window.configure(bg="#ebe4d6")
+
+    tk.Label(search_window, text="Szukaj w transkrypcjach:", bg="#ebe4d6", font=("Arial", 12)).pack(pady=10)
+    query_entry = tk.Entry(search_window, font=("Arial", 12), width=40)
+    query_entry.pack(pady=5)
+    query_entry.focus_set()
+    topics_var = tk.BooleanVar(value=False)
+    tk.Checkbutton(search_window, text="Szukaj tematycznie (spotkania o podobnej treści)", variable=topics_var,
+                   bg="#ebe4d6", font=("Arial", 10)).pack()
+
+    frame = tk.Frame(search_window)
+    frame.pack(fill="both", expand=True, padx=10, pady=5)
+    scrollbar = ttk.Scrollbar(frame, orient="vertical")
+    results_list = tk.Listbox(frame, font=("Arial", 10), yscrollcommand=scrollbar.set)
+    scrollbar.config(command=results_list.yview)
+    scrollbar.pack(side="right", fill="y")
+    results_list.pack(side="left", fill="both", expand=True)
+
+    hits = []
+    search_number = 0  # Numer ostatniego wyszukiwania - wyniki wcześniejszych zapytań są pomijane
+
+    def run_search(event=None):
+        nonlocal search_number
+        query = query_entry.get().strip()
+        if not query:
+            return
+        search_number += 1
+        hits.clear()
+        results_list.delete(0, tk.END)
+        results_list.insert(tk.END, "Wyszukiwanie...")
+        threading.Thread(target=search_in_background, args=(search_number, query, topics_var.get()), daemon=True).start()
+
+    def search_in_background(number, query, topics):
+        store_ready.wait()
+        try:
+            found = search_topics(query, limit=20) if topics else search_meetings(query, limit=100, meetings_folder=None)
+            message = no_results_message(query, topics)
+        except Exception as e:
+            log.warning(f"Błąd wyszukiwania: {e}")
+            found, message = [], f"Błąd wyszukiwania: {e}"
+        app.after(0, lambda: show_results(number, found, message))
+
+    def show_results(number, found, message):
+        if number != search_number or not search_window.winfo_exists():
+            return
+        hits[:] = found
+        results_list.delete(0, tk.END)
+        for hit in hits:
+            results_list.insert(tk.END, format_hit(hit))
+        if not hits:
+            results_list.insert(tk.END, message)
+
+    def selected_hit():
+        selection = results_list.curselection()
+        if not selection or selection[0] >= len(hits):
+            return None
+        return hits[selection[0]]
+
+    def open_transcript(event=None):
+        hit = selected_hit()
+        if hit is not None:
+            os.startfile(hit["path"] if os.path.exists(hit["path"]) else hit["directory"])
+
+    def open_screenshot():
+        hit = selected_hit()
+        if hit is None:
+            messagebox.showwarning("Brak wyboru", "Proszę wybrać wynik wyszukiwania.")
+        elif hit["screenshot"] is None:
+            messagebox.showinfo("Brak zrzutu", "Spotkanie nie ma zrzutów ekranu.")
+        else:
+            os.startfile(hit["screenshot"])
+
+    query_entry.bind("<Return>", run_search)
+    results_list.bind("<Double-Button-1>", open_transcript)
+
+    buttons_frame = tk.Frame(search_window, bg="#ebe4d6")
+    buttons_frame.pack(pady=10)
+    for text, command in (("🔍 Szukaj", run_search), ("📄 Transkrypcja", open_transcript), ("🖼 Zrzut ekranu", open_screenshot)):
+        tk.Button(buttons_frame, text=text, command=command, font=("Arial", 12), bg="#ad9d99", fg="black").pack(side="left", padx=5)
+
+# Wyszukiwanie w spotkaniach
+search_button = create_circle_button(
+    button_frame,
+    x=0,
+    y=0,
+    size=60,
+    text="🔍",
+    fill_color="#ad9d99",
+    outline_color="black",
+    command=show_search_window
+)
+search_button.config(font=("Arial", 22))
+search_button.grid(row=0, column=4, padx=10)
+
 def get_audio_devices():
     """
     Pobiera listę dostępnych urządzeń audio za pomocą FFmpeg.
@@ -753,6 +917,28 @@ def get_audio_devices():
         return []
 
 
+def offer_meeting_resume():
+    """
+    Wyszukuje spotkania przerwane awarią aplikacji i proponuje wznowienie ich transkrypcji.
+
+    Na czas wznawiania przycisk "Play" jest zablokowany, ponieważ transkrypcja korzysta z tego samego modelu.
+    """
+    global transcription_active
+
+    meetings = find_unfinished_meetings("./spotkania")
+    if not meetings:
+        return
+
+    names = "\n".join(os.path.basename(meeting) for meeting in meetings)
+    if not messagebox.askyesno("Niedokończone spotkania", f"Znaleziono spotkania z niedokończoną transkrypcją:\n{names}\n\nWznowić transkrypcję brakujących fragmentów?"):
+        return
+
+    transcription_active = True
+    start_button.config(state="disabled")
+    resume_unfinished_meetings(update_status, meetings, on_finished=lambda: app.after(0, transription_false_update), decoding_profile=selected_decoding_profile)
+
+
+app.after(500, offer_meeting_resume)
 
 # Uruchomienie aplikacji
 app.mainloop()
@@ -0,0 +1,74 @@
+import time
+from io import BytesIO
+from pydub import AudioSegment
+from loguru import logger as log
+from app.recorder_audio import _read_pcm_fragments, FRAGMENT_SECONDS, READ_CHUNK_SIZE
+from app.utilities.audio_formats import get_audio_format, SAMPLE_WIDTH
+
+log.info("Benchmark podziału strumienia PCM na fragmenty (symulacja 2-godzinnego nagrania).")
+
+
+class FakePcmStream:
+    """Strumień zwracający zerowe PCM porcjami po READ_CHUNK_SIZE bajtów, jak potok z FFmpeg."""
+
+    def __init__(self, total_bytes):
+        self.remaining = total_bytes
+
+    def readinto1(self, view):
+        n = min(len(view), READ_CHUNK_SIZE, self.remaining)
+        view[:n] = bytes(n)
+        self.remaining -= n
+        return n
+
+    def read(self, size):
+        n = min(size, self.remaining)
+        self.remaining -= n
+        return bytes(n)
+
+
+# Najbardziej wymagający wariant: 44.1 kHz stereo (format mp3)
+SAMPLE_RATE = get_audio_format("mp3")["sample_rate"]
+CHANNELS = get_audio_format("mp3")["channels"]
+
+fragment_bytes = FRAGMENT_SECONDS * SAMPLE_RATE * CHANNELS * SAMPLE_WIDTH
+capture_seconds = 2 * 60 * 60
+total_bytes = capture_seconds * SAMPLE_RATE * CHANNELS * SAMPLE_WIDTH
+
+# Nowy sposób: prealokowany bufor, koszt CPU mierzony dla każdego fragmentu osobno
+fragment_cpu_times = []
+last_cpu = time.process_time()
+
+
+def on_fragment(pcm):
+    global last_cpu
+    now = time.process_time()
+    fragment_cpu_times.append(now - last_cpu)
+    last_cpu = now
+
+
+start = time.process_time()
+count = _read_pcm_fragments(FakePcmStream(total_bytes), fragment_bytes, on_fragment, lambda: True)
+total_cpu = time.process_time() - start
+
+log.info(f"Prealokowany bufor: {count} fragmentów, łączny czas CPU {total_cpu:.2f} s")
+log.info(f"Czas CPU na fragment: min {min(fragment_cpu_times) * 1000:.1f} ms, "
+         f"max {max(fragment_cpu_times) * 1000:.1f} ms, "
+         f"pierwsze 10: {sum(fragment_cpu_times[:10]) / 10 * 1000:.1f} ms, "
+         f"ostatnie 10: {sum(fragment_cpu_times[-10:]) / 10 * 1000:.1f} ms")
+
+# Poprzedni sposób: ponowne dekodowanie całego bufora po każdym odczycie (tylko jeden fragment)
+stream = FakePcmStream(fragment_bytes)
+buffer = BytesIO()
+start = time.process_time()
+while True:
+    data = stream.read(READ_CHUNK_SIZE)
+    if not data:
+        break
+    buffer.write(data)
+    audio_segment = AudioSegment.from_raw(
+        BytesIO(buffer.getvalue()), sample_width=SAMPLE_WIDTH, frame_rate=SAMPLE_RATE, channels=CHANNELS
+    )
+legacy_cpu = time.process_time() - start
+
+log.info(f"Poprzednia implementacja: {legacy_cpu * 1000:.1f} ms CPU na jeden fragment "
+         f"(szacunkowo {legacy_cpu * count:.0f} s na 2 godziny nagrania)")
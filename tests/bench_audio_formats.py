@@ -0,0 +1,44 @@
+import os
+import time
+import tempfile
+import numpy as np
+from loguru import logger as log
+from app.utilities.audio_formats import AUDIO_FORMATS, encode_fragment, load_audio
+
+log.info("Porównanie kosztu zapisu i odczytu 20-sekundowego fragmentu audio dla każdego formatu.")
+
+fragment_seconds = 20
+repeats = 3
+
+
+def synthetic_pcm(sample_rate, channels):
+    """Sygnał podobny do mowy: ton z modulacją amplitudy i szumem, zapisany jako s16le."""
+    t = np.arange(fragment_seconds * sample_rate) / sample_rate
+    signal = 0.3 * np.sin(2 * np.pi * 220 * t) * (0.5 + 0.5 * np.sin(2 * np.pi * 3 * t))
+    signal += 0.05 * np.random.default_rng(0).standard_normal(t.size)
+    samples = (np.clip(signal, -1, 1) * 32767).astype(np.int16)
+    return np.repeat(samples[:, None], channels, axis=1).tobytes()
+
+
+with tempfile.TemporaryDirectory() as folder:
+    for name, fmt in AUDIO_FORMATS.items():
+        pcm = synthetic_pcm(fmt["sample_rate"], fmt["channels"])
+        output_file = os.path.join(folder, f"fragment.{fmt['extension']}")
+
+        try:
+            start = time.perf_counter()
+            for _ in range(repeats):
+                encode_fragment(pcm, output_file, name)
+            encode_ms = (time.perf_counter() - start) / repeats * 1000
+
+            start = time.perf_counter()
+            for _ in range(repeats):
+                audio = load_audio(output_file)
+            decode_ms = (time.perf_counter() - start) / repeats * 1000
+        except Exception as err:
+            log.warning(f"{name}: pominięto ({err})")
+            continue
+
+        size_kb = os.path.getsize(output_file) / 1024
+        log.info(f"{name:>5}: zapis {encode_ms:7.1f} ms, odczyt {decode_ms:7.1f} ms, "
+                 f"razem {encode_ms + decode_ms:7.1f} ms, rozmiar {size_kb:7.0f} KB, próbek: {audio.size}")
@@ -0,0 +1,71 @@
+import time
+import numpy as np
+from PIL import Image, ImageChops
+from loguru import logger as log
+from app.utilities.change_detection import PixelChangeDetector, HashChangeDetector, difference_percent
+
+log.info("Benchmark wykrywania zmian w monitorowanym obszarze ekranu (klatki 1920x1080).")
+
+
+def legacy_difference_percent(previous, current, width, height):
+    """Dotychczasowa metryka monitor_and_capture: suma różnic pikseli w pętli Pythona."""
+
+    diff = ImageChops.difference(previous, current)
+    diff_bbox = diff.getbbox()
+    if not diff_bbox:
+        return 0.0
+    diff_pixels = sum(sum(pixel) for pixel in diff.crop(diff_bbox).getdata())
+    return diff_pixels / (width * height * 255 * 3) * 100
+
+
+WIDTH, HEIGHT = 1920, 1080
+rng = np.random.default_rng(0)
+
+# Slajd, ruch kursora (mała zmiana) i nowy slajd (duża zmiana)
+slide = np.full((HEIGHT, WIDTH, 3), 240, dtype=np.uint8)
+slide[100:300, 200:1700] = rng.integers(0, 256, (200, 1500, 3), dtype=np.uint8)
+cursor = slide.copy()
+cursor[500:520, 900:912] = 0
+next_slide = slide.copy()
+next_slide[300:900, 100:1800] = rng.integers(0, 256, (600, 1700, 3), dtype=np.uint8)
+frames = [Image.fromarray(frame) for frame in (slide, cursor, next_slide, next_slide)]
+
+# Ta sama metryka co dotychczas
+for previous, current in zip(frames, frames[1:]):
+    legacy = legacy_difference_percent(previous, current, WIDTH, HEIGHT)
+    new = difference_percent(np.asarray(previous), np.asarray(current))
+    assert abs(legacy - new) < 1e-9, (legacy, new)
+    log.info(f"Zmiana {new:.4f}%")
+
+detector = PixelChangeDetector(threshold=2.0)
+assert [detector.is_changed(frame) for frame in frames] == [False, False, True, False]
+
+start = time.perf_counter()
+legacy_difference_percent(frames[1], frames[2], WIDTH, HEIGHT)
+legacy_time = time.perf_counter() - start
+
+detector.reset()
+times = []
+for number in range(50):
+    frame = frames[number % 3]
+    start = time.perf_counter()
+    detector.update(frame)
+    times.append(time.perf_counter() - start)
+median = sorted(times)[len(times) // 2]
+log.info(f"Dotychczas: {legacy_time * 1000:.0f} ms na klatkę, NumPy: mediana {median * 1000:.1f} ms na klatkę "
+         f"(z konwersją obrazu do tablicy), przyspieszenie {legacy_time / median:.0f}x")
+
+# Tryb hash: ruch kursora nie zmienia skrótu miniatury, pełne porównanie tylko dla nowego slajdu
+detector = HashChangeDetector(threshold=2.0)
+assert [detector.is_changed(frame) for frame in frames] == [False, False, True, False]
+assert detector.confirmations == 1, detector.confirmations
+
+times = []
+for number in range(50):
+    frame = frames[number % 2]
+    start = time.perf_counter()
+    detector.is_changed(frame)
+    times.append(time.perf_counter() - start)
+hash_median = sorted(times)[len(times) // 2]
+log.info(f"Tryb hash: mediana {hash_median * 1000:.2f} ms na klatkę bez zmiany slajdu, "
+         f"przyspieszenie {legacy_time / hash_median:.0f}x względem dotychczasowej metryki")
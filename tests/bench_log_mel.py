@@ -0,0 +1,45 @@
+import time
+import numpy as np
+from loguru import logger as log
+from app.recorder_audio import READ_CHUNK_SIZE
+from app.utilities.audio_formats import WHISPER_SAMPLE_RATE, FRAGMENT_SECONDS
+from app.utilities.log_mel import StreamingLogMel
+
+log.info("Porównanie kosztu spektrogramu log-mel na ścieżce krytycznej po zamknięciu fragmentu.")
+
+repeats = 5
+rng = np.random.default_rng(0)
+t = np.arange(FRAGMENT_SECONDS * WHISPER_SAMPLE_RATE) / WHISPER_SAMPLE_RATE
+audio = (0.3 * np.sin(2 * np.pi * 220 * t) + 0.05 * rng.standard_normal(t.size)).astype(np.float32)
+pcm = (audio * 32767).astype(np.int16).tobytes()
+audio = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+
+stream = StreamingLogMel(FRAGMENT_SECONDS)
+feed_seconds = finish_seconds = 0.0
+for _ in range(repeats):
+    start = time.perf_counter()
+    for offset in range(0, len(pcm), READ_CHUNK_SIZE):
+        stream.feed_pcm(pcm[offset:offset + READ_CHUNK_SIZE])
+    feed_seconds += time.perf_counter() - start
+
+    start = time.perf_counter()
+    mel = stream.finish()
+    finish_seconds += time.perf_counter() - start
+
+chunks = len(pcm) // READ_CHUNK_SIZE
+log.info(f"Przyrostowo: {feed_seconds / repeats * 1000:.1f} ms w trakcie nagrywania "
+         f"({feed_seconds / repeats / chunks * 1e6:.0f} µs na odczyt {READ_CHUNK_SIZE} B), "
+         f"{finish_seconds / repeats * 1000:.1f} ms po zamknięciu fragmentu")
+
+try:
+    import whisper
+    from whisper.audio import N_SAMPLES
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        reference = whisper.log_mel_spectrogram(audio, 80, padding=N_SAMPLES).numpy()
+    whisper_ms = (time.perf_counter() - start) / repeats * 1000
+    log.info(f"whisper.log_mel_spectrogram po zamknięciu fragmentu: {whisper_ms:.1f} ms, "
+             f"maks. różnica względem przyrostowego: {np.abs(reference - mel).max():.2e}")
+except ImportError:
+    log.warning("Pakiet whisper nie jest zainstalowany - pomijam porównanie z whisper.log_mel_spectrogram.")
@@ -0,0 +1,74 @@
+import os
+import string
+import time
+import torch
+from loguru import logger as log
+from app.transcriptor import get_whisper_model, clear_model_cache
+from app.transcription_engines import get_engine
+from app.utilities.audio_formats import load_audio, WHISPER_SAMPLE_RATE
+
+log.info("Porównanie szybkości i dokładności (WER) modelu Whisper w fp32 i z dynamiczną kwantyzacją int8 na CPU.")
+
+# Stały zestaw polskich próbek: pliki audio i transkrypcje wzorcowe o tej samej nazwie z rozszerzeniem .txt
+samples_dir = r"D:\Studia\InzynieriaOprogramowania\kreator-notatek-ze-spotkan\app\nagrania\probki"
+model_name = "medium"
+# Dekodowanie zachłanne bez losowania, aby różnice wynikały wyłącznie z kwantyzacji
+options = {"temperature": 0.0, "condition_on_previous_text": False}
+PUNCTUATION = str.maketrans("", "", string.punctuation + "„”…–")
+
+
+def word_error_rate(reference, hypothesis):
+    """WER: odległość edycyjna na poziomie słów podzielona przez liczbę słów tekstu wzorcowego."""
+
+    reference = reference.lower().translate(PUNCTUATION).split()
+    hypothesis = hypothesis.lower().translate(PUNCTUATION).split()
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1] / len(reference)
+
+
+samples = []
+if os.path.isdir(samples_dir):
+    for name in sorted(os.listdir(samples_dir)):
+        base, extension = os.path.splitext(name)
+        reference_path = os.path.join(samples_dir, f"{base}.txt")
+        if extension.lower() != ".txt" and os.path.exists(reference_path):
+            with open(reference_path, encoding="utf-8") as file:
+                samples.append((name, load_audio(os.path.join(samples_dir, name)), file.read()))
+
+if not samples:
+    log.warning(f"Brak próbek z transkrypcjami wzorcowymi w katalogu {samples_dir}.")
+else:
+    audio_seconds = sum(len(audio) for _, audio, _ in samples) / WHISPER_SAMPLE_RATE
+    log.info(f"Próbki: {len(samples)}, łącznie {audio_seconds:.0f} s, model {model_name}, wątki CPU: {torch.get_num_threads()}")
+
+    engine = get_engine("whisper")
+    results = {}
+    for dtype in ("fp32", "int8"):
+        start = time.perf_counter()
+        model = get_whisper_model(model_name, device="cpu", dtype=dtype, engine=engine.name)
+        load_seconds = time.perf_counter() - start
+
+        texts = []
+        start = time.perf_counter()
+        for name, audio, reference in samples:
+            texts.append(engine.transcribe(model, audio, language="pl", options=options)["text"])
+        transcribe_seconds = time.perf_counter() - start
+
+        wer = sum(word_error_rate(reference, text) for (_, _, reference), text in zip(samples, texts)) / len(samples)
+        results[dtype] = texts
+        log.info(f"{dtype}: ładowanie {load_seconds:.2f} s, transkrypcja {transcribe_seconds:.1f} s "
+                 f"(RTF {transcribe_seconds / audio_seconds:.3f}), pamięć {engine.model_memory_mb(model):.0f} MB, WER {wer:.2%}")
+        clear_model_cache()
+
+    drift = [word_error_rate(fp32_text, int8_text) for fp32_text, int8_text in zip(results["fp32"], results["int8"])]
+    for (name, _, _), value in zip(samples, drift):
+        log.info(f"{name}: różnica int8 względem fp32 (WER) {value:.2%}")
+    log.info(f"Średnia różnica int8 względem fp32 (WER): {sum(drift) / len(drift):.2%}")
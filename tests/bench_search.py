@@ -0,0 +1,82 @@
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from loguru import logger as log
+
+# Testowe spotkania nie mogą trafić do bazy spotkań aplikacji
+database_path = os.path.join(tempfile.mkdtemp(), "spotkania.db")
+os.environ["KNZS_MEETING_DB"] = database_path
+
+from app.utilities.meeting_store import SCHEMA, get_meeting_store
+from app.meeting_search import search_meetings, format_hit, no_results_message
+
+log.info("Benchmark wyszukiwania pełnotekstowego w archiwum spotkań (symulacja 10 000 spotkań).")
+
+MEETINGS = 10_000
+FRAGMENTS = 40
+SCREENSHOT_EVERY = 6
+# Mowa: ok. 60% słów to słowa funkcyjne, reszta pochodzi z kilku tysięcy słów treści
+FUNCTION_WORDS = ["że", "to", "jest", "i", "w", "na", "nie", "się", "z", "do", "tak", "ale", "jak", "już", "może", "będzie"]
+CONTENT_WORDS = ["spotkanie", "projekt", "termin", "zadanie", "raport", "klient", "budżet", "wdrożenie", "zespół", "umowa",
+                 "sprzedaż", "kwartał", "prezentacja", "harmonogram", "ryzyko", "jakość", "testy", "serwer", "wersja", "błąd"]
+CONTENT_WORDS += [f"słowo{number}" for number in range(3000)]
+RARE_WORDS = ["żyrafa", "kosmodrom", "fotowoltaika", "prokrastynacja"]
+
+# Archiwum budowane bezpośrednio w SQLite (schemat bazy spotkań), indeks pełnotekstowy tworzy MeetingStore
+rng = random.Random(0)
+start = time.perf_counter()
+connection = sqlite3.connect(database_path)
+connection.executescript(SCHEMA)
+with connection:
+    for meeting_id in range(1, MEETINGS + 1):
+        day = f"2024-{1 + meeting_id % 12:02d}-{1 + meeting_id % 28:02d}_{meeting_id % 24:02d}-{meeting_id % 60:02d}-00"
+        name = f"{day}-{meeting_id}"
+        directory = f"/spotkania/{name}"
+        connection.execute("INSERT INTO meetings (id, name, directory, created_at) VALUES (?, ?, ?, ?)", (meeting_id, name, directory, day))
+        transcripts = []
+        screenshots = []
+        for fragment in range(FRAGMENTS):
+            stem = f"{10 + fragment * 20 // 3600:02d}-{fragment * 20 // 60 % 60:02d}-{fragment * 20 % 60:02d}"
+            words = [rng.choice(FUNCTION_WORDS) if rng.random() < 0.6 else rng.choice(CONTENT_WORDS) for _ in range(40)]
+            if rng.random() < 0.001:
+                words[rng.randrange(40)] = rng.choice(RARE_WORDS)
+            transcripts.append((meeting_id, stem, f"{directory}/txt-{name}/{stem}.txt", " ".join(words) + "\n"))
+            if fragment % SCREENSHOT_EVERY == 1:
+                screenshots.append((meeting_id, stem, f"{directory}/screenshots-{name}/{stem}.jpg"))
+        connection.executemany("INSERT INTO transcripts (meeting_id, timestamp, path, text) VALUES (?, ?, ?, ?)", transcripts)
+        connection.executemany("INSERT INTO screenshots (meeting_id, timestamp, path) VALUES (?, ?, ?)", screenshots)
+connection.close()
+log.info(f"Archiwum: {MEETINGS} spotkań, {MEETINGS * FRAGMENTS} fragmentów ({time.perf_counter() - start:.1f} s)")
+
+start = time.perf_counter()
+store = get_meeting_store()
+log.info(f"Budowa indeksu pełnotekstowego: {time.perf_counter() - start:.1f} s, baza {os.path.getsize(database_path) / 2 ** 20:.0f} MB")
+
+# Nowy fragment trafia do indeksu w chwili zapisu
+new_meeting = os.path.join(tempfile.mkdtemp(), "2025-01-18_23-07-50")
+store.add_screenshot(f"{new_meeting}/screenshots-2025-01-18_23-07-50/23-07-40.jpg")
+store.add_transcript(f"{new_meeting}/txt-2025-01-18_23-07-50/23-07-50.txt", "Omówiliśmy Budżet wdrożenia na następny kwartał.\n")
+hits = search_meetings("budzet wdrozenia nastepny", meetings_folder=None)
+assert [hit["timestamp"] for hit in hits] == ["23-07-50"], hits
+assert hits[0]["screenshot"].endswith("23-07-40.jpg"), hits
+log.info(f"Wynik dla nowego fragmentu: {format_hit(hits[0])}")
+
+# Ranking obejmuje całe archiwum: najtrafniejszy wynik może pochodzić z najstarszego spotkania
+with sqlite3.connect(database_path) as connection:
+    connection.execute("UPDATE transcripts SET text = 'kosmodrom kosmodrom kosmodrom' WHERE id = 1")
+hits = search_meetings("kosmodrom", limit=1, meetings_folder=None)
+assert hits and hits[0]["meeting"].endswith("-1"), hits
+
+# Słowa funkcyjne są pomijane; zapytanie złożone tylko z nich nie przegląda archiwum
+assert search_meetings("jest to że", meetings_folder=None) == []
+assert no_results_message("jest to że") != no_results_message("kosmodrom żyrafa")
+
+for query in ("żyrafa", "kosmodrom", "budżet wdroż", "harmonogram ryzyko testy", "spotkanie", "jest to spotkanie", "to jest budżet"):
+    times = []
+    for _ in range(5):
+        start = time.perf_counter()
+        hits = search_meetings(query, limit=20, meetings_folder=None)
+        times.append(time.perf_counter() - start)
+    log.info(f"'{query}': {len(hits)} wyników, mediana {sorted(times)[2] * 1000:.1f} ms, najgorszy {max(times) * 1000:.1f} ms")
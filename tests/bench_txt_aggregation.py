@@ -0,0 +1,114 @@
+import os
+import glob
+import random
+import shutil
+import tempfile
+import time
+from loguru import logger as log
+
+# Testowe spotkania nie mogą trafić do bazy spotkań aplikacji
+os.environ.setdefault("KNZS_MEETING_DB", os.path.join(tempfile.mkdtemp(), "spotkania.db"))
+
+from app.utilities.recording_utils import txt_files_aggregation
+from app.utilities.meeting_store import get_meeting_store
+
+log.info("Benchmark łączenia fragmentów transkrypcji między zrzutami ekranu (symulacja 3-godzinnego spotkania).")
+
+FRAGMENT_SECONDS = 20
+MEETING_SECONDS = 3 * 60 * 60
+TIMESTAMP = "2025-01-18_10-00-00"
+
+
+def legacy_txt_files_aggregation(meeting_folder):
+    """Poprzednia implementacja: wspólna lista txt i jpg, lista `done_files` i dopisywanie fragmentu po fragmencie."""
+
+    timestamp = (meeting_folder.replace("\\", "/")).rsplit("/", 1)[1]
+    archiwum_path = meeting_folder + f"/txt-{timestamp}/archiwum"
+    os.makedirs(archiwum_path, exist_ok=True)
+
+    files = glob.glob(meeting_folder + f"/txt-{timestamp}/*.txt") + glob.glob(meeting_folder + f"/screenshots-{timestamp}/*.jpg")
+    files.sort(key=lambda f: ((f.replace("\\", "/")).rsplit("/", 1)[1]).rsplit(".", 1)[0])
+
+    done_files = []
+    temp_done_list = []
+    for file in files:
+        if file not in done_files:
+            ext = file.rsplit(".", 1)[1]
+            filename = ((file.rsplit(".", 1)[0]).replace("\\", "/")).rsplit("/", 1)[1]
+            if ext == "txt":
+                if temp_done_list == []:
+                    temp_done_list.append(file)
+                else:
+                    with open(file, 'r', encoding='utf-8') as f:
+                        text = f.read()
+                    with open(temp_done_list[0], 'a', encoding='utf-8') as f:
+                        f.write(text)
+                    done_files.append(file)
+                    os.rename(file, f"{file.replace('\\', '/').rsplit('/', 1)[0]}/archiwum/{filename}.{ext}")
+            elif ext == "jpg":
+                temp_done_list = []
+
+
+def build_meeting(root):
+    """Tworzy spotkanie: fragment transkrypcji co 20 s i zrzut ekranu średnio co 2 minuty, także z timestampem fragmentu."""
+
+    meeting = f"{root}/{TIMESTAMP}"
+    txt_folder = f"{meeting}/txt-{TIMESTAMP}"
+    screenshots_folder = f"{meeting}/screenshots-{TIMESTAMP}"
+    os.makedirs(txt_folder)
+    os.makedirs(screenshots_folder)
+
+    rng = random.Random(0)
+    words = ["spotkanie", "projekt", "termin", "zadanie", "raport", "klient", "budżet", "wdrożenie"]
+    for second in range(0, MEETING_SECONDS, FRAGMENT_SECONDS):
+        stem = f"{10 + second // 3600:02d}-{second // 60 % 60:02d}-{second % 60:02d}"
+        with open(f"{txt_folder}/{stem}.txt", "w", encoding="utf-8") as f:
+            f.write(" ".join(rng.choice(words) for _ in range(50)) + "\n")
+        if rng.random() < 1 / 6:
+            # Część zrzutów ma dokładnie ten sam timestamp co fragment
+            offset = 0 if rng.random() < 0.3 else rng.randrange(1, FRAGMENT_SECONDS)
+            shot = second + offset
+            shot_stem = f"{10 + shot // 3600:02d}-{shot // 60 % 60:02d}-{shot % 60:02d}"
+            open(f"{screenshots_folder}/{shot_stem}.jpg", "wb").close()
+    return meeting
+
+
+def snapshot(meeting):
+    """Zwraca zawartość wszystkich plików txt spotkania (również archiwum) jako słownik ścieżka względna -> tekst."""
+
+    result = {}
+    for path in glob.glob(f"{meeting}/txt-{TIMESTAMP}/**/*.txt", recursive=True):
+        with open(path, encoding="utf-8") as f:
+            result[os.path.relpath(path, meeting)] = f.read()
+    return result
+
+
+root = tempfile.mkdtemp()
+try:
+    template = build_meeting(f"{root}/template")
+    fragments = len(os.listdir(f"{template}/txt-{TIMESTAMP}"))
+    screenshots = len(os.listdir(f"{template}/screenshots-{TIMESTAMP}"))
+    log.info(f"Fragmenty transkrypcji: {fragments}, zrzuty ekranu: {screenshots}")
+
+    results = {}
+    for name, function in (("poprzednia", legacy_txt_files_aggregation), ("merge-join", txt_files_aggregation)):
+        times = []
+        for run in range(5):
+            meeting = f"{root}/{name}-{run}/{TIMESTAMP}"
+            shutil.copytree(template, meeting)
+            if function is txt_files_aggregation:
+                # Spotkanie nagrane w aplikacji jest w bazie spotkań od chwili zapisu plików
+                get_meeting_store().import_meeting(meeting)
+            start = time.perf_counter()
+            function(meeting)
+            times.append(time.perf_counter() - start)
+        results[name] = snapshot(meeting)
+        log.info(f"{name}: mediana {sorted(times)[len(times) // 2] * 1000:.1f} ms, najlepszy {min(times) * 1000:.1f} ms")
+
+    if results["poprzednia"] == results["merge-join"]:
+        log.info(f"Wyniki identyczne: {len(results['merge-join'])} plików, w tym "
+                 f"{sum(not path.startswith(os.path.join(f'txt-{TIMESTAMP}', 'archiwum')) for path in results['merge-join'])} plików grup")
+    else:
+        log.error("Wyniki obu implementacji różnią się!")
+finally:
+    shutil.rmtree(root)
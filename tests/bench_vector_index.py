@@ -0,0 +1,78 @@
+import os
+import json
+import tempfile
+import tracemalloc
+import time
+import numpy as np
+from loguru import logger as log
+
+from app.utilities.vector_index import VectorIndex, EMBEDDING_DIM, FIT_FRAGMENTS, fit_model, embed_texts
+
+log.info("Benchmark wyszukiwania tematycznego w indeksie wektorów (symulacja 10 000 spotkań).")
+
+MEETINGS = 10_000
+FRAGMENTS = 40
+TOPICS = 100
+TOPIC_WORDS = 100
+QUERIES = ["budżet wdrożenia w kolejnym kwartale", "błędy serwera po aktualizacji", "rekrutacja do zespołu sprzedaży"]
+MEETING_TEXT = "Omówiliśmy budżet wdrożenia na następny kwartał."
+
+# Dopasowanie modelu tematów na pełnej próbce: syntetyczne słowa, każdy temat z osobnym słownikiem
+rng = np.random.default_rng(0)
+letters = np.array(list("abcdefghijklmnoprstuwyz"))
+words = ["".join(rng.choice(letters, 6)) for _ in range(TOPICS * TOPIC_WORDS)]
+texts = [" ".join(rng.choice(words[topic * TOPIC_WORDS:(topic + 1) * TOPIC_WORDS], 12))
+         for topic in rng.integers(0, TOPICS, FIT_FRAGMENTS - len(QUERIES) - 1)] + QUERIES + [MEETING_TEXT]
+start = time.perf_counter()
+model = fit_model(texts)
+log.info(f"Dopasowanie modelu: {len(texts)} fragmentów, {len(model['vocabulary'])} słów ({time.perf_counter() - start:.1f} s)")
+
+# Indeks zapisany bezpośrednio w formacie VectorIndex: losowe wektory jednostkowe, wiersze spotkań w ciągłych zakresach
+path = os.path.join(tempfile.mkdtemp(), "wektory")
+model["fragments"] = MEETINGS * FRAGMENTS
+VectorIndex(path)._save_model(model)
+vectors_path = f"{path}-{model['id']}.f32"
+start = time.perf_counter()
+with open(vectors_path, "wb") as vectors_file, open(f"{path}.jsonl", "w", encoding="utf-8") as meetings_file:
+    meetings_file.write(json.dumps({"model": model["id"]}) + "\n")
+    for first in range(0, MEETINGS, 1000):
+        vectors = rng.standard_normal((1000 * FRAGMENTS, EMBEDDING_DIM), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors_file.write(vectors.tobytes())
+        for meeting in range(first, first + 1000):
+            name = f"spotkanie-{meeting}"
+            timestamps = [f"{10 + fragment * 20 // 3600:02d}-{fragment * 20 // 60 % 60:02d}-{fragment * 20 % 60:02d}" for fragment in range(FRAGMENTS)]
+            meetings_file.write(json.dumps({"meeting": name, "directory": f"/spotkania/{name}", "timestamps": timestamps}) + "\n")
+log.info(f"Indeks: {MEETINGS * FRAGMENTS} fragmentów, {os.path.getsize(vectors_path) / 2 ** 20:.0f} MB ({time.perf_counter() - start:.1f} s)")
+
+tracemalloc.start()
+start = time.perf_counter()
+index = VectorIndex(path)
+opened = time.perf_counter() - start
+memory = tracemalloc.get_traced_memory()[0]
+tracemalloc.stop()
+log.info(f"Otwarcie indeksu: {opened * 1000:.0f} ms, opisy spotkań i model w pamięci: {memory / 2 ** 20:.0f} MB")
+
+# Fragment dopisany po zakończeniu spotkania jest najbliższy zapytaniu o jego temat
+meeting = os.path.join(tempfile.mkdtemp(), "2025-01-18_23-07-50")
+os.makedirs(f"{meeting}/txt-2025-01-18_23-07-50")
+with open(f"{meeting}/txt-2025-01-18_23-07-50/23-07-50.txt", "w", encoding="utf-8") as f:
+    f.write(MEETING_TEXT + "\n")
+start = time.perf_counter()
+index.add_meeting(meeting)
+log.info(f"Dopisanie spotkania: {(time.perf_counter() - start) * 1000:.1f} ms")
+assert index.search(QUERIES[:1])[0][0]["meeting"] == "2025-01-18_23-07-50"
+
+for queries in (QUERIES[:1], QUERIES):
+    times = []
+    for _ in range(5):
+        start = time.perf_counter()
+        index.search(queries, k=10)
+        times.append(time.perf_counter() - start)
+    log.info(f"{len(queries)} zapytań: mediana {sorted(times)[2] * 1000:.1f} ms, najgorszy {max(times) * 1000:.1f} ms")
+
+# Porównanie z pełną macierzą w pamięci (bez mapowania i bloków)
+matrix = np.fromfile(index.vectors_path, dtype=np.float32).reshape(-1, EMBEDDING_DIM)
+queries = embed_texts(index.model, QUERIES)
+assert np.allclose(index.scores(queries), queries @ matrix.T, atol=1e-5)
+log.info("Benchmark zakończony pomyślnie.")
@@ -0,0 +1,49 @@
+import math
+import time
+import numpy as np
+from loguru import logger as log
+from app.utilities.audio_formats import WHISPER_SAMPLE_RATE, WHISPER_WINDOW_SECONDS
+
+log.info("Porównanie kosztu enkodera Whisper na godzinę nagrania dla różnych długości fragmentów.")
+
+model_name = "tiny"
+recorded_seconds = 3600
+fragment_lengths = (10, 20, 30, 60)
+repeats = 5
+
+
+def encoder_windows(fragment_seconds):
+    """Liczba 30-sekundowych okien enkodera potrzebnych do transkrypcji godziny nagrania."""
+    fragments = math.ceil(recorded_seconds / fragment_seconds)
+    return fragments * math.ceil(fragment_seconds / WHISPER_WINDOW_SECONDS)
+
+
+# Czas jednego przebiegu enkodera (opcjonalnie, jeśli zainstalowano whisper)
+window_seconds = None
+try:
+    import torch
+    import whisper
+
+    model = whisper.load_model(model_name, device="cpu")
+    audio = np.zeros(WHISPER_WINDOW_SECONDS * WHISPER_SAMPLE_RATE, dtype=np.float32)
+    mel = whisper.log_mel_spectrogram(audio, model.dims.n_mels).unsqueeze(0)
+
+    with torch.no_grad():
+        model.embed_audio(mel)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            model.embed_audio(mel)
+    window_seconds = (time.perf_counter() - start) / repeats
+    log.info(f"Enkoder {model_name} (CPU): {window_seconds * 1000:.0f} ms na okno {WHISPER_WINDOW_SECONDS} s")
+except Exception as err:
+    log.warning(f"Nie udało się zmierzyć enkodera ({err}) - podaję tylko liczbę przebiegów enkodera.")
+
+baseline = encoder_windows(20)
+for fragment_seconds in fragment_lengths:
+    windows = encoder_windows(fragment_seconds)
+    padding = 1 - recorded_seconds / (windows * WHISPER_WINDOW_SECONDS)
+    line = (f"fragment {fragment_seconds:>2} s: {windows:4d} okien enkodera/h, dopełnienie ciszą {padding:6.1%}, "
+            f"względem 20 s: {windows / baseline - 1:+6.1%}")
+    if window_seconds is not None:
+        line += f", czas enkodera {windows * window_seconds:6.1f} s/h"
+    log.info(line)
@@ -0,0 +1,23 @@
+from loguru import logger as log
+from app.live_captions import CaptionStitcher
+
+log.info("Test łączenia tekstu nakładających się okien napisów na żywo.")
+
+# Okna 4 s co 1.5 s: każde kolejne okno powtarza końcówkę poprzedniego, pierwsze słowo bywa ucięte
+windows = [
+    "Dzień dobry, zaczynamy",
+    "dobry, zaczynamy spotkanie zespołu.",
+    "amy spotkanie zespołu. Pierwszy punkt",
+    "zespołu. Pierwszy punkt to budżet",
+    "punkt to budżet na przyszły rok.",
+]
+
+stitcher = CaptionStitcher(aged_fraction=1.5 / 4)
+for window in windows:
+    committed = stitcher.update(window)
+    log.info(f"+{committed} słów stabilnych | {stitcher.text()}")
+
+expected = "Dzień dobry, zaczynamy spotkanie zespołu. Pierwszy punkt to budżet na przyszły rok."
+assert stitcher.text() == expected, stitcher.text()
+assert stitcher.text(max_chars=30).startswith("…")
+log.info("Sukces.")
@@ -0,0 +1,25 @@
+import numpy as np
+from loguru import logger as log
+from app.live_captions import LiveCaptioner, WHISPER_SAMPLE_RATE
+
+log.info("Test zmiany częstotliwości próbkowania napisów na żywo przy danych podawanych porcjami.")
+
+SECONDS = 3
+CHUNK_BYTES = 4096
+
+for sample_rate in (44100, 48000, 22050, 8000):
+    captioner = LiveCaptioner(lambda caption: None, window_seconds=SECONDS + 1)
+    time = np.arange(SECONDS * sample_rate) / sample_rate
+    pcm = (0.5 * np.sin(2 * np.pi * 440 * time) * 32767).astype(np.int16).tobytes()
+    # Porcje odczytu nagrania, których długość nie jest wielokrotnością kroku zmiany częstotliwości
+    for start in range(0, len(pcm), CHUNK_BYTES):
+        captioner.feed(pcm[start:start + CHUNK_BYTES], sample_rate)
+
+    window, _ = captioner._snapshot()
+    expected = 0.5 * np.sin(2 * np.pi * 440 * np.arange(window.size) / WHISPER_SAMPLE_RATE)
+    error = float(np.abs(window - expected).max())
+    log.info(f"{sample_rate} Hz: {window.size} próbek 16 kHz, największy błąd {error:.4f}")
+    assert abs(window.size - SECONDS * WHISPER_SAMPLE_RATE) <= 1, window.size
+    assert error < 0.01, error
+
+log.info("Sukces.")
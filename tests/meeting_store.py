@@ -0,0 +1,98 @@
+import os
+import sqlite3
+import tempfile
+from loguru import logger as log
+
+# Testowe spotkania nie mogą trafić do bazy spotkań aplikacji
+os.environ.setdefault("KNZS_MEETING_DB", os.path.join(tempfile.mkdtemp(), "spotkania.db"))
+
+from app.utilities.meeting_store import get_meeting_store
+from app.utilities.recording_utils import txt_files_aggregation
+
+log.info("Test bazy spotkań: import spotkania z dysku, zapis plików nowego spotkania i łączenie transkrypcji.")
+
+meetings_folder = tempfile.mkdtemp()
+store = get_meeting_store()
+database_path = store.path
+
+
+def make_meeting(name):
+    meeting = os.path.join(meetings_folder, name).replace("\\", "/")
+    for prefix in ("audio", "txt", "screenshots"):
+        os.makedirs(f"{meeting}/{prefix}-{name}")
+    return meeting
+
+
+# Spotkanie zapisane na dysku przed wprowadzeniem bazy
+legacy = make_meeting("2025-01-18_23-07-50")
+for stem in ("23-07-50", "23-08-10", "23-08-30"):
+    open(f"{legacy}/audio-2025-01-18_23-07-50/{stem}.mp3", "wb").close()
+    with open(f"{legacy}/txt-2025-01-18_23-07-50/{stem}.txt", "w", encoding="utf-8") as f:
+        f.write(f"tekst {stem}\n")
+open(f"{legacy}/screenshots-2025-01-18_23-07-50/23-08-20.jpg", "wb").close()
+open(f"{legacy}/raport_2025-01-18_23-07-50.pdf", "wb").close()
+
+# Nowe spotkanie: pliki dodawane do bazy w chwili zapisu
+current = make_meeting("2025-01-19_10-00-00")
+store.add_meeting(current)
+open(f"{current}/screenshots-2025-01-19_10-00-00/10-00-00.jpg", "wb").close()
+store.add_screenshot(f"{current}/screenshots-2025-01-19_10-00-00/10-00-00.jpg")
+for stem in ("10-00-00", "10-00-20", "10-00-40"):
+    path = f"{current}/txt-2025-01-19_10-00-00/{stem}.txt"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"tekst {stem}\n")
+    store.add_transcript(path, f"tekst {stem}\n")
+open(f"{current}/screenshots-2025-01-19_10-00-00/10-00-40.jpg", "wb").close()
+store.add_screenshot(f"{current}/screenshots-2025-01-19_10-00-00/10-00-40.jpg")
+
+store.sync_meetings(meetings_folder)
+names = [name for name, _ in store.list_meetings() if name.startswith("2025-01-1")]
+assert names == ["2025-01-18_23-07-50", "2025-01-19_10-00-00"], names
+assert [os.path.basename(path) for path in store.list_reports()] == ["raport_2025-01-18_23-07-50.pdf"]
+
+items = [(kind, timestamp) for kind, timestamp, _, _ in store.get_report_items(legacy)]
+assert items == [("transcript", "23-07-50"), ("transcript", "23-08-10"), ("screenshot", "23-08-20"), ("transcript", "23-08-30")], items
+
+# Zrzut o tym samym timestampie co fragment zamyka grupę po tym fragmencie (10-00-00), a nie przed nim (10-00-40)
+txt_files_aggregation(current)
+transcripts = store.get_transcripts(current)
+assert [(timestamp, text) for timestamp, _, text in transcripts] == [("10-00-00", "tekst 10-00-00\n"), ("10-00-20", "tekst 10-00-20\ntekst 10-00-40\n")], transcripts
+with open(f"{current}/txt-2025-01-19_10-00-00/10-00-20.txt", encoding="utf-8") as f:
+    assert f.read() == transcripts[1][2]
+assert os.path.exists(f"{current}/txt-2025-01-19_10-00-00/archiwum/10-00-40.txt")
+# Indeks pełnotekstowy: treść połączonej grupy, bez fragmentu przeniesionego do archiwum
+hits = store.search("tekst 40")
+assert [(hit["meeting"], hit["timestamp"]) for hit in hits] == [("2025-01-19_10-00-00", "10-00-20")], hits
+assert hits[0]["screenshot"].endswith("10-00-00.jpg"), hits
+
+# Spotkanie bez nieudanych zapisów jest odczytywane z bazy, bez przeglądania folderów
+expected_items = [(kind, timestamp) for kind, timestamp, _, _ in store.get_report_items(current)]
+open(f"{current}/screenshots-2025-01-19_10-00-00/10-00-50.jpg", "wb").close()
+store.ensure_meeting(current)
+assert [(kind, timestamp) for kind, timestamp, _, _ in store.get_report_items(current)] == expected_items
+os.remove(f"{current}/screenshots-2025-01-19_10-00-00/10-00-50.jpg")
+
+# Zapis do bazy nieudany (baza zablokowana przez inny proces): pliki na dysku bez wpisów w bazie
+store._connection.execute("PRAGMA busy_timeout = 50")
+blocker = sqlite3.connect(database_path)
+blocker.execute("BEGIN EXCLUSIVE")
+for stem in ("10-01-00", "10-01-20"):
+    path = f"{current}/txt-2025-01-19_10-00-00/{stem}.txt"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"tekst {stem}\n")
+    store.add_transcript(path, f"tekst {stem}\n")
+open(f"{current}/screenshots-2025-01-19_10-00-00/10-01-10.jpg", "wb").close()
+store.add_screenshot(f"{current}/screenshots-2025-01-19_10-00-00/10-01-10.jpg")
+blocker.rollback()
+blocker.close()
+# Wpis pliku usuniętego z dysku
+store.add_screenshot(f"{current}/screenshots-2025-01-19_10-00-00/10-02-00.jpg")
+store.ensure_meeting(current)
+current_items = [(kind, timestamp) for kind, timestamp, _, _ in store.get_report_items(current)]
+assert current_items == [("screenshot", "10-00-00"), ("transcript", "10-00-00"), ("transcript", "10-00-20"), ("screenshot", "10-00-40"),
+                 ("transcript", "10-01-00"), ("screenshot", "10-01-10"), ("transcript", "10-01-20")], current_items
+assert not store._dirty
+
+store.finish_meeting(current)
+log.info(f"Spotkania: {names}, elementy raportu spotkania {legacy.rsplit('/', 1)[1]}: {items}")
+log.info("Sukces.")
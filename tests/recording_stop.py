@@ -0,0 +1,78 @@
+import io
+import os
+import time
+import tempfile
+import threading
+from loguru import logger as log
+
+# Testowe spotkania nie mogą trafić do bazy spotkań aplikacji
+os.environ.setdefault("KNZS_MEETING_DB", os.path.join(tempfile.mkdtemp(), "spotkania.db"))
+
+from app import recorder_audio
+from app.utilities.audio_formats import get_audio_format, encode_fragment, FRAGMENT_SECONDS, SAMPLE_WIDTH
+from app.utilities.fragment_watcher import FragmentWatcher
+
+log.info("Zatrzymanie nagrywania w trakcie eksportu ostatniego fragmentu (tryb pipe).")
+
+EXPORT_SECONDS = 1.1
+
+
+class FakeProcess:
+    """Proces FFmpeg, którego wyjście zawiera dwa pełne fragmenty PCM."""
+
+    def __init__(self, pcm: bytes):
+        self.stdout = io.BytesIO(pcm)
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+    def terminate(self):
+        self.returncode = 0
+
+    def wait(self, timeout=None):
+        return self.returncode
+
+
+def slow_encode(pcm, output_file, *args, **kwargs):
+    """Eksport fragmentu trwający dłużej niż sekunda (kolejne fragmenty mają różne timestampy)."""
+    time.sleep(EXPORT_SECONDS)
+    encode_fragment(pcm, output_file, *args, **kwargs)
+
+
+audio_format = get_audio_format("wav")
+fragment_bytes = FRAGMENT_SECONDS * audio_format["sample_rate"] * audio_format["channels"] * SAMPLE_WIDTH
+folder = tempfile.mkdtemp().replace("\\", "/")
+
+recorder_audio.encode_fragment = slow_encode
+recorder_audio.recording_directory = folder
+recorder_audio.recording_process = FakeProcess(bytes(2 * fragment_bytes))
+recorder_audio.recording_active = True
+recorder_audio.active_capture_mode = "pipe"
+recorder_audio.active_audio_format = audio_format
+recorder_audio.recording_finished.clear()
+
+watcher = FragmentWatcher(folder, recorder_audio.recording_finished, poll_interval=0.1)
+watcher.start()
+recorder_audio.fragment_thread = threading.Thread(target=recorder_audio._save_audio_fragments, daemon=True)
+recorder_audio.fragment_thread.start()
+
+# Zatrzymanie w trakcie eksportu drugiego (ostatniego) fragmentu
+time.sleep(EXPORT_SECONDS * 1.5)
+assert recorder_audio.fragment_thread.is_alive()
+recorder_audio.stop_recording(None)
+assert recorder_audio.recording_finished.is_set()
+
+queued = []
+while not watcher.is_done():
+    path = watcher.get(timeout=0.5)
+    if path is not None:
+        queued.append(os.path.basename(path))
+watcher.stop()
+
+recorded = sorted(name for name in os.listdir(folder) if name.endswith(".wav"))
+log.info(f"Zapisane fragmenty: {recorded}, przekazane do transkrypcji: {queued}")
+assert len(recorded) == 2, recorded
+assert queued == recorded, (queued, recorded)
+
+log.info("Test zakończony pomyślnie.")
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import time
+from datetime import datetime
+import numpy as np
+from PIL import Image
+from loguru import logger as log
+
+# Testowe spotkania nie mogą trafić do bazy spotkań aplikacji
+os.environ.setdefault("KNZS_MEETING_DB", os.path.join(tempfile.mkdtemp(), "spotkania.db"))
+
+from app.screenshots import monitor_and_capture
+from app.utilities.frame_sources import ImageSequenceSource
+
+log.info("Test wykrywania zmian slajdów bez ekranu: odtwarzanie sekwencji klatek 1280x720 w obu trybach detektora.")
+
+WIDTH, HEIGHT = 1280, 720
+rng = np.random.default_rng(0)
+
+
+def make_slide():
+    slide = np.full((HEIGHT, WIDTH, 3), 245, dtype=np.uint8)
+    for row in range(120, 600, 40):
+        slide[row:row + 16, 100:rng.integers(400, 1180)] = rng.integers(0, 80)
+    return slide
+
+
+# Trzy slajdy po 10 klatek; w trakcie slajdu porusza się kursor i odtwarzany jest mały film
+frames_folder = tempfile.mkdtemp()
+number = 0
+for slide in (make_slide(), make_slide(), make_slide()):
+    for tick in range(10):
+        frame = slide.copy()
+        frame[300 + tick * 5:320 + tick * 5, 600 + tick * 20:612 + tick * 20] = 0
+        frame[560:620, 1100:1200] = rng.integers(0, 256, (60, 100, 3), dtype=np.uint8)
+        Image.fromarray(frame).save(os.path.join(frames_folder, f"{number:04d}.png"))
+        number += 1
+
+for mode in ("pixel", "hash"):
+    output_folder = tempfile.mkdtemp()
+    source = ImageSequenceSource(frames_folder, interval=3.0, start_time=datetime(2025, 1, 18, 10, 0, 0))
+    start = time.perf_counter()
+    saved = monitor_and_capture(None, output_folder, detector_mode=mode, source=source)
+    elapsed = time.perf_counter() - start
+    names = sorted(os.listdir(output_folder))
+    # Pierwszy zrzut oraz zmiany slajdów w klatkach 10 (10:00:30) i 20 (10:01:00)
+    assert names == ["10-00-00.jpg", "10-00-30.jpg", "10-01-00.jpg"], (mode, names)
+    assert saved == 2, (mode, saved)
+    log.info(f"Tryb {mode}: zapisano {names}, {elapsed / number * 1000:.1f} ms na klatkę (z odczytem PNG i zapisem JPG)")
+
+log.info("Test zakończony pomyślnie.")
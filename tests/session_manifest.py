@@ -0,0 +1,48 @@
+import os
+import tempfile
+from loguru import logger as log
+from app.utilities.session_manifest import SessionManifest, read_manifest, find_unfinished_meetings
+from app.utilities.session_manifest import SESSION_STARTED, FRAGMENT_RECORDED, FRAGMENT_TRANSCRIBED, RECORDING_FINISHED, TRANSCRIPTION_FINISHED, MANIFEST_FILENAME
+
+log.info("Test manifestu sesji: odczyt stanu spotkania przerwanego awarią i wykrywanie niedokończonych spotkań.")
+
+meetings_folder = tempfile.mkdtemp()
+crashed = os.path.join(meetings_folder, "2025-01-18_23-07-50")
+finished = os.path.join(meetings_folder, "2025-01-19_10-00-00")
+os.makedirs(crashed)
+os.makedirs(finished)
+
+# Spotkanie zakończone poprawnie
+manifest = SessionManifest(finished)
+manifest.record(SESSION_STARTED)
+manifest.record(FRAGMENT_RECORDED, "10-00-00.mp3")
+manifest.record(FRAGMENT_TRANSCRIBED, "10-00-00")
+manifest.record(RECORDING_FINISHED)
+manifest.record(TRANSCRIPTION_FINISHED)
+manifest.close()
+
+# Spotkanie przerwane w trakcie zapisu wpisu
+manifest = SessionManifest(crashed)
+manifest.record(SESSION_STARTED)
+for name in ("23-07-50", "23-08-10", "23-08-30"):
+    manifest.record(FRAGMENT_RECORDED, f"{name}.mp3")
+manifest.record(FRAGMENT_TRANSCRIBED, "23-07-50")
+manifest.close()
+with open(os.path.join(crashed, MANIFEST_FILENAME), "a", encoding="utf-8") as f:
+    f.write('{"event": "fragment_transcri')
+
+state = read_manifest(crashed)
+assert state["fragments"] == ["23-07-50.mp3", "23-08-10.mp3", "23-08-30.mp3"], state
+assert state["transcribed"] == ["23-07-50"], state
+assert not state["recording_finished"] and not state["transcription_finished"], state
+
+# Kolejny wpis po wznowieniu nie może połączyć się z przerwanym wierszem
+manifest = SessionManifest(crashed)
+manifest.record(FRAGMENT_TRANSCRIBED, "23-08-10")
+manifest.close()
+assert read_manifest(crashed)["transcribed"] == ["23-07-50", "23-08-10"]
+
+unfinished = find_unfinished_meetings(meetings_folder)
+assert unfinished == [crashed.replace("\\", "/")], unfinished
+log.info(f"Niedokończone spotkania: {unfinished}")
+log.info("Sukces.")
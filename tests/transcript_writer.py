@@ -0,0 +1,57 @@
+import os
+import time
+import tempfile
+from loguru import logger as log
+
+# Testowe spotkania nie mogą trafić do bazy spotkań aplikacji
+os.environ.setdefault("KNZS_MEETING_DB", os.path.join(tempfile.mkdtemp(), "spotkania.db"))
+
+from app.utilities.saving import save_text_to_txt, TranscriptWriter
+
+log.info("Porównanie zapisu transkrypcji fragmentów: save_text_to_txt (format_text) i TranscriptWriter.")
+
+fragments = 500
+update_status = "placeholder"
+text = ("o zjawisku fotoelektrycznym, które jest zjawiskiem, które się nie da wyjaśnić wprost za pomocą teorii falowej. "
+        "Z kilku względów, o których była mowa wcześniej, natomiast zostało to wyjaśnione przy pomocy pojęcia fotonów.\n"
+        "mają pewną prędkość, mają pewną energię i wobec tego, zderzając się z elektronami, potrafią je poruszyć. ")
+
+
+def make_session():
+    """Tworzy folder spotkania z folderem transkrypcji, jak create_output_folder."""
+    meeting = tempfile.mkdtemp().replace("\\", "/")
+    folder = f"{meeting}/txt-2025-01-18_23-07-50"
+    os.makedirs(folder)
+    return meeting, folder
+
+
+def read_outputs(meeting, folder):
+    """Zawartość plików fragmentów i pełnej transkrypcji."""
+    files = {}
+    for name in sorted(os.listdir(folder)):
+        with open(f"{folder}/{name}", encoding="utf-8") as f:
+            files[name] = f.read()
+    with open(f"{meeting}/full-2025-01-18_23-07-50.txt", encoding="utf-8") as f:
+        return files, f.read()
+
+
+log.disable("app.utilities")
+meeting, folder = make_session()
+start = time.perf_counter()
+for i in range(fragments):
+    save_text_to_txt(f"{i:05d}", text, update_status, folder)
+legacy_seconds = time.perf_counter() - start
+legacy = read_outputs(meeting, folder)
+
+meeting, folder = make_session()
+writer = TranscriptWriter(folder, update_status)
+start = time.perf_counter()
+for i in range(fragments):
+    writer.write(f"{i:05d}", text)
+writer.close()
+writer_seconds = time.perf_counter() - start
+log.enable("app.utilities")
+
+assert read_outputs(meeting, folder) == legacy, "TranscriptWriter zapisuje inną treść niż save_text_to_txt"
+log.info(f"save_text_to_txt: {legacy_seconds / fragments * 1000:.2f} ms/fragment, TranscriptWriter: {writer_seconds / fragments * 1000:.2f} ms/fragment")
+log.info("Sukces.")
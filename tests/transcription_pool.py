@@ -0,0 +1,59 @@
+import os
+import tempfile
+from collections import deque
+from loguru import logger as log
+
+# Testowe spotkania nie mogą trafić do bazy spotkań aplikacji
+os.environ.setdefault("KNZS_MEETING_DB", os.path.join(tempfile.mkdtemp(), "spotkania.db"))
+
+from app import transcriptor
+from app.utilities.saving import TranscriptWriter
+
+log.info("Odtwarzanie puli transkrypcji po awarii procesu i ponowne zlecenie nieukończonych fragmentów.")
+
+# Procesy puli nie ładują modelu Whisper
+transcriptor.get_whisper_model = lambda *args, **kwargs: None
+main_pid = os.getpid()
+
+
+def fake_fragment(name: str, crash: str | None, update_status) -> dict:
+    """Zwraca wynik jak _transcribe_fragment; kończy proces puli, gdy `crash` wskazuje taki przypadek."""
+    if crash == "always" and os.getpid() != main_pid:
+        os._exit(1)
+    if crash is not None and crash != "always" and not os.path.exists(crash):
+        open(crash, "w").close()
+        os._exit(1)
+    return {"filename": name, "text": f"tekst {name}", "model": "test", "audio_seconds": 30.0, "transcribe_seconds": 1.0, "windows": 1, "decodes": 1, "cached": False}
+
+
+def run_session(crash_for: dict[int, str], fragments: int = 8) -> tuple[int, int, list[str]]:
+    """Transkrybuje fragmenty przez pulę dwóch procesów; zwraca liczbę zapisanych, liczbę odtworzeń puli i pliki."""
+    folder = f"{tempfile.mkdtemp()}/txt-2025-01-18_23-07-50".replace("\\", "/")
+    os.makedirs(folder)
+    writer = TranscriptWriter(folder, "placeholder")
+    pool = transcriptor._TranscriptionPool(2)
+    pending = deque()
+    count = 0
+    for i in range(fragments):
+        pending.append(pool.submit(fake_fragment, f"{i:05d}", crash_for.get(i), "placeholder"))
+        count = transcriptor._save_finished_transcriptions(pending, writer, "placeholder", count, pool=pool)
+    count = transcriptor._save_finished_transcriptions(pending, writer, "placeholder", count, wait_all=True, pool=pool)
+    writer.close()
+    pool.shutdown()
+    assert not pool._jobs, "Pula pamięta zlecenia po zapisie wyników"
+    return count, pool.restarts, sorted(name for name in os.listdir(folder) if name.endswith(".txt"))
+
+
+expected = [f"{i:05d}.txt" for i in range(8)]
+
+# Jednorazowa awaria procesu: pula jest odtwarzana, a wszystkie fragmenty zapisane w kolejności
+count, restarts, files = run_session({3: os.path.join(tempfile.mkdtemp(), "awaria")})
+assert (count, restarts, files) == (8, 1, expected), (count, restarts, files)
+log.info(f"Jednorazowa awaria: zapisano {count} fragmentów, odtworzenia puli: {restarts}")
+
+# Fragment, który zawsze kończy proces puli: po POOL_RESTARTS odtworzeniach transkrypcja w bieżącym procesie
+count, restarts, files = run_session({5: "always"})
+assert (count, restarts, files) == (8, transcriptor.POOL_RESTARTS + 1, expected), (count, restarts, files)
+log.info(f"Powtarzające się awarie: zapisano {count} fragmentów, odtworzenia puli: {restarts}")
+
+log.info("Test puli transkrypcji zakończony powodzeniem.")
@@ -0,0 +1,45 @@
+import io
+import time
+import numpy as np
+from loguru import logger as log
+from app.recorder_audio import _read_vad_fragments, READ_CHUNK_SIZE
+from app.utilities.audio_formats import WHISPER_SAMPLE_RATE
+from app.utilities.vad import VadSegmenter
+
+log.info("Test podziału nagrania w przerwach wypowiedzi (VAD) na syntetycznym spotkaniu.")
+
+rng = np.random.default_rng(0)
+
+
+def speech(seconds):
+    """Sygnał podobny do mowy: ton z modulacją sylabową i szumem."""
+    t = np.arange(int(seconds * WHISPER_SAMPLE_RATE)) / WHISPER_SAMPLE_RATE
+    return 0.3 * np.sin(2 * np.pi * 180 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)) + 0.02 * rng.standard_normal(t.size)
+
+
+def silence(seconds):
+    """Szum tła o niskim poziomie."""
+    return 0.002 * rng.standard_normal(int(seconds * WHISPER_SAMPLE_RATE))
+
+
+# Wypowiedzi z krótkimi przerwami, długa cisza (przerwa w spotkaniu) i dłuższy monolog
+parts = [silence(3), speech(4), silence(0.3), speech(3), silence(1), speech(6), silence(75), speech(45), silence(2)]
+signal = np.concatenate(parts)
+pcm = (np.clip(signal, -1, 1) * 32767).astype(np.int16).tobytes()
+
+fragments = []
+segmenter = VadSegmenter(WHISPER_SAMPLE_RATE, 1, min_seconds=5, max_seconds=20, read_chunk_size=READ_CHUNK_SIZE)
+start = time.perf_counter()
+_read_vad_fragments(io.BytesIO(pcm), segmenter, lambda view, silent: fragments.append((len(view) / 2 / WHISPER_SAMPLE_RATE, silent)), lambda: True)
+elapsed = time.perf_counter() - start
+
+for seconds, silent in fragments:
+    log.info(f"{'cisza' if silent else 'mowa '}: {seconds:5.1f} s")
+
+stats = segmenter.get_stats()
+log.info(f"Statystyki: {stats}")
+log.info(f"Czas analizy: {elapsed * 1000:.1f} ms dla {signal.size / WHISPER_SAMPLE_RATE:.0f} s nagrania")
+
+assert all(seconds <= 20 for seconds, _ in fragments)
+assert stats["silent_fragments"] >= 3
+assert abs(stats["speech_seconds"] - 60) < 10
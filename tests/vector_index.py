@@ -0,0 +1,132 @@
+import os
+import random
+import tempfile
+from loguru import logger as log
+
+# Testowe spotkania nie mogą trafić do bazy spotkań ani indeksu wektorów aplikacji
+test_folder = tempfile.mkdtemp()
+os.environ.setdefault("KNZS_MEETING_DB", os.path.join(test_folder, "spotkania.db"))
+os.environ.setdefault("KNZS_VECTOR_INDEX", os.path.join(test_folder, "wektory"))
+
+from app.utilities.vector_index import VectorIndex, EMBEDDING_DIM, get_vector_index
+from app.utilities.meeting_store import get_meeting_store
+from app.meeting_search import search_topics, index_meetings, format_hit
+
+log.info("Test wyszukiwania tematycznego: indeksowanie spotkań, wyszukiwanie, tematy opisane innymi słowami i przycięcie indeksu po awarii.")
+
+meetings_folder = os.path.join(test_folder, "spotkania")
+TOPICS = {
+    "2025-02-03_09-00-00": ["Omawiamy budżet projektu i koszty wdrożenia.", "Budżet na kolejny kwartał wymaga akceptacji zarządu.",
+                            "Koszty licencji przekraczają zaplanowany budżet."],
+    "2025-02-04_09-00-00": ["Serwer produkcyjny zgłasza błędy po aktualizacji.", "Testy regresyjne wykryły błąd w nowej wersji.",
+                            "Przywracamy poprzednią wersję serwera."],
+    "2025-02-05_09-00-00": ["Rekrutacja nowych pracowników do zespołu sprzedaży.", "Kandydaci na stanowisko handlowca przejdą rozmowy.",
+                            "Szkolenie nowych pracowników zaczyna się w marcu."],
+}
+for name, fragments in TOPICS.items():
+    folder = f"{meetings_folder}/{name}/txt-{name}"
+    os.makedirs(folder)
+    os.makedirs(f"{meetings_folder}/{name}/screenshots-{name}")
+    for number, text in enumerate(fragments):
+        with open(f"{folder}/09-00-{number * 20:02d}.txt", "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+open(f"{meetings_folder}/2025-02-04_09-00-00/screenshots-2025-02-04_09-00-00/09-00-10.jpg", "wb").close()
+
+# Wyszukiwanie nie uzupełnia indeksu; spotkania spoza indeksu dopisuje jednorazowe uzupełnienie
+assert search_topics("błędy serwera po aktualizacji wersji") == []
+assert index_meetings(meetings_folder) == 9
+hits = search_topics("błędy serwera po aktualizacji wersji")
+assert hits[0]["meeting"] == "2025-02-04_09-00-00", hits
+assert hits[0]["screenshot"].endswith("09-00-10.jpg"), hits
+log.info(f"Najbliższe spotkanie: {format_hit(hits[0])} (podobieństwo {hits[0]['score']:.2f})")
+
+# Jedno przejście po macierzy dla wielu zapytań; słowa w innej formie niż w transkrypcji
+index = VectorIndex(os.environ["KNZS_VECTOR_INDEX"])
+assert len(index) == 9, len(index)
+results = index.search(["budżetu kosztów", "rekrutacji pracownika", "żyrafa"], k=2)
+assert results[0][0]["meeting"] == "2025-02-03_09-00-00", results[0]
+assert results[1][0]["meeting"] == "2025-02-05_09-00-00", results[1]
+assert results[2] == [], results[2]
+
+# Ponowne dodanie spotkania nie duplikuje wierszy
+assert index.add_meeting(f"{meetings_folder}/2025-02-03_09-00-00") == 0
+
+# Spotkanie w trakcie transkrypcji nie trafia do indeksu przy uzupełnieniu, dopiero po zakończeniu - w całości
+running = f"{meetings_folder}/2025-02-06_09-00-00"
+os.makedirs(f"{running}/txt-2025-02-06_09-00-00")
+get_meeting_store().add_meeting(running)
+with open(f"{running}/txt-2025-02-06_09-00-00/09-00-00.txt", "w", encoding="utf-8") as f:
+    f.write("Planujemy remont biura i przeprowadzkę.\n")
+assert index_meetings(None) == 0 and not get_vector_index().contains(running)
+with open(f"{running}/txt-2025-02-06_09-00-00/09-00-20.txt", "w", encoding="utf-8") as f:
+    f.write("Przeprowadzka nastąpi w maju.\n")
+get_meeting_store().finish_meeting(running)
+assert index_meetings(None) == 2
+assert get_vector_index().contains(running) and len(get_vector_index()) == 11, len(get_vector_index())
+
+# Spotkanie bez transkrypcji jest zapisywane w indeksie, więc kolejne uzupełnienia go nie odczytują
+empty = f"{meetings_folder}/2025-02-07_09-00-00"
+os.makedirs(empty)
+get_meeting_store().add_meeting(empty)
+get_meeting_store().finish_meeting(empty)
+assert index_meetings(None) == 0 and get_vector_index().contains(empty)
+assert VectorIndex(os.environ["KNZS_VECTOR_INDEX"]).contains(empty)
+os.makedirs(f"{empty}/txt-2025-02-07_09-00-00")
+with open(f"{empty}/txt-2025-02-07_09-00-00/09-00-00.txt", "w", encoding="utf-8") as f:
+    f.write("Tekst dopisany po zakończeniu spotkania.\n")
+assert index_meetings(None) == 0 and len(get_vector_index()) == 11
+assert search_topics("błędy serwera po aktualizacji wersji")[0]["meeting"] == "2025-02-04_09-00-00"
+
+# Spotkania o tym samym temacie opisanym rozłącznymi słowami: model tematów łączy słowa występujące razem w archiwum
+WORDS = {
+    "finanse": "budżet wydatki faktury koszty księgowość delegacje rozliczenie dyrektor finansowy przelew".split(),
+    "serwery": "serwer awaria aktualizacja błędy baza danych kopia zapasowa monitoring restart".split(),
+    "kadry": "rekrutacja kandydaci rozmowy szkolenie pracownicy umowy urlopy stanowisko zespół sprzedaż".split(),
+}
+topics_folder = os.path.join(test_folder, "tematy")
+rng = random.Random(0)
+
+
+def create_meeting(name: str, fragments: list[str]) -> str:
+    folder = f"{topics_folder}/{name}/txt-{name}"
+    os.makedirs(folder)
+    for number, text in enumerate(fragments):
+        with open(f"{folder}/10-{number // 60:02d}-{number % 60:02d}.txt", "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    return f"{topics_folder}/{name}"
+
+
+archive = [create_meeting(f"2025-03-0{day}_10-00-00", [" ".join(rng.sample(words, 4)) for _ in range(40)])
+           for day, words in enumerate(WORDS.values(), 1)]
+invoices = create_meeting("2025-03-10_10-00-00", ["Faktury i koszty delegacji rozliczono."])
+approval = create_meeting("2025-03-11_10-00-00", ["Dyrektor finansowy zatwierdził wydatki."])
+outage = create_meeting("2025-03-12_10-00-00", ["Restart serwera po awarii."])
+index = VectorIndex(os.path.join(test_folder, "tematy"))
+index.sync_meetings(archive + [invoices, approval, outage])
+hits = [hit["directory"] for hit in index.search(["faktury za delegacje i koszty"], k=10)[0]]
+assert hits[0] == invoices, hits
+assert approval in hits and (outage not in hits or hits.index(approval) < hits.index(outage)), hits
+log.info(f"Spotkanie bez wspólnych słów z zapytaniem: {os.path.basename(approval)} na pozycji {hits.index(approval) + 1}")
+
+# Awaria w trakcie dopisywania: niepełny wiersz macierzy, opis spotkania bez wektorów i przerwany opis
+path = os.path.join(test_folder, "awaria")
+index = VectorIndex(path)
+index.add_meeting(f"{meetings_folder}/2025-02-03_09-00-00")
+with open(index.vectors_path, "ab") as f:
+    f.write(b"\0" * (EMBEDDING_DIM * 4 + 100))
+with open(f"{path}.jsonl", "a", encoding="utf-8") as f:
+    f.write('{"meeting": "x", "directory": "x", "timestamps": ["a", "b"]}\n{"meeting": "prz')
+index = VectorIndex(path)
+assert len(index) == 3 and os.path.getsize(index.vectors_path) == 3 * EMBEDDING_DIM * 4, len(index)
+assert index.search(["budżet"])[0][0]["meeting"] == "2025-02-03_09-00-00"
+
+# Przerwane dopasowanie modelu (pliki nowej generacji bez podmiany opisu) pozostawia poprzednią generację
+vectors_path = index.vectors_path
+open(f"{path}-przerwane.npz", "wb").close()
+open(f"{path}-przerwane.f32", "wb").close()
+index = VectorIndex(path)
+assert index.vectors_path == vectors_path and len(index) == 3
+assert not os.path.exists(f"{path}-przerwane.npz") and not os.path.exists(f"{path}-przerwane.f32")
+
+get_meeting_store().close()
+log.info("Test zakończony pomyślnie.")
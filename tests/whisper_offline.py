@@ -1,13 +1,23 @@
-from app.transcriptor import transcribe_with_whisper_offline
+from app.transcriptor import transcribe_with_whisper_offline, get_model_cache_stats, clear_model_cache
 from loguru import logger as log
 
 log.info("Test funkcji służącej do transkrypcji audio przy pomocy modelu Whisper od OpenAI.")
 
 path_to_audio = r"D:\Studia\InzynieriaOprogramowania\kreator-notatek-ze-spotkan\app\nagrania\audio\test.mp3"
 update_status = "placeholder"
-filename, transcribed_text  = transcribe_with_whisper_offline(path_to_audio, update_status)
+
+# Drugie wywołanie korzysta z modelu z pamięci podręcznej, bez ponownego ładowania
+for attempt in range(2):
+    filename, transcribed_text  = transcribe_with_whisper_offline(path_to_audio, update_status)
 
 if transcribed_text is None:
     log.info("Nie udało się przeprowadzić transkrypcji audio.")
 else:
-    log.info("Sukces.")
\ No newline at end of file
+    log.info("Sukces.")
+
+for (engine, model_name, device, dtype), stats in get_model_cache_stats().items():
+    memory = f"{stats['memory_mb']:.0f} MB" if stats['memory_mb'] is not None else "nieznana"
+    log.info(f"Model {model_name} ({engine}, {device}, {dtype}): ładowanie {stats['load_seconds']:.2f} s, "
+             f"pamięć {memory}, użycia: {stats['uses']}")
+
+clear_model_cache()